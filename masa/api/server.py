@@ -106,6 +106,9 @@ class API:
         self.start_server()
 
     async def show_miner_volumes(self):
+        if self.validator.state_store is not None:
+            # As of the last save, without touching the live state
+            return JSONResponse(content=self.validator.state_store.read_volumes())
         volumes = self.validator.volumes
         if volumes:
             serializable_volumes = [
@@ -119,12 +122,20 @@ class API:
         return JSONResponse(content=[])
 
     async def show_scores(self):
+        if self.validator.state_store is not None:
+            return JSONResponse(content=self.validator.state_store.read_scores())
         scores = self.validator.scores
         if len(scores) > 0:
             return JSONResponse(content=scores.tolist())
         return JSONResponse(content=[])
 
     async def show_tweets_by_uid(self):
+        if self.validator.state_store is not None:
+            store = self.validator.state_store
+            serializable_tweets = {
+                uid: store.read_tweet_ids(uid) for uid in store.read_tweet_counts()
+            }
+            return JSONResponse(content=serializable_tweets or [])
         tweets = self.validator.tweets_by_uid
         if len(tweets) > 0:
             serializable_tweets = {
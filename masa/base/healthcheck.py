@@ -21,7 +21,7 @@ def get_external_ip() -> str:
         str: The external IP address.
     """
     try:
-        response = requests.get("https://api.ipify.org?format=json")
+        response = requests.get("https://api.ipify.org?format=json", timeout=10)
         response.raise_for_status()
         ip = response.json().get("ip")
         return ip
@@ -20,8 +20,6 @@ import os
 import copy
 import torch
 import json
-import asyncio
-import aiohttp
 import argparse
 import bittensor as bt
 import random
@@ -34,6 +32,16 @@ from masa.utils.uids import get_available_uids
 
 from masa.validator.scorer import Scorer
 from masa.validator.forwarder import Forwarder
+from masa.validator.dendrite_pool import DendritePool
+from masa.validator.exporter import ExportQueue
+from masa.validator.export_spool import ExportSpool
+from masa.validator.export_encoding import PayloadEncoder
+from masa.validator.checkpoint import Checkpointer
+from masa.validator.state_store import SQLiteStateStore
+from masa.validator.weights_history import WeightsHistory
+from masa.validator.volumes import VolumeWindow
+from masa.validator.tweet_ids import TweetIdSet, TweetIdHistory
+from masa.validator.tweet_decoder import to_builtins
 
 from masa.utils.weights import process_weights_for_netuid
 
@@ -56,27 +64,49 @@ class BaseValidatorNeuron(BaseNeuron):
         self.volume_window = 6
         self.tweets_by_uid = {}
         self.volumes = []
+        self.state_store = None
         self._is_initialized = False
         self.first_run = True
         super().__init__(config=config)
 
+    @property
+    def volumes(self) -> List[dict]:
+        """
+        The volume window as [{"tempo": ..., "miners": {"<uid>": volume}}], oldest
+        first, for saving state and the /volumes endpoint. Scoring reads
+        `volume_buffer` directly.
+        """
+        return self.volume_buffer.to_list()
+
+    @volumes.setter
+    def volumes(self, volumes: List[dict]):
+        self.volume_buffer = VolumeWindow.from_list(volumes, self.volume_window)
+
     async def run(self):
         """Run the validator forever."""
-        while True:
-            current_block = await self.block
-            bt.logging.info(f"🔄 Syncing at block {current_block}")
-            # Sync the metagraph
-            # This is in neuron.py
-            # It will check registration
-            # Update the metagraph if needed
-            # Set weights if needed
-            await self.sync()
-            self.last_sync_block = current_block
-            # Get and score miner volumes
-            await self.forwarder.get_miners_volumes(current_block)
-            await self.scorer.score_miner_volumes(current_block)
-            # Quick health check
-            await self.healthcheck()
+        try:
+            while True:
+                current_block = await self.block
+                bt.logging.info(f"🔄 Syncing at block {current_block}")
+                # Sync the metagraph
+                # This is in neuron.py
+                # It will check registration
+                # Update the metagraph if needed
+                # Set weights if needed
+                await self.sync()
+                self.last_sync_block = current_block
+                # Get and score miner volumes
+                await self.forwarder.get_miners_volumes(current_block)
+                await self.scorer.score_miner_volumes(current_block)
+                # Quick health check
+                await self.healthcheck()
+        finally:
+            await self.save_state(force=True)
+            if self.state_store is not None:
+                self.state_store.close()
+            await self.exporter.close()
+            await self.dendrite_pool.close()
+            self.forwarder.verification_service.shutdown()
 
     async def initialize(self, config=None):
         """Async initialization method."""
@@ -121,10 +151,57 @@ class BaseValidatorNeuron(BaseNeuron):
                 f"Loaded {network_type} subnet config from local file: {self.subnet_config}"
             )
 
-        self.dendrite = bt.dendrite(wallet=self.wallet)
+        # Every outbound miner query shares this dendrite and its connection pool
+        self.dendrite_pool = DendritePool(
+            self.wallet,
+            limit=self.config.validator.dendrite_pool_size,
+            limit_per_host=self.config.validator.dendrite_connections_per_miner,
+            keepalive_timeout=self.config.validator.dendrite_keepalive,
+            dns_cache_ttl=self.config.validator.dendrite_dns_cache_ttl,
+        )
+        # Validated tweets are exported in the background, coalesced across miners,
+        # and spooled to disk until the protocol API has stored them
+        self.exporter = ExportQueue(
+            self.config.validator.export_url,
+            self.wallet.hotkey.ss58_address,
+            batch_size=self.config.validator.export_batch_size,
+            max_latency=self.config.validator.export_max_latency,
+            max_pending=self.config.validator.export_queue_size,
+            max_retries=self.config.validator.export_max_retries,
+            spool=ExportSpool(
+                os.path.join(self.config.neuron.full_path, "export_spool"),
+                segment_bytes=self.config.validator.export_spool_segment_mb * 2**20,
+            ),
+            resend_backoff=self.config.validator.export_resend_backoff,
+            encoder=PayloadEncoder(self.config.validator.export_compression),
+        )
+        self.exporter.restore()
         self.scores = torch.zeros(
             self.metagraph.n, dtype=torch.float32, device=self.device
         )
+        # State is checkpointed per component, only what changed since the last save,
+        # to files or to a SQLite database the API reads from
+        self.state_store = None
+        if self.config.validator.state_backend == "sqlite":
+            self.state_store = SQLiteStateStore(
+                os.path.join(self.config.neuron.full_path, "state.db"),
+                interval=self.config.validator.checkpoint_interval,
+                max_pending_bytes=self.config.validator.checkpoint_max_pending_mb
+                * 2**20,
+            )
+            self.checkpointer = self.state_store
+        else:
+            self.checkpointer = Checkpointer(
+                os.path.join(self.config.neuron.full_path, "checkpoint"),
+                interval=self.config.validator.checkpoint_interval,
+                max_pending_bytes=self.config.validator.checkpoint_max_pending_mb
+                * 2**20,
+            )
+        # Every set of weights, for restoring scores and analysis
+        self.weights_history = WeightsHistory(
+            os.path.join(self.config.neuron.full_path, "weights_history"),
+            retention_days=self.config.validator.weights_history_retention_days,
+        )
         bt.logging.info("Loading state...")
         self.load_state()
 
@@ -261,10 +338,6 @@ class BaseValidatorNeuron(BaseNeuron):
 
         bt.logging.debug(f"Setting weights: {uint_weights} for uids: {uint_uids}")
 
-        # Create weight entry in the exact format needed
-        import datetime
-        import json
-
         # Log all registered miners' scores
         bt.logging.info("Miner scores (including zeros):")
         for uid in range(len(self.metagraph.hotkeys)):
@@ -274,26 +347,20 @@ class BaseValidatorNeuron(BaseNeuron):
                 f"Miner {uid} (https://taostats.io/hotkey/{hotkey}): {score:.6f}"
             )
 
-        # Convert weights to the format in scores.log
+        # Convert weights to the format of the weights history
         weights_list = [
             {"uid": int(uid), "weight": float(weight * 65535)}  # Scale to u16::MAX
             for uid, weight in zip(uint_uids, uint_weights)
         ]
 
-        log_entry = {
-            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f"),
-            "netuid": self.config.netuid,
-            "hotkey": self.wallet.hotkey.ss58_address,
-            "weights": weights_list,
-        }
-
-        # Log to scores.log
-        log_file = os.path.join(self.config.neuron.full_path, "scores.log")
         try:
-            with open(log_file, "a") as f:
-                f.write(json.dumps(log_entry) + "\n")
+            self.weights_history.append(
+                self.config.netuid,
+                self.wallet.hotkey.ss58_address,
+                {entry["uid"]: entry["weight"] for entry in weights_list},
+            )
             bt.logging.success(
-                f"Logged weights for {len(uint_uids)} uids to {log_file}"
+                f"Logged weights for {len(uint_uids)} uids to {self.weights_history.path}"
             )
             bt.logging.info(
                 f"Weight stats - Min: {self.scores.min():.6f}, Max: {self.scores.max():.6f}, Mean: {self.scores.mean():.6f}"
@@ -403,6 +470,8 @@ class BaseValidatorNeuron(BaseNeuron):
             )
             new_scores[: len(self.scores)] = self.scores
             self.scores = new_scores
+        # And the volume window, so the new uids have columns
+        self.volume_buffer.resize(int(self.metagraph.n))
 
         # Zero out all hotkeys that have been replaced.
         for uid, hotkey in enumerate(self.hotkeys):
@@ -411,21 +480,17 @@ class BaseValidatorNeuron(BaseNeuron):
                 and hotkey != self.metagraph.hotkeys[uid]
             ):
                 self.scores[uid] = 0  # hotkey has been replaced
-                # Take the last 6 objects in the self.volumes list
-                recent_volumes = self.volumes[-self.volume_window :]
-                # Replace all instances of miners[uid] and set their values to 0
-                for volume in recent_volumes:
-                    if str(uid) in volume["miners"]:
-                        volume["miners"][str(uid)] = 0
+                # Set its volumes in the window to 0
+                self.volume_buffer.clear(uid)
 
                 # Replace unique tweets by uid
-                self.tweets_by_uid[uid] = set()
+                self.tweets_by_uid[uid] = self.new_tweet_history()
 
         # Update the hotkeys.
         self.hotkeys = copy.deepcopy(self.metagraph.hotkeys)
 
     async def export_tweets(self, tweets: List[dict], query: str):
-        """Exports tweets to a specified API in chunks of 1000."""
+        """Queues tweets for export to the protocol API without waiting for it."""
         api_url = self.config.validator.export_url
         if api_url:
             try:
@@ -456,50 +521,18 @@ class BaseValidatorNeuron(BaseNeuron):
                             f"  Sample tweet {i+1}: ID={tweet_id}, Type={type(tweet_id)}, ASCII={tweet_id.encode('ascii', 'ignore').decode() == tweet_id}"
                         )
 
-                async with aiohttp.ClientSession() as session:
-                    for i in range(0, len(tweets), 1000):
-                        chunk = tweets[i : i + 1000]
-                        payload = {
-                            "Hotkey": self.wallet.hotkey.ss58_address,
-                            "Query": query,
-                            "Tweets": chunk,
-                        }
-
-                        # Debug log the payload structure (first tweet only)
-                        if chunk and "Tweet" in chunk[0]:
-                            first_tweet = chunk[0]["Tweet"]
-                            bt.logging.info(
-                                f"Payload first tweet TimeParsed: {first_tweet.get('TimeParsed', 'MISSING')}"
-                            )
-                            bt.logging.info(
-                                f"Payload first tweet keys: {list(first_tweet.keys())}"
-                            )
-
-                        async with session.post(api_url, json=payload) as response:
-                            response_text = await response.text()
-                            if response.status == 200 or response.status == 206:
-                                bt.logging.info(
-                                    f"Data sent to protocol API for chunk {i}"
-                                )
-                            else:
-                                bt.logging.error(
-                                    f"Failed to send data to protocol API for chunk {i}: {response.status}"
-                                )
-                                bt.logging.error(f"Response body: {response_text}")
-                        await asyncio.sleep(1)  # Wait for 1 second between requests
+                self.exporter.submit([to_builtins(tweet) for tweet in tweets], query)
             except Exception as e:
                 bt.logging.error(
-                    f"Exception occurred while sending data to the protocol API: {e}"
+                    f"Exception occurred while queueing tweets for export: {e}"
                 )
         else:
             bt.logging.warning(
                 "Tweets not exported, missing config --validator.export_url"
             )
 
-    async def save_state(self):
-        """Saves the state of the validator to a file."""
-        bt.logging.info("Starting to save validator state...")
-
+    async def save_state(self, force: bool = False):
+        """Checkpoints the parts of the validator state that changed, once a save is due."""
         try:
             state_dict = {
                 "step": self.step,
@@ -509,18 +542,11 @@ class BaseValidatorNeuron(BaseNeuron):
                 "tweets_by_uid": self.tweets_by_uid,
             }
 
-            save_path = self.config.neuron.full_path + "/state.pt"
-            temp_path = save_path + ".tmp"
-
-            # Use asyncio to run blocking operations in a thread pool
-            await asyncio.get_event_loop().run_in_executor(
-                None, lambda: torch.save(state_dict, temp_path)
-            )
-            await asyncio.get_event_loop().run_in_executor(
-                None, lambda: os.replace(temp_path, save_path)
-            )
-
-            bt.logging.success(f"Saved state to {save_path}")
+            written = await self.checkpointer.save(state_dict, force=force)
+            if written:
+                bt.logging.success(
+                    f"Saved state to {self.checkpointer.path} ({written} bytes written)"
+                )
 
         except Exception as e:
             bt.logging.error(f"Failed to save state: {str(e)}")
@@ -576,14 +602,10 @@ class BaseValidatorNeuron(BaseNeuron):
                 alpha * scattered_rewards[mask] + (1 - alpha) * self.scores[mask]
             )
 
-            # Limit the number of tweet IDs stored per UID to 100,000
+            # Histories expire by age as tweets are added, see TweetIdHistory
             for uid in uids:
                 if uid not in self.tweets_by_uid:
-                    self.tweets_by_uid[uid] = set()
-                elif len(self.tweets_by_uid[uid]) > 100000:
-                    self.tweets_by_uid[uid] = set(
-                        list(self.tweets_by_uid[uid])[:100000]
-                    )
+                    self.tweets_by_uid[uid] = self.new_tweet_history()
 
             await self.save_state()
 
@@ -591,6 +613,24 @@ class BaseValidatorNeuron(BaseNeuron):
             bt.logging.error(f"Error in update_scores: {str(e)}")
             raise
 
+    def new_tweet_history(self) -> TweetIdHistory:
+        return TweetIdHistory(
+            retention_blocks=self.config.validator.tweet_history_blocks,
+            segment_blocks=self.tempo,
+        )
+
+    def load_tweet_history(self, tweet_ids) -> TweetIdHistory:
+        """Restore a saved history; older state files hold a set of ID strings instead."""
+        if isinstance(tweet_ids, TweetIdHistory):
+            tweet_ids.retention_blocks = self.config.validator.tweet_history_blocks
+            return tweet_ids
+        history = self.new_tweet_history()
+        if isinstance(tweet_ids, TweetIdSet):
+            tweet_ids = tweet_ids.ids
+        # No record of when these were seen; start their retention window now
+        history.update(tweet_ids, self.last_weights_block)
+        return history
+
     def load_state(self):
         """Loads the state of the validator from a file and rebuilds scores from scores.log if needed."""
         bt.logging.info("Loading validator state.")
@@ -599,13 +639,18 @@ class BaseValidatorNeuron(BaseNeuron):
         state_path = self.config.neuron.full_path + "/state.pt"
         scores_log_path = os.path.join(self.config.neuron.full_path, "scores.log")
 
-        if os.path.isfile(state_path):
-            state = torch.load(state_path, map_location=torch.device("cpu"))
-            self.step = dict(state).get("step", 0)
-            self.scores = dict(state).get("scores", torch.zeros(self.metagraph.n))
-            self.hotkeys = dict(state).get("hotkeys", [])
-            self.volumes = dict(state).get("volumes", [])
-            self.tweets_by_uid = dict(state).get("tweets_by_uid", {})
+        if self.checkpointer.exists() or os.path.isfile(state_path):
+            if self.checkpointer.exists():
+                # Tweet histories are memory-mapped, read as lookups touch them
+                state = self.checkpointer.load(self.new_tweet_history)
+            else:
+                # Pickled by older versions, converted to a checkpoint once
+                state = self.checkpointer.migrate(state_path, self.load_tweet_history)
+            self.step = state["step"]
+            self.scores = state["scores"]
+            self.hotkeys = state["hotkeys"]
+            self.volumes = state["volumes"]
+            self.tweets_by_uid = state["tweets_by_uid"]
         else:
             self.step = 0
             self.scores = torch.zeros(self.metagraph.n)
@@ -613,40 +658,34 @@ class BaseValidatorNeuron(BaseNeuron):
             self.volumes = []
             self.tweets_by_uid = {}
             bt.logging.warning(
-                f"State file not found at {state_path}. Attempting to rebuild from scores.log"
+                f"State file not found at {state_path}. Attempting to rebuild from weights history"
             )
 
-        # If we have no scores or very few non-zero scores, try to rebuild from scores.log
+        # Weights logged before the weights history existed are imported once
+        if os.path.isfile(scores_log_path):
+            try:
+                self.weights_history.import_log(scores_log_path)
+            except Exception as e:
+                bt.logging.error(f"Failed to import {scores_log_path}: {e}")
+
+        # If we have no scores or very few non-zero scores, rebuild from the last weights
         non_zero_scores = (self.scores > 0).sum().item()
-        if (
-            os.path.isfile(scores_log_path)
-            and non_zero_scores < len(self.metagraph.hotkeys) * 0.5
-        ):
-            bt.logging.info(f"Attempting to rebuild scores from {scores_log_path}")
+        if non_zero_scores < len(self.metagraph.hotkeys) * 0.5:
             try:
-                with open(scores_log_path, "r") as f:
-                    # Read the last line of scores.log
-                    for line in f:
-                        try:
-                            entry = json.loads(line.strip())
-                            if entry["netuid"] == self.config.netuid:
-                                last_weights = entry["weights"]
-                                # Convert weights back to scores (undo the u16::MAX scaling)
-                                new_scores = torch.zeros(self.metagraph.n)
-                                for weight in last_weights:
-                                    uid = weight["uid"]
-                                    if uid < len(new_scores):
-                                        new_scores[uid] = weight["weight"] / 65535.0
-
-                                if (new_scores > 0).sum().item() > non_zero_scores:
-                                    bt.logging.info(
-                                        f"Rebuilt scores from scores.log with {(new_scores > 0).sum().item()} non-zero scores"
-                                    )
-                                    self.scores = new_scores
-                        except json.JSONDecodeError:
-                            continue
+                latest = self.weights_history.latest(self.config.netuid)
+                if latest is not None:
+                    # Convert weights back to scores (undo the u16::MAX scaling)
+                    new_scores = torch.zeros(self.metagraph.n)
+                    weights = torch.from_numpy(latest["weights"][: len(new_scores)])
+                    new_scores[: len(weights)] = weights / 65535.0
+
+                    if (new_scores > 0).sum().item() > non_zero_scores:
+                        bt.logging.info(
+                            f"Rebuilt scores from the weights set at {latest['timestamp']} with {(new_scores > 0).sum().item()} non-zero scores"
+                        )
+                        self.scores = new_scores
             except Exception as e:
-                bt.logging.error(f"Failed to rebuild scores from scores.log: {e}")
+                bt.logging.error(f"Failed to rebuild scores from weights history: {e}")
 
         bt.logging.info(
             f"Loaded state with {(self.scores > 0).sum().item()}/{len(self.scores)} non-zero scores"
@@ -0,0 +1,206 @@
+"""
+Offline scoring and weight setting simulator.
+
+Replays a volume trace through the validator's scoring path: Scorer, the
+update_scores moving average and process_weights_for_netuid, against a fake
+subtensor. Reports the weights set, how fast they converge and the runtime of every
+simulated epoch (tempo). Several --alpha and --window values sweep every
+combination of them over the same trace.
+
+The trace is either recorded, from --volumes (a state.pt, checkpoint directory,
+state.db, or JSON saved from the /volumes endpoint), repeated for --epochs tempos,
+or synthetic, for --uids miners. With --weights-history, scores start from the
+weights last set, as after a restart, and the final weights are compared with them.
+
+Usage:
+    python -m masa.sim --uids 256 --epochs 1800 --alpha 0.05 0.1 0.2 --window 3 6
+    python -m masa.sim --volumes ~/.bittensor/miners/.../checkpoint --epochs 600
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m masa.sim",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--volumes", help="Recorded volumes to replay.")
+    parser.add_argument("--uids", type=int, default=256, help="Miners (at least).")
+    parser.add_argument(
+        "--epochs",
+        type=int,
+        help="Tempos to simulate. Default: the recorded trace once, or 600.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic trace seed.")
+    parser.add_argument("--alpha", type=float, nargs="+", default=[0.1])
+    parser.add_argument("--window", type=int, nargs="+", default=[6])
+    parser.add_argument("--tempo", type=int, default=360, help="Blocks per tempo.")
+    parser.add_argument(
+        "--rounds", type=int, default=1, help="Scoring rounds per tempo."
+    )
+    parser.add_argument("--netuid", type=int, default=42)
+    parser.add_argument("--min-allowed-weights", type=int, default=1)
+    parser.add_argument("--max-weight-limit", type=float, default=1.0)
+    parser.add_argument("--weights-history", help="Weights history directory.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="L1 distance from the steady state weights below which they converged.",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Final weights shown.")
+    parser.add_argument("--json", help="Write every result to this file.")
+    parser.add_argument(
+        "--quiet", action="store_true", help="No per-epoch table for a single run."
+    )
+    parser.add_argument("--verbose", action="store_true", help="Validator logging.")
+    return parser.parse_args(argv)
+
+
+def load_trace(args) -> list:
+    from masa.sim.traces import load_volumes, replay, synthetic_volumes
+
+    if args.volumes:
+        return list(replay(load_volumes(args.volumes), args.epochs))
+    return list(synthetic_volumes(args.uids, args.epochs or 600, seed=args.seed))
+
+
+def print_epochs(results: list):
+    print(
+        f"{'epoch':>6} {'tempo':>8} {'miners':>7} {'max weight':>11} "
+        f"{'change':>9} {'runtime':>9}"
+    )
+    for epoch, result in enumerate(results):
+        weights = result["weights"]
+        max_weight = f"{weights.max():.5f}" if weights is not None else "-"
+        change = f"{result['change']:.5f}" if result["change"] is not None else "-"
+        print(
+            f"{epoch:>6} {result['tempo']:>8} {result['miners']:>7} "
+            f"{max_weight:>11} {change:>9} {result['runtime'] * 1e3:>7.2f}ms"
+        )
+
+
+def main(argv=None):
+    # Before importing bittensor, which parses sys.argv itself and would answer --help
+    args = parse_args(argv)
+
+    import bittensor as bt
+    import numpy as np
+    import torch
+
+    from masa.sim.simulator import FakeSubtensor, Simulator, convergence
+    from masa.sim.traces import recorded_weights
+
+    if args.verbose:
+        bt.logging.set_debug()
+    else:
+        bt.logging.off()
+
+    trace = load_trace(args)
+    if not trace:
+        raise SystemExit("Nothing to simulate: the trace is empty")
+    n_uids = max(
+        [args.uids] + [int(uid) + 1 for volume in trace for uid in volume["miners"]]
+    )
+
+    scores, reference = None, None
+    if args.weights_history:
+        weights = recorded_weights(args.weights_history, args.netuid)
+        if weights is not None:
+            # As load_state rebuilds scores from the last weights set
+            scores = torch.from_numpy(weights / 65535.0).float()
+            reference = np.zeros(n_uids)
+            reference[: min(n_uids, len(weights))] = weights[:n_uids] / weights.sum()
+
+    print(f"{len(trace)} epochs of {n_uids} miners")
+    runs = []
+    for alpha, window in itertools.product(args.alpha, args.window):
+        simulator = Simulator(
+            n_uids,
+            alpha=alpha,
+            volume_window=window,
+            tempo=args.tempo,
+            rounds=args.rounds,
+            netuid=args.netuid,
+            subtensor=FakeSubtensor(args.min_allowed_weights, args.max_weight_limit),
+            scores=scores,
+        )
+        start = time.perf_counter()
+        results = asyncio.run(simulator.run(trace))
+        runtime = time.perf_counter() - start
+        final = next(
+            (r["weights"] for r in reversed(results) if r["weights"] is not None),
+            None,
+        )
+        converged_at, jitter = convergence(results, args.tolerance)
+        runs.append(
+            {
+                "alpha": alpha,
+                "window": window,
+                "converged_at": converged_at,
+                "jitter": jitter,
+                "runtime": runtime,
+                "distance": (
+                    float(np.abs(final - reference).sum())
+                    if final is not None and reference is not None
+                    else None
+                ),
+                "weights": final,
+                "epochs": results,
+            }
+        )
+
+    if len(runs) == 1 and not args.quiet:
+        print_epochs(runs[0]["epochs"])
+
+    print(
+        f"{'alpha':>7} {'window':>7} {'converged':>10} {'jitter':>8} "
+        f"{'vs recorded':>12} {'per epoch':>10} {'total':>8}"
+    )
+    for run in runs:
+        converged = run["converged_at"] if run["converged_at"] is not None else "-"
+        distance = f"{run['distance']:.4f}" if run["distance"] is not None else "-"
+        print(
+            f"{run['alpha']:>7} {run['window']:>7} {converged:>10} "
+            f"{run['jitter']:>8.4f} {distance:>12} "
+            f"{run['runtime'] / len(trace) * 1e3:>8.2f}ms {run['runtime']:>7.2f}s"
+        )
+
+    for run in runs:
+        if run["weights"] is None:
+            print(f"alpha={run['alpha']} window={run['window']}: no weights set")
+            continue
+        top = np.argsort(run["weights"])[::-1][: args.top]
+        weights = ", ".join(f"{uid}: {run['weights'][uid]:.4f}" for uid in top)
+        print(f"alpha={run['alpha']} window={run['window']} top weights: {weights}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                [
+                    {
+                        **{k: v for k, v in run.items() if k != "epochs"},
+                        "weights": (
+                            run["weights"].tolist()
+                            if run["weights"] is not None
+                            else None
+                        ),
+                        "epochs": [
+                            {k: v for k, v in result.items() if k != "weights"}
+                            for result in run["epochs"]
+                        ],
+                    }
+                    for run in runs
+                ],
+                f,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import time
+import types
+from typing import Iterable, List, Optional, Tuple
+
+import bittensor as bt
+import numpy as np
+import torch
+
+from masa.base.validator import BaseValidatorNeuron
+from masa.utils.weights import process_weights_for_netuid
+from masa.validator.scorer import Scorer
+from masa.validator.volumes import VolumeWindow
+
+
+class FakeSubtensor:
+    """The subnet hyperparameters process_weights_for_netuid reads, without a chain."""
+
+    def __init__(self, min_allowed_weights: int = 1, max_weight_limit: float = 1.0):
+        self._min_allowed_weights = min_allowed_weights
+        self._max_weight_limit = max_weight_limit
+
+    async def min_allowed_weights(self, netuid: int) -> int:
+        return self._min_allowed_weights
+
+    async def max_weight_limit(self, netuid: int) -> float:
+        return self._max_weight_limit
+
+
+class FakeMetagraph:
+    def __init__(self, n: int):
+        self.n = n
+        self.uids = np.arange(n)
+        self.hotkeys = [f"sim-{uid}" for uid in range(n)]
+
+
+class SimulatedValidator:
+    """
+    The part of the validator that scoring touches, without a wallet, chain or
+    dendrite. `update_scores` and `volumes` are the validator's own, so the moving
+    average and the volume window are the production ones. Saving state is a no-op.
+    """
+
+    update_scores = BaseValidatorNeuron.update_scores
+    volumes = BaseValidatorNeuron.volumes
+
+    def __init__(
+        self,
+        metagraph: FakeMetagraph,
+        alpha: float,
+        volume_window: int,
+        tempo: int,
+        scores: Optional[torch.Tensor] = None,
+    ):
+        self.config = types.SimpleNamespace(
+            neuron=types.SimpleNamespace(moving_average_alpha=alpha)
+        )
+        self.device = "cpu"
+        self.metagraph = metagraph
+        self.tempo = tempo
+        self.volume_window = volume_window
+        self.volume_buffer = VolumeWindow(volume_window, metagraph.n)
+        self.scores = torch.zeros(metagraph.n, dtype=torch.float32)
+        if scores is not None:
+            self.scores[: len(scores)] = scores[: metagraph.n]
+        self.tweets_by_uid = {}
+        self.last_scoring_block = 0
+
+    def new_tweet_history(self):
+        return None
+
+    async def save_state(self, force: bool = False):
+        pass
+
+
+class Simulator:
+    """
+    Replays a volume trace through the production scoring path: per tempo,
+    Scorer.add_volume for every miner and Scorer.score_miner_volumes (which runs the
+    update_scores moving average) `rounds` times, then the weight processing of
+    set_weights: process_weights_for_netuid against a FakeSubtensor, and the u16
+    conversion of convert_weights_and_uids_for_emit. The weights the chain would get
+    are recorded, normalized, for every epoch (tempo).
+    """
+
+    def __init__(
+        self,
+        n_uids: int,
+        alpha: float = 0.1,
+        volume_window: int = 6,
+        tempo: int = 360,
+        rounds: int = 1,
+        netuid: int = 42,
+        subtensor: Optional[FakeSubtensor] = None,
+        scores: Optional[torch.Tensor] = None,
+    ):
+        self.netuid = netuid
+        self.rounds = max(1, rounds)
+        self.subtensor = subtensor or FakeSubtensor()
+        self.validator = SimulatedValidator(
+            FakeMetagraph(n_uids), alpha, volume_window, tempo, scores
+        )
+        self.scorer = Scorer(self.validator)
+
+    async def set_weights(self) -> Optional[np.ndarray]:
+        """The normalized weights set_weights would set, or None if it would skip."""
+        scores = self.validator.scores
+        if torch.all(scores == 0) or torch.isnan(scores).any():
+            return None
+        metagraph = self.validator.metagraph
+        uids, weights = await process_weights_for_netuid(
+            uids=metagraph.uids,
+            weights=scores.numpy(),
+            netuid=self.netuid,
+            subtensor=self.subtensor,
+            metagraph=metagraph,
+        )
+        (
+            uint_uids,
+            uint_weights,
+        ) = bt.utils.weight_utils.convert_weights_and_uids_for_emit(
+            uids=uids, weights=weights
+        )
+        dense = np.zeros(metagraph.n)
+        dense[uint_uids] = uint_weights
+        return dense / dense.sum() if dense.sum() else dense
+
+    async def run(self, trace: Iterable[dict]) -> List[dict]:
+        """
+        Run every tempo of `trace` ({"tempo": ..., "miners": {uid: volume}}) and return
+        one result per epoch: tempo, miners scored, normalized weights, the L1 change
+        of the weights from the previous epoch, and the runtime in seconds.
+        """
+        tempo_blocks = self.validator.tempo
+        previous = None
+        results = []
+        for volume in trace:
+            start = time.perf_counter()
+            miners = list(volume["miners"].items())
+            for i in range(self.rounds):
+                block = volume["tempo"] * tempo_blocks + i * (
+                    tempo_blocks // self.rounds
+                )
+                # Each round adds its share of the tempo's volume, as miners are polled
+                for uid, value in miners:
+                    self.scorer.add_volume(int(uid), value / self.rounds, block)
+                await self.scorer.score_miner_volumes(block)
+            weights = await self.set_weights()
+            change = (
+                float(np.abs(weights - previous).sum())
+                if weights is not None and previous is not None
+                else None
+            )
+            previous = weights if weights is not None else previous
+            results.append(
+                {
+                    "tempo": volume["tempo"],
+                    "miners": len(miners),
+                    "weights": weights,
+                    "change": change,
+                    "runtime": time.perf_counter() - start,
+                }
+            )
+        return results
+
+
+def convergence(results: List[dict], tolerance: float) -> Tuple[Optional[int], float]:
+    """
+    The first epoch whose weights are within `tolerance` (L1) of the steady state,
+    the mean weights of the last quarter of the epochs, or None; and the jitter, the
+    mean L1 distance of those last epochs from the steady state. A trace is noisy, so
+    weights settle around the steady state rather than stop changing; a lower alpha
+    settles more slowly but with less jitter.
+    """
+    weights = np.array([r["weights"] for r in results if r["weights"] is not None])
+    if not len(weights):
+        return None, 0.0
+    tail = weights[-max(1, len(weights) // 4) :]
+    steady = tail.mean(axis=0)
+    distances = np.abs(weights - steady).sum(axis=1)
+    within = np.flatnonzero(distances < tolerance)
+    # Epochs before weights were first set have none to compare
+    offset = len(results) - len(weights)
+    epoch = int(within[0]) + offset if len(within) else None
+    return epoch, float(np.abs(tail - steady).sum(axis=1).mean())
@@ -0,0 +1,93 @@
+import itertools
+import json
+import os
+import sqlite3
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from masa.validator.checkpoint import MANIFEST, load_legacy_state
+from masa.validator.weights_history import WeightsHistory
+
+
+def load_volumes(path: str) -> List[dict]:
+    """
+    Recorded volumes as [{"tempo": ..., "miners": {uid: volume}}], oldest first, from
+    a pickled state.pt, a checkpoint directory, a state.db or a JSON file (e.g. saved
+    from the /volumes endpoint). Files are only read, so a running validator's state
+    can be used.
+    """
+    if os.path.isdir(path):
+        # Not Checkpointer.load, which removes files a save in progress may still need
+        with open(os.path.join(path, MANIFEST)) as f:
+            manifest = json.load(f)
+        with open(os.path.join(path, manifest["volumes"])) as f:
+            volumes = json.load(f)
+    elif path.endswith(".pt"):
+        volumes = load_legacy_state(path, lambda history: None)["volumes"]
+    elif path.endswith(".db"):
+        # Not SQLiteStateStore, which creates the schema and switches to WAL
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = connection.execute(
+                "SELECT tempo, uid, volume FROM volumes ORDER BY tempo, uid"
+            ).fetchall()
+        finally:
+            connection.close()
+        volumes = []
+        for tempo, uid, volume in rows:
+            if not volumes or volumes[-1]["tempo"] != tempo:
+                volumes.append({"tempo": tempo, "miners": {}})
+            volumes[-1]["miners"][uid] = volume
+    else:
+        with open(path) as f:
+            volumes = json.load(f)
+    return [
+        {
+            "tempo": int(volume["tempo"]),
+            "miners": {int(uid): value for uid, value in volume["miners"].items()},
+        }
+        for volume in volumes
+    ]
+
+
+def replay(volumes: List[dict], epochs: Optional[int] = None) -> Iterator[dict]:
+    """
+    `volumes` tempo by tempo, repeated until `epochs` tempos have been yielded (once
+    if None). A state only holds the last volume_window tempos, so repeating it is
+    what makes a recorded trace long enough to watch scores converge.
+    """
+    if not volumes:
+        return
+    span = volumes[-1]["tempo"] - volumes[0]["tempo"] + 1
+    count = len(volumes) if epochs is None else epochs
+    for i, volume in enumerate(itertools.islice(itertools.cycle(volumes), count)):
+        cycle = i // len(volumes)
+        yield {"tempo": volume["tempo"] + cycle * span, "miners": volume["miners"]}
+
+
+def synthetic_volumes(
+    n_uids: int, epochs: int, inactive: float = 0.1, seed: int = 0
+) -> Iterator[dict]:
+    """
+    A synthetic trace of `n_uids` miners over `epochs` tempos. Each miner has a
+    lognormal base volume and reports a Poisson draw around it every tempo, or
+    nothing with probability `inactive`.
+    """
+    rng = np.random.default_rng(seed)
+    base = rng.lognormal(mean=6.0, sigma=1.0, size=n_uids)
+    for tempo in range(epochs):
+        active = np.flatnonzero(rng.random(n_uids) >= inactive)
+        counts = rng.poisson(base[active])
+        yield {"tempo": tempo, "miners": dict(zip(active.tolist(), counts.tolist()))}
+
+
+def recorded_weights(path: str, netuid: int) -> Optional[np.ndarray]:
+    """
+    The weights last set on `netuid` in the weights history at `path`, scaled to
+    u16::MAX as set_weights records them, or None.
+    """
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"No weights history at {path}")
+    latest = WeightsHistory(path).latest(netuid)
+    return None if latest is None else latest["weights"]
@@ -267,6 +267,197 @@ def add_validator_args(cls, parser):
         default=False,
     )
 
+    parser.add_argument(
+        "--validator.max_concurrent_validations",
+        type=int,
+        help="Maximum number of miner tweet batches validated concurrently.",
+        default=10,
+    )
+
+    parser.add_argument(
+        "--validator.verification_rate",
+        type=float,
+        help="Sustained masa-ai tweet verifications per second, shared by all miners.",
+        default=1.0,
+    )
+
+    parser.add_argument(
+        "--validator.verification_burst",
+        type=int,
+        help="Number of masa-ai tweet verifications allowed in a burst above the sustained rate.",
+        default=3,
+    )
+
+    parser.add_argument(
+        "--validator.verification_concurrency",
+        type=int,
+        help="Maximum number of masa-ai tweet verifications in flight at once.",
+        default=4,
+    )
+
+    parser.add_argument(
+        "--validator.verification_round_budget",
+        type=int,
+        help="Maximum masa-ai tweet verifications per synthetic round (0 for unlimited).",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--validator.verification_timeout",
+        type=float,
+        help="Seconds to wait for a single masa-ai tweet verification before giving up.",
+        default=30.0,
+    )
+
+    parser.add_argument(
+        "--validator.verdict_cache_size",
+        type=int,
+        help="Maximum number of tweet verification verdicts kept in memory.",
+        default=100000,
+    )
+
+    parser.add_argument(
+        "--validator.verdict_cache_ttl",
+        type=float,
+        help="Seconds a tweet verification verdict stays valid.",
+        default=86400,
+    )
+
+    parser.add_argument(
+        "--validator.verdict_cache_persist",
+        action="store_true",
+        help="Persist tweet verification verdicts under the neuron path across restarts.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--validator.healthcheck_max_inflight_batches",
+        type=int,
+        help="Maximum healthcheck ping batches in flight at once.",
+        default=16,
+    )
+
+    parser.add_argument(
+        "--validator.tweet_history_blocks",
+        type=int,
+        help="Blocks a miner's returned tweet IDs are remembered for per-miner dedup.",
+        default=50400,
+    )
+
+    parser.add_argument(
+        "--validator.seen_index_max_ids",
+        type=int,
+        help="Maximum tweet IDs kept in the subnet-wide first-seen index; oldest blocks are evicted beyond it.",
+        default=5000000,
+    )
+
+    parser.add_argument(
+        "--validator.dendrite_pool_size",
+        type=int,
+        help="Maximum open connections in the validator's pooled dendrite (0 = unlimited).",
+        default=256,
+    )
+
+    parser.add_argument(
+        "--validator.dendrite_connections_per_miner",
+        type=int,
+        help="Maximum open connections to a single miner axon (0 = unlimited).",
+        default=4,
+    )
+
+    parser.add_argument(
+        "--validator.dendrite_keepalive",
+        type=float,
+        help="Seconds an idle miner connection is kept open for reuse.",
+        default=30.0,
+    )
+
+    parser.add_argument(
+        "--validator.dendrite_dns_cache_ttl",
+        type=int,
+        help="Seconds resolved miner hostnames are cached.",
+        default=300,
+    )
+
+    parser.add_argument(
+        "--validator.export_batch_size",
+        type=int,
+        help="Maximum tweets per export request; miners' tweets for the same query are coalesced up to it.",
+        default=1000,
+    )
+
+    parser.add_argument(
+        "--validator.export_max_latency",
+        type=float,
+        help="Seconds queued tweets wait for a full export batch before being sent anyway.",
+        default=5.0,
+    )
+
+    parser.add_argument(
+        "--validator.export_queue_size",
+        type=int,
+        help="Maximum tweets waiting for export; further tweets are dropped instead of blocking validation.",
+        default=100000,
+    )
+
+    parser.add_argument(
+        "--validator.export_max_retries",
+        type=int,
+        help="Times a failed export request is retried, with jittered exponential backoff.",
+        default=5,
+    )
+
+    parser.add_argument(
+        "--validator.export_spool_segment_mb",
+        type=int,
+        help="MB of new exports after which the on-disk export spool starts a new segment and compacts the old ones.",
+        default=64,
+    )
+
+    parser.add_argument(
+        "--validator.export_resend_backoff",
+        type=float,
+        help="Seconds before a failed or dropped export batch is read back from the spool and sent again; doubles with every failure, up to an hour.",
+        default=60.0,
+    )
+
+    parser.add_argument(
+        "--validator.export_compression",
+        type=str,
+        choices=["identity", "gzip", "zstd"],
+        help="Content-Encoding of export request bodies (zstd requires the zstandard package).",
+        default="identity",
+    )
+
+    parser.add_argument(
+        "--validator.weights_history_retention_days",
+        type=int,
+        help="Days of set weights kept in the weights history, 0 to keep all.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--validator.state_backend",
+        type=str,
+        choices=["files", "sqlite"],
+        help="Where validator state is saved: checkpoint files, or a SQLite database (WAL) the API reads from.",
+        default="files",
+    )
+
+    parser.add_argument(
+        "--validator.checkpoint_interval",
+        type=float,
+        help="Seconds between checkpoints of the changed parts of the validator state.",
+        default=60.0,
+    )
+
+    parser.add_argument(
+        "--validator.checkpoint_max_pending_mb",
+        type=int,
+        help="Checkpoint before the interval is up once this many MB of tweet history are unsaved.",
+        default=16,
+    )
+
 
 def config(cls):
     """
@@ -0,0 +1,145 @@
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+from masa.validator.tweet_decoder import MAPPING_TYPES
+
+# Per-tweet failure flags, combined as a bitmask
+MALFORMED = 1
+INVALID_ID = 2
+DUPLICATE = 4
+STALE = 8
+
+FAILURE_NAMES = {
+    MALFORMED: "malformed",
+    INVALID_ID: "invalid ID",
+    DUPLICATE: "duplicate",
+    STALE: "too old",
+}
+
+# Largest tweet ID that fits the uint64 stores
+_MAX_ID = str(2**64 - 1)
+
+
+class BatchValidation(NamedTuple):
+    """
+    Structural validation of a miner's whole response, aligned with its tweets.
+
+    `failures` holds the failure flags of each tweet (0 if it passed); `ids` and
+    `timestamps` hold the parsed values, 0 where they could not be parsed.
+    """
+
+    ids: np.ndarray
+    timestamps: np.ndarray
+    failures: np.ndarray
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures.any()
+
+    def failed_positions(self, flag: int) -> np.ndarray:
+        return np.flatnonzero(self.failures & flag)
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{len(self.failed_positions(flag))} {name}"
+            for flag, name in FAILURE_NAMES.items()
+            if (self.failures & flag).any()
+        )
+
+
+# Powers of ten for turning digit code points into uint64 values
+_POW10 = 10 ** np.arange(len(_MAX_ID), dtype=np.uint64)
+
+
+def _extract(responses: List) -> Tuple[List, List]:
+    """Pull every tweet's ID and Timestamp in one pass; None where absent."""
+    ids, timestamps = [], []
+    for item in responses:
+        tweet = item.get("Tweet") if type(item) in MAPPING_TYPES else None
+        if type(tweet) in MAPPING_TYPES:
+            ids.append(tweet.get("ID"))
+            timestamps.append(tweet.get("Timestamp"))
+        else:
+            ids.append(None)
+            timestamps.append(None)
+    return ids, timestamps
+
+
+def parse_ids(raw_ids: List) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized strict_tweet_id_validation and parsing.
+
+    Valid IDs are non-empty ASCII digit strings without a leading zero that fit in
+    uint64. Returns the validity mask and the uint64 IDs (0 where invalid).
+    """
+    n = len(raw_ids)
+    strings = [i if type(i) is str else "" for i in raw_ids]
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=n)
+    if n == 0 or lengths.max() == 0:
+        return np.zeros(n, dtype=bool), np.zeros(n, dtype=np.uint64)
+
+    # One row of UTF-32 code points per ID, zero padded
+    array = np.array(strings, dtype=f"U{lengths.max()}")
+    codes = array.view(np.uint32).reshape(n, -1)
+    in_string = np.arange(codes.shape[1]) < lengths[:, None]
+    is_digit = (codes >= ord("0")) & (codes <= ord("9"))
+    valid = (
+        (lengths > 0)
+        & (is_digit | ~in_string).all(axis=1)
+        & (codes[:, 0] != ord("0"))
+        # numpy drops trailing NULs, so a length mismatch means there were some
+        & (np.char.str_len(array) == lengths)
+        & ((lengths < len(_MAX_ID)) | ((lengths == len(_MAX_ID)) & (array <= _MAX_ID)))
+    )
+
+    # Each digit times ten to the power of its distance from the end of the string
+    digits = np.where(in_string & valid[:, None], codes - ord("0"), 0).astype(np.uint64)
+    exponents = np.clip(lengths[:, None] - 1 - np.arange(codes.shape[1]), 0, None)
+    with np.errstate(over="ignore"):
+        ids = (digits * _POW10[exponents]).sum(axis=1, dtype=np.uint64)
+    return valid, ids
+
+
+def valid_id_mask(raw_ids: List) -> np.ndarray:
+    return parse_ids(raw_ids)[0]
+
+
+def _parse_timestamps(raw_timestamps: List) -> np.ndarray:
+    """Timestamps as int64 seconds; anything that is not a plain number becomes 0."""
+    array = np.array(raw_timestamps)
+    if array.dtype.kind not in "iuf":
+        array = np.array(
+            [t if type(t) in (int, float) else 0 for t in raw_timestamps],
+            dtype=np.float64,
+        )
+    array = array.astype(np.float64)
+    array[~np.isfinite(array) | (array < 0) | (array >= 2**62)] = 0
+    return array.astype(np.int64)
+
+
+def validate_batch(responses: List, cutoff_timestamp: float) -> BatchValidation:
+    """
+    Check every tweet of a response in a few vectorized passes: structure, ID syntax,
+    duplicates within the batch, and timestamps at or after `cutoff_timestamp`.
+    """
+    n = len(responses)
+    raw_ids, raw_timestamps = _extract(responses)
+    failures = np.zeros(n, dtype=np.uint8)
+
+    malformed = np.fromiter((not i for i in raw_ids), dtype=bool, count=n)
+    failures[malformed] |= MALFORMED
+    valid_ids, ids = parse_ids(raw_ids)
+    failures[~valid_ids & ~malformed] |= INVALID_ID
+
+    # Every occurrence after the first of an ID is a duplicate
+    valid_positions = np.flatnonzero(valid_ids)
+    _, first = np.unique(ids[valid_positions], return_index=True)
+    duplicate = np.ones(len(valid_positions), dtype=bool)
+    duplicate[first] = False
+    failures[valid_positions[duplicate]] |= DUPLICATE
+
+    timestamps = _parse_timestamps(raw_timestamps)
+    failures[(timestamps < cutoff_timestamp) & ~malformed] |= STALE
+
+    return BatchValidation(ids, timestamps, failures)
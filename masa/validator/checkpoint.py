@@ -0,0 +1,382 @@
+import asyncio
+import copy
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import bittensor as bt
+import numpy as np
+import torch
+
+from masa.validator.tweet_ids import TweetIdHistory, TweetIdSet
+
+CHECKPOINT_VERSION = 2
+MANIFEST = "manifest.json"
+TWEETS_DIR = "tweets"
+# First 8 bytes of a tweet history segment file
+SEGMENT_MAGIC = b"TWIDSEG1"
+
+
+def atomic_write(path: str, write: Callable):
+    """Write a file through `write(f)` to a temporary file, then move it into place."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def _write_json(value) -> Callable:
+    data = json.dumps(value).encode()
+    return lambda f: f.write(data)
+
+
+def _write_npy(array: np.ndarray) -> Callable:
+    return lambda f: np.save(f, array, allow_pickle=False)
+
+
+def _write_segment(uids: List[int], segments: List[np.ndarray]) -> Callable:
+    def write(f):
+        f.write(SEGMENT_MAGIC)
+        f.write(np.uint64(len(uids)).tobytes())
+        f.write(np.array(uids, dtype=np.int64).tobytes())
+        f.write(np.array([len(ids) for ids in segments], dtype=np.uint64).tobytes())
+        for ids in segments:
+            f.write(np.ascontiguousarray(ids, dtype=np.uint64).tobytes())
+
+    return write
+
+
+def read_segment(path: str, mmap: bool = True) -> Tuple[List[int], List[np.ndarray]]:
+    """
+    Read a tweet history segment file: the miner uids in it, and the IDs of each as
+    consecutive slices of one uint64 array, memory-mapped unless `mmap` is False.
+
+    Layout, all little-endian and 8 byte aligned: SEGMENT_MAGIC, the number of miners
+    n, n int64 uids, n uint64 ID counts, then every miner's sorted uint64 IDs in order.
+    """
+    with open(path, "rb") as f:
+        header = f.read(16)
+        if len(header) < 16 or header[:8] != SEGMENT_MAGIC:
+            raise ValueError(f"Not a tweet history segment: {path}")
+        n = int(np.frombuffer(header, dtype="<u8", offset=8)[0])
+        uids = np.fromfile(f, dtype="<i8", count=n)
+        counts = np.fromfile(f, dtype="<u8", count=n)
+    if len(counts) < n:
+        raise ValueError(f"Truncated tweet history segment: {path}")
+    offset = 16 + 16 * n
+    total = int(counts.sum())
+    if total == 0:
+        ids = np.zeros(0, dtype=np.uint64)
+    elif mmap:
+        ids = np.memmap(path, dtype="<u8", mode="r", offset=offset, shape=(total,))
+        # Plain ndarray views of the mapping slice and search without memmap overhead
+        ids = ids.view(np.ndarray)
+    else:
+        ids = np.fromfile(path, dtype="<u8", offset=offset)
+        if len(ids) < total:
+            raise ValueError(f"Truncated tweet history segment: {path}")
+    offsets = [0] + np.cumsum(counts).tolist()
+    return uids.tolist(), [ids[offsets[i] : offsets[i + 1]] for i in range(n)]
+
+
+def load_legacy_state(
+    state_path: str, load_history: Callable[[object], TweetIdHistory]
+) -> dict:
+    """
+    Load a state.pt pickled by older versions. `load_history` turns each saved tweet
+    history, whatever its type, into a TweetIdHistory.
+    """
+    # Pickled sets and TweetIdHistory objects, only ever from our own state.pt
+    state = dict(torch.load(state_path, map_location="cpu", weights_only=False))
+    if state.get("scores") is None:
+        raise ValueError(f"No scores in {state_path}")
+    return {
+        "step": state.get("step", 0),
+        "scores": state["scores"],
+        "hotkeys": state.get("hotkeys", []),
+        "volumes": state.get("volumes", []),
+        "tweets_by_uid": {
+            uid: load_history(tweet_ids)
+            for uid, tweet_ids in state.get("tweets_by_uid", {}).items()
+        },
+    }
+
+
+class Checkpointer:
+    """
+    Incremental, per-component checkpoints of the validator state.
+
+    The state is split into components, each in its own file under `path`: scores
+    (scores.<n>.npy, float32) and hotkeys (hotkeys.<n>.npy, bytes) indexed by uid,
+    volumes (volumes.<n>.json), and the tweet histories as one binary file per history
+    segment start (tweets/<start>.<n>.bin, see `read_segment`) holding that segment of
+    every miner, where n is the number of the save that wrote the file. A versioned
+    JSON manifest names the files and holds the step, and nothing is pickled.
+
+    A save only writes the components that changed since the last one, so the sealed
+    history segments, which make up nearly all of the state, are written once and
+    deleted when they expire instead of being rewritten every round. A file is never
+    modified once written: changed components go to new files, the manifest is then
+    replaced atomically to refer to them, and only after that are the files it no
+    longer names deleted. A crash at any point leaves the previous or the new
+    checkpoint whole. Saves are bounded in time and size: changes are written once
+    `interval` seconds have passed since the last save, or sooner once
+    `max_pending_bytes` of tweet IDs are waiting to be written.
+
+    `load()` memory-maps the history segments, so the validator starts without
+    reading its histories into memory; pages are read as lookups touch them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = 60.0,
+        max_pending_bytes: int = 16 * 2**20,
+    ):
+        self.path = path
+        self.interval = max(0.0, float(interval))
+        self.max_pending_bytes = max(1, int(max_pending_bytes))
+        os.makedirs(os.path.join(self.path, TWEETS_DIR), exist_ok=True)
+        # What the files on disk hold, per component
+        self._saved: Dict[str, object] = {}
+        # Segment start -> (uid, number of ids) of every history with that segment
+        self._saved_segments: Dict[int, Tuple] = {}
+        # Component (name, or segment start) -> the file holding it
+        self._files: Dict[object, str] = {}
+        # Number of the last save, which names its files
+        self._generation = 0
+        self.last_save = time.monotonic()
+
+        self.saves = 0
+        self.files_written = 0
+        self.bytes_written = 0
+
+    def _component_path(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @staticmethod
+    def _segment_name(start: int, generation: int) -> str:
+        return os.path.join(TWEETS_DIR, f"{start}.{generation}.bin")
+
+    def exists(self) -> bool:
+        return os.path.isfile(self._component_path(MANIFEST))
+
+    @staticmethod
+    def _segments(tweets_by_uid: Dict[int, TweetIdHistory]) -> Dict[int, list]:
+        """Segment start -> [(uid, TweetIdSet)], uids in ascending order."""
+        segments: Dict[int, list] = {}
+        for uid in sorted(tweets_by_uid):
+            for start, tweet_ids in tweets_by_uid[uid].segments:
+                segments.setdefault(start, []).append((uid, tweet_ids))
+        return segments
+
+    def prepare(self, state: dict, force: bool = False) -> Optional[list]:
+        """
+        Snapshot the components of `state` changed since the last save, if a save is
+        due. Returns a list of (component, file, write, fingerprint) or None, the
+        manifest last. Called on the event loop, so the snapshot is consistent; the
+        files are written by `write()`.
+        """
+        generation = self._generation + 1
+        plan = []
+        scores = state["scores"]
+        saved_scores = self._saved.get("scores")
+        if (
+            saved_scores is None
+            or saved_scores.shape != scores.shape
+            or not torch.equal(saved_scores, scores.cpu())
+        ):
+            scores = scores.detach().cpu().clone()
+            array = scores.numpy().astype(np.float32)
+            plan.append(
+                ("scores", f"scores.{generation}.npy", _write_npy(array), scores)
+            )
+
+        hotkeys = list(state["hotkeys"])
+        if self._saved.get("hotkeys") != hotkeys:
+            array = np.array([hotkey.encode() for hotkey in hotkeys], dtype=np.bytes_)
+            plan.append(
+                ("hotkeys", f"hotkeys.{generation}.npy", _write_npy(array), hotkeys)
+            )
+
+        if self._saved.get("volumes") != state["volumes"]:
+            volumes = copy.deepcopy(state["volumes"])
+            plan.append(
+                (
+                    "volumes",
+                    f"volumes.{generation}.json",
+                    _write_json(volumes),
+                    volumes,
+                )
+            )
+
+        pending_bytes = 0
+        segments = self._segments(state["tweets_by_uid"])
+        for start, members in segments.items():
+            fingerprint = tuple((uid, len(ids)) for uid, ids in members)
+            if self._saved_segments.get(start) == fingerprint:
+                continue
+            # TweetIdSet replaces its array on update, so holding it is a snapshot
+            arrays = [ids.ids for _, ids in members]
+            pending_bytes += sum(array.nbytes for array in arrays)
+            plan.append(
+                (
+                    start,
+                    self._segment_name(start, generation),
+                    _write_segment([uid for uid, _ in members], arrays),
+                    fingerprint,
+                )
+            )
+        for start in self._saved_segments.keys() - segments.keys():
+            # Expired everywhere
+            plan.append((start, None, None, None))
+
+        step = int(state["step"])
+        if plan or self._saved.get(MANIFEST) != step:
+            files = dict(self._files)
+            for component, name, _, _ in plan:
+                files[component] = name
+            manifest = {
+                "version": CHECKPOINT_VERSION,
+                "generation": generation,
+                "step": step,
+                "scores": files["scores"],
+                "hotkeys": files["hotkeys"],
+                "volumes": files["volumes"],
+                "tweets": {str(start): files[start] for start in sorted(segments)},
+            }
+            plan.append((MANIFEST, MANIFEST, _write_json(manifest), step))
+
+        if not plan:
+            return None
+        if (
+            force
+            or time.monotonic() - self.last_save >= self.interval
+            or pending_bytes >= self.max_pending_bytes
+        ):
+            self._generation = generation
+            return plan
+        return None
+
+    def write(self, plan: list) -> int:
+        """Write a prepared plan and record what is on disk. Returns bytes written."""
+        written = 0
+        for _, name, write, _ in plan:
+            if write is not None:
+                path = self._component_path(name)
+                atomic_write(path, write)
+                written += os.path.getsize(path)
+        # Only once the manifest, written last, no longer refers to them
+        for component, name, _, _ in plan:
+            previous = self._files.get(component)
+            if previous is None or previous == name:
+                continue
+            if os.path.exists(self._component_path(previous)):
+                os.remove(self._component_path(previous))
+
+        for component, name, _, fingerprint in plan:
+            if component == MANIFEST:
+                self._saved[MANIFEST] = fingerprint
+                continue
+            if name is None:
+                self._files.pop(component, None)
+            else:
+                self._files[component] = name
+            if isinstance(component, int):
+                if fingerprint is None:
+                    self._saved_segments.pop(component, None)
+                else:
+                    self._saved_segments[component] = fingerprint
+            else:
+                self._saved[component] = fingerprint
+        self.last_save = time.monotonic()
+        self.saves += 1
+        self.files_written += sum(1 for _, _, write, _ in plan if write is not None)
+        self.bytes_written += written
+        bt.logging.debug(f"Checkpointed {len(plan)} components, {written} bytes")
+        return written
+
+    async def save(self, state: dict, force: bool = False) -> int:
+        """Write the changed components of `state` in a worker thread, if due."""
+        plan = self.prepare(state, force)
+        if plan is None:
+            return 0
+        return await asyncio.get_event_loop().run_in_executor(None, self.write, plan)
+
+    def load(
+        self, new_history: Callable[[], TweetIdHistory], mmap: bool = True
+    ) -> dict:
+        """
+        Reassemble the state saved in `path`, rebuilding each miner's TweetIdHistory
+        with `new_history()` around the segment files, memory-mapped unless `mmap` is
+        False.
+        """
+        with open(self._component_path(MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"Unsupported checkpoint version {manifest.get('version')}"
+            )
+        state = {"step": manifest["step"]}
+        self._saved[MANIFEST] = manifest["step"]
+        self._generation = manifest.get("generation", 0)
+        self._files = {key: manifest[key] for key in ("scores", "hotkeys", "volumes")}
+
+        scores = np.load(self._component_path(manifest["scores"]), allow_pickle=False)
+        state["scores"] = torch.from_numpy(scores)
+        self._saved["scores"] = state["scores"].clone()
+        hotkeys = np.load(self._component_path(manifest["hotkeys"]), allow_pickle=False)
+        state["hotkeys"] = [hotkey.decode() for hotkey in hotkeys.tolist()]
+        self._saved["hotkeys"] = list(state["hotkeys"])
+        with open(self._component_path(manifest["volumes"])) as f:
+            state["volumes"] = json.load(f)
+        self._saved["volumes"] = copy.deepcopy(state["volumes"])
+
+        tweets_by_uid: Dict[int, TweetIdHistory] = {}
+        for start, name in sorted(
+            (int(start), name) for start, name in manifest["tweets"].items()
+        ):
+            uids, segments = read_segment(self._component_path(name), mmap=mmap)
+            for uid, ids in zip(uids, segments):
+                if uid not in tweets_by_uid:
+                    tweets_by_uid[uid] = new_history()
+                tweets_by_uid[uid].segments.append((start, TweetIdSet.from_sorted(ids)))
+            self._saved_segments[start] = tuple(
+                (uid, len(ids)) for uid, ids in zip(uids, segments)
+            )
+            self._files[start] = name
+        state["tweets_by_uid"] = tweets_by_uid
+
+        # Left behind by a save interrupted before or after its manifest was written
+        referenced = {os.path.normpath(name) for name in self._files.values()}
+        referenced.add(MANIFEST)
+        for directory in ("", TWEETS_DIR):
+            for name in os.listdir(self._component_path(directory)):
+                name = os.path.join(directory, name)
+                path = self._component_path(name)
+                if os.path.isfile(path) and name not in referenced:
+                    os.remove(path)
+        return state
+
+    def migrate(
+        self, state_path: str, load_history: Callable[[object], TweetIdHistory]
+    ) -> dict:
+        """
+        One-shot conversion of a pickled state.pt (see `load_legacy_state`): write it
+        out as a checkpoint and rename it to state.pt.migrated.
+        """
+        state = load_legacy_state(state_path, load_history)
+        self.write(self.prepare(state, force=True))
+        os.replace(state_path, state_path + ".migrated")
+        bt.logging.success(f"Migrated {state_path} to checkpoint {self.path}")
+        return state
+
+    def metrics(self) -> dict:
+        return {
+            "saves": self.saves,
+            "files_written": self.files_written,
+            "bytes_written": self.bytes_written,
+        }
@@ -0,0 +1,115 @@
+import collections
+from typing import Any, Callable, Optional
+
+import aiohttp
+import bittensor as bt
+
+from masa.validator.tweet_decoder import DecodingClientResponse
+
+
+class PooledDendrite(bt.dendrite):
+    """
+    A dendrite whose `session` is a pooled one from `session_factory`. bittensor sends
+    every request through `await dendrite.session`, so overriding that property is
+    enough. The factory is called again when the session was closed.
+    """
+
+    def __init__(
+        self,
+        wallet: Any,
+        session_factory: Callable[[], aiohttp.ClientSession],
+        history_size: int = 1000,
+    ):
+        super().__init__(wallet=wallet)
+        self.session_factory = session_factory
+        self.pooled_session: Optional[aiohttp.ClientSession] = None
+        # The dendrite records every call; bound it, as it lives for the whole run
+        self.synapse_history = collections.deque(maxlen=history_size)
+
+    @property
+    async def session(self) -> aiohttp.ClientSession:
+        if self.pooled_session is None or self.pooled_session.closed:
+            self.pooled_session = self.session_factory()
+        return self.pooled_session
+
+    async def aclose_session(self):
+        if self.pooled_session is not None:
+            await self.pooled_session.close()
+            self.pooled_session = None
+        await super().aclose_session()
+
+
+class DendritePool:
+    """
+    One long-lived dendrite shared by every outbound validator query.
+
+    Opening a fresh `bt.dendrite` per request rebuilds its aiohttp session (and with it
+    every TCP connection to the miners) and looks up the external IP again. The pool
+    keeps a single dendrite whose session uses a keep-alive connector with a global and
+    per-miner connection limit and a DNS cache, so consecutive rounds reuse warm
+    connections. Its responses decode tweet payloads into typed structs (see
+    tweet_decoder). The dendrite is a PooledDendrite, which creates the session lazily
+    on the running event loop and again if it was closed; `close()` releases it when
+    the validator shuts down.
+    """
+
+    def __init__(
+        self,
+        wallet: Any,
+        limit: int = 256,
+        limit_per_host: int = 4,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+        history_size: int = 1000,
+    ):
+        self.wallet = wallet
+        self.limit = max(0, int(limit))
+        self.limit_per_host = max(0, int(limit_per_host))
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.history_size = history_size
+        self.connections_created = 0
+        self.connections_reused = 0
+        self._dendrite: Optional[PooledDendrite] = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+        )
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        return aiohttp.ClientSession(
+            connector=connector,
+            trace_configs=[trace_config],
+            response_class=DecodingClientResponse,
+        )
+
+    async def _on_connection_created(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        self.connections_reused += 1
+
+    @property
+    def dendrite(self) -> PooledDendrite:
+        """The shared dendrite, created on first use."""
+        if self._dendrite is None:
+            self._dendrite = PooledDendrite(
+                self.wallet, self._create_session, self.history_size
+            )
+        return self._dendrite
+
+    def metrics(self) -> dict:
+        return {
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+        }
+
+    async def close(self):
+        if self._dendrite is not None:
+            await self._dendrite.aclose_session()
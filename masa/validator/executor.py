@@ -0,0 +1,37 @@
+import asyncio
+from typing import Any, Awaitable, Dict, Hashable
+
+
+class ValidationExecutor:
+    """
+    Runs per-miner validation coroutines as concurrent tasks, bounded by a shared semaphore.
+
+    The semaphore is shared by every round, so the number of miners being validated at
+    once never exceeds `max_concurrency`, no matter how many rounds or streams submit work.
+    """
+
+    def __init__(self, max_concurrency: int = 10):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.tasks: Dict[Hashable, asyncio.Task] = {}
+
+    async def _run_bounded(self, coro: Awaitable[Any]) -> Any:
+        async with self.semaphore:
+            return await coro
+
+    def submit(self, key: Hashable, coro: Awaitable[Any]) -> asyncio.Task:
+        """Schedule `coro` under the concurrency limit and track it by `key` (usually a uid)."""
+        task = asyncio.create_task(self._run_bounded(coro))
+        self.tasks[key] = task
+        return task
+
+    async def join(self) -> Dict[Hashable, Any]:
+        """
+        Wait for every submitted task and return their results keyed by submission key.
+
+        Exceptions are returned in place of results rather than raised, so one failing
+        miner does not discard the outcomes of the others.
+        """
+        tasks, self.tasks = self.tasks, {}
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return dict(zip(tasks.keys(), results))
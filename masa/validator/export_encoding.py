@@ -0,0 +1,93 @@
+import json
+import zlib
+from typing import AsyncIterator, Iterator, List, Optional
+
+try:
+    import orjson
+
+    dumps = orjson.dumps
+except ImportError:
+
+    def dumps(value) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CONTENT_ENCODINGS = ("identity", "gzip", "zstd")
+# Compression levels used unless one is given
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+class _Identity:
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class PayloadEncoder:
+    """
+    Encodes export requests as a stream of JSON chunks, optionally compressed.
+
+    The body {"Hotkey": ..., "Query": ..., "Tweets": [...]} is written out
+    `tweets_per_chunk` tweets at a time with orjson (the standard json module if it is
+    not installed) and fed through an incremental gzip or zstd compressor, so a large
+    batch is never held in memory as one JSON string and one encoded body. Posted as
+    an async iterable, aiohttp sends it with chunked transfer encoding.
+    """
+
+    def __init__(
+        self,
+        content_encoding: str = "identity",
+        level: Optional[int] = None,
+        tweets_per_chunk: int = 100,
+    ):
+        if content_encoding not in CONTENT_ENCODINGS:
+            raise ValueError(f"Unsupported export content encoding: {content_encoding}")
+        if content_encoding == "zstd" and zstandard is None:
+            raise ValueError("zstd export compression requires the zstandard package")
+        self.content_encoding = content_encoding
+        self.level = (
+            level if level is not None else DEFAULT_LEVELS.get(content_encoding)
+        )
+        self.tweets_per_chunk = max(1, int(tweets_per_chunk))
+
+    @property
+    def headers(self) -> dict:
+        headers = {"Content-Type": "application/json"}
+        if self.content_encoding != "identity":
+            headers["Content-Encoding"] = self.content_encoding
+        return headers
+
+    def _compressor(self):
+        if self.content_encoding == "gzip":
+            return zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        if self.content_encoding == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compressobj()
+        return _Identity()
+
+    def chunks(self, hotkey: str, query: str, tweets: List[dict]) -> Iterator[bytes]:
+        compressor = self._compressor()
+        head = b'{"Hotkey":%b,"Query":%b,"Tweets":[' % (dumps(hotkey), dumps(query))
+        chunk = compressor.compress(head)
+        if chunk:
+            yield chunk
+        for start in range(0, len(tweets), self.tweets_per_chunk):
+            part = b",".join(
+                dumps(tweet) for tweet in tweets[start : start + self.tweets_per_chunk]
+            )
+            chunk = compressor.compress(part if start == 0 else b"," + part)
+            if chunk:
+                yield chunk
+        yield compressor.compress(b"]}") + compressor.flush()
+
+    async def body(
+        self, hotkey: str, query: str, tweets: List[dict]
+    ) -> AsyncIterator[bytes]:
+        for chunk in self.chunks(hotkey, query, tweets):
+            yield chunk
@@ -0,0 +1,204 @@
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import bittensor as bt
+
+try:
+    import orjson
+
+    def dumps(record: dict) -> bytes:
+        return orjson.dumps(record)
+
+    loads = orjson.loads
+except ImportError:
+
+    def dumps(record: dict) -> bytes:
+        return json.dumps(record).encode()
+
+    loads = json.loads
+
+SEGMENT_SUFFIX = ".wal"
+
+
+class ExportSpool:
+    """
+    Append-only, segmented write-ahead log of tweet batches waiting for export.
+
+    Every validated batch is appended as one JSON line, {"id", "query", "tweets"},
+    before it is sent, and acknowledged with an {"ack": [ids]} line once the protocol
+    API has stored it, so batches pending or failed when the process stops are replayed
+    by `recover()` on the next start. Lines go to the newest segment file; once
+    `segment_bytes` of new lines were written to it a new one is started and the sealed
+    ones are compacted: the records still unacknowledged are copied forward and the old
+    files deleted. Copied records do not count towards the next roll, so a backlog
+    larger than `segment_bytes` is rewritten once per `segment_bytes` appended, not on
+    every append. A torn last line from a crash mid-append is ignored. Delivery is at
+    least once.
+
+    The spool does blocking file I/O and is not thread-safe. ExportQueue calls
+    `recover()` at startup and then does every append, ack, read and sync on a single
+    worker thread; only `reserve()` is called from the event loop.
+    """
+
+    def __init__(self, path: str, segment_bytes: int = 64 * 2**20):
+        self.path = path
+        self.segment_bytes = max(1, int(segment_bytes))
+        os.makedirs(self.path, exist_ok=True)
+        self.next_id = 0
+        # Unacknowledged record id -> sequence number of the segment holding it
+        self._unacked: Dict[int, int] = {}
+        self._sequence = -1
+        self._file = None
+        # Bytes of new records written to the current segment, not counting carried ones
+        self._appended = 0
+
+    def _segments(self) -> List[int]:
+        return sorted(
+            int(name[: -len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.path)
+            if name.endswith(SEGMENT_SUFFIX) and name[: -len(SEGMENT_SUFFIX)].isdigit()
+        )
+
+    def _segment_path(self, sequence: int) -> str:
+        return os.path.join(self.path, f"{sequence:08d}{SEGMENT_SUFFIX}")
+
+    @staticmethod
+    def _read(path: str):
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    yield loads(line)
+                except ValueError:
+                    # Only the last line of a segment can be torn, by a crash mid-append
+                    bt.logging.warning(
+                        f"Skipping unreadable export spool line in {path}"
+                    )
+
+    def _open_segment(self):
+        if self._file is not None:
+            self._file.close()
+        self._sequence += 1
+        self._file = open(self._segment_path(self._sequence), "ab")
+        self._appended = 0
+
+    def _write(self, record: dict) -> int:
+        line = dumps(record) + b"\n"
+        self._file.write(line)
+        self._file.flush()
+        return len(line)
+
+    def recover(self) -> List[Tuple[int, str, List[dict]]]:
+        """
+        Scan every segment and return the unacknowledged batches as (id, query, tweets),
+        oldest first. Appends then go to a fresh segment and the old ones are compacted.
+        """
+        batches: Dict[int, tuple] = {}
+        segments = self._segments()
+        for sequence in segments:
+            for record in self._read(self._segment_path(sequence)):
+                if "ack" in record:
+                    for record_id in record["ack"]:
+                        batches.pop(record_id, None)
+                else:
+                    batches[record["id"]] = (record["query"], record["tweets"])
+                    self.next_id = max(self.next_id, record["id"] + 1)
+                    self._unacked[record["id"]] = sequence
+        for record_id in list(self._unacked):
+            if record_id not in batches:
+                del self._unacked[record_id]
+
+        self._sequence = segments[-1] if segments else -1
+        self._open_segment()
+        self.compact()
+        if batches:
+            bt.logging.info(f"Recovered {len(batches)} unexported batches from spool")
+        return [(record_id, *batch) for record_id, batch in sorted(batches.items())]
+
+    def reserve(self) -> int:
+        """A new record id, for a batch appended later, e.g. from another thread."""
+        record_id = self.next_id
+        self.next_id += 1
+        return record_id
+
+    def append(
+        self, query: str, tweets: List[dict], record_id: Optional[int] = None
+    ) -> int:
+        """Record a batch before it is sent and return its id (`record_id` if given)."""
+        if self._file is None:
+            self._open_segment()
+        if record_id is None:
+            record_id = self.reserve()
+        self._appended += self._write(
+            {"id": record_id, "query": query, "tweets": tweets}
+        )
+        self._unacked[record_id] = self._sequence
+        self._roll()
+        return record_id
+
+    def read(self, record_ids: List[int]) -> List[Tuple[int, str, List[dict]]]:
+        """
+        Read back the batches of `record_ids` still unacknowledged, as (id, query,
+        tweets), oldest first, e.g. to send them again after a failed export.
+        """
+        wanted = {i: self._unacked[i] for i in record_ids if i in self._unacked}
+        batches: Dict[int, tuple] = {}
+        for sequence in sorted(set(wanted.values())):
+            for record in self._read(self._segment_path(sequence)):
+                record_id = record.get("id")
+                if record_id is not None and wanted.get(record_id) == sequence:
+                    batches[record_id] = (record["query"], record["tweets"])
+        return [(record_id, *batch) for record_id, batch in sorted(batches.items())]
+
+    def ack(self, record_ids: List[int]):
+        """Mark batches as stored by the protocol API."""
+        record_ids = [i for i in record_ids if self._unacked.pop(i, None) is not None]
+        if record_ids:
+            self._appended += self._write({"ack": record_ids})
+            self._roll()
+
+    def _roll(self):
+        if self._appended >= self.segment_bytes:
+            self._open_segment()
+            self.compact()
+
+    def sync(self):
+        """Flush appended records to stable storage."""
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def compact(self):
+        """
+        Copy the unacknowledged records of sealed segments into the current one and
+        delete the sealed files. A crash in between leaves a record in both, which
+        `recover()` reads once.
+        """
+        sealed = [s for s in self._segments() if s < self._sequence]
+        if not sealed:
+            return
+        carried = 0
+        holding = set(self._unacked.values())
+        for sequence in sealed:
+            if sequence not in holding:
+                # Fully acknowledged, nothing to carry
+                continue
+            for record in self._read(self._segment_path(sequence)):
+                if self._unacked.get(record.get("id")) == sequence:
+                    self._write(record)
+                    self._unacked[record["id"]] = self._sequence
+                    carried += 1
+        self.sync()
+        for sequence in sealed:
+            os.remove(self._segment_path(sequence))
+        bt.logging.debug(
+            f"Compacted {len(sealed)} export spool segments, carried {carried} batches"
+        )
+
+    def unacked(self) -> int:
+        return len(self._unacked)
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,376 @@
+import asyncio
+import collections
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import aiohttp
+import bittensor as bt
+
+from masa.validator.export_encoding import PayloadEncoder
+from masa.validator.export_spool import ExportSpool
+
+# Statuses the protocol API answers once it has stored a batch
+ACCEPTED = (200, 206)
+
+
+class ExportQueue:
+    """
+    Background export of validated tweets to the protocol API.
+
+    `submit()` only buffers tweets and never waits, so validation does not slow down
+    when the API does. A single worker task coalesces the tweets of every miner
+    exporting the same query into requests of up to `batch_size` tweets, and sends a
+    partial batch once its oldest tweet has waited `max_latency` seconds. Requests go
+    over one keep-alive session with bodies streamed by `encoder`; network errors,
+    429s and 5xxs are retried up to `max_retries` times with exponential backoff and
+    full jitter. Once `max_pending` tweets are waiting, new submissions are dropped and
+    counted instead of queued.
+
+    With a `spool`, every submitted batch is written ahead to disk and acknowledged
+    once all of its tweets were stored. A batch that failed or was dropped is read
+    back from the spool and queued again by the worker, after `resend_backoff`
+    seconds doubling with every failure up to `max_resend_backoff`, so it is not
+    lost while the process runs; batches still unacknowledged when it stops are sent
+    again after `restore()` on the next start. Spool appends, reads,
+    acknowledgements and compaction run in order on a single worker thread, off the
+    event loop; a batch is synced to disk before it is sent.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        hotkey: str,
+        batch_size: int = 1000,
+        max_latency: float = 5.0,
+        max_pending: int = 100000,
+        max_retries: int = 5,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        timeout: float = 30.0,
+        spool: Optional[ExportSpool] = None,
+        resend_backoff: float = 60.0,
+        max_resend_backoff: float = 3600.0,
+        encoder: Optional[PayloadEncoder] = None,
+    ):
+        self.url = url
+        self.hotkey = hotkey
+        self.batch_size = max(1, int(batch_size))
+        self.max_latency = max(0.0, float(max_latency))
+        self.max_pending = max(1, int(max_pending))
+        self.max_retries = max(0, int(max_retries))
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.spool = spool
+        self.resend_backoff = max(0.0, float(resend_backoff))
+        self.max_resend_backoff = max(self.resend_backoff, float(max_resend_backoff))
+        self.encoder = encoder or PayloadEncoder()
+        # One thread, so spool writes keep their order and never run concurrently
+        self._spool_executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="export-spool")
+            if spool is not None
+            else None
+        )
+
+        # query -> (time its oldest tweet was submitted, tweets, spool record of each
+        # tweet), in submission order
+        self._buffers: Dict[str, tuple] = {}
+        # Spool record -> its tweets not sent yet
+        self._outstanding: Dict[int, int] = {}
+        # Spool record -> times it failed or was dropped, until it is acknowledged
+        self._attempts: Dict[int, int] = {}
+        # Spool record -> when to read it back from the spool and queue it again
+        self._resend_at: Dict[int, float] = {}
+        self.pending = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._closing = False
+
+        self.submitted = 0
+        self.dropped = 0
+        self.exported = 0
+        self.failed = 0
+        self.requests = 0
+        self.retries = 0
+        self.resent = 0
+        self.max_pending_seen = 0
+        self.total_delay = 0.0
+
+    def submit(self, tweets: List[dict], query: str) -> bool:
+        """Queue `tweets` for export; False if they were dropped because the queue is full."""
+        if not tweets:
+            return True
+        record = None
+        if self.spool is not None:
+            # Written ahead even if dropped below, so a restart still sends it
+            record = self.spool.reserve()
+            self._spool_executor.submit(self._spool_append, record, query, tweets)
+        if self.pending + len(tweets) > self.max_pending:
+            self.dropped += len(tweets)
+            bt.logging.warning(
+                f"Export queue full ({self.pending} tweets pending), dropping {len(tweets)} tweets"
+            )
+            if record is not None:
+                self._schedule_resend(record)
+            return False
+        self._enqueue(query, tweets, record)
+        return True
+
+    def _spool_append(self, record: int, query: str, tweets: List[dict]):
+        try:
+            self.spool.append(query, tweets, record)
+        except OSError as e:
+            # Acknowledging a record that was never written is a no-op
+            bt.logging.error(f"Failed to spool tweets for export: {e}")
+
+    def _spool_ack(self, records: List[int]):
+        try:
+            self.spool.ack(records)
+        except OSError as e:
+            bt.logging.error(f"Failed to acknowledge spooled exports: {e}")
+
+    def restore(self) -> int:
+        """Queue the batches the spool holds from before a restart; returns their count."""
+        if self.spool is None:
+            return 0
+        batches = self.spool.recover()
+        for record, query, tweets in batches:
+            if self.pending + len(tweets) > self.max_pending:
+                # Read back from the spool once the queue has room
+                self._schedule_resend(record)
+                continue
+            self._enqueue(query, tweets, record)
+        return len(batches)
+
+    def _enqueue(self, query: str, tweets: List[dict], record: Optional[int]):
+        _, buffer, records = self._buffers.setdefault(query, (time.monotonic(), [], []))
+        buffer.extend(tweets)
+        records.extend([record] * len(tweets))
+        if record is not None:
+            self._outstanding[record] = len(tweets)
+        self.pending += len(tweets)
+        self.submitted += len(tweets)
+        self.max_pending_seen = max(self.max_pending_seen, self.pending)
+        self._start()
+        self._wakeup.set()
+
+    def _schedule_resend(self, record: int):
+        attempts = self._attempts[record] = self._attempts.get(record, 0) + 1
+        delay = min(self.max_resend_backoff, self.resend_backoff * 2 ** (attempts - 1))
+        # Jittered so batches that failed together are not sent again together
+        self._resend_at[record] = time.monotonic() + random.uniform(delay / 2, delay)
+        self._start()
+        self._wakeup.set()
+
+    async def _resend(self, now: float):
+        """Read the spool records due for a resend back and queue them again."""
+        due = [record for record, at in self._resend_at.items() if at <= now]
+        for record in due:
+            del self._resend_at[record]
+        batches = await asyncio.get_running_loop().run_in_executor(
+            self._spool_executor, self.spool.read, due
+        )
+        found = set()
+        for record, query, tweets in batches:
+            found.add(record)
+            if self.pending + len(tweets) > self.max_pending:
+                self._schedule_resend(record)
+                continue
+            self.resent += len(tweets)
+            self._enqueue(query, tweets, record)
+        for record in set(due) - found:
+            # No longer in the spool, e.g. it could not be written
+            self._attempts.pop(record, None)
+        if batches:
+            bt.logging.info(f"Resending {len(found)} spooled export batches")
+
+    def _start(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def _due(self, now: float) -> List[str]:
+        """Queries with a full batch, or whose oldest tweet has waited long enough."""
+        return [
+            query
+            for query, (since, buffer, _) in self._buffers.items()
+            if self._closing
+            or len(buffer) >= self.batch_size
+            or now - since >= self.max_latency
+        ]
+
+    async def _run(self):
+        try:
+            while True:
+                now = time.monotonic()
+                due = self._due(now)
+                if due:
+                    for query in due:
+                        await self._flush(query)
+                    continue
+                if self._closing:
+                    # Everything is due while closing, so nothing is left; batches
+                    # waiting for a resend stay in the spool for the next start
+                    break
+                if self._resend_at and min(self._resend_at.values()) <= now:
+                    await self._resend(now)
+                    continue
+                wakeups = [
+                    since + self.max_latency for since, _, _ in self._buffers.values()
+                ]
+                if self._resend_at:
+                    wakeups.append(min(self._resend_at.values()))
+                timeout = min(wakeups) - now if wakeups else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+    async def _flush(self, query: str):
+        since, buffer, records = self._buffers.pop(query)
+        batch, rest = buffer[: self.batch_size], buffer[self.batch_size :]
+        batch_records = records[: self.batch_size]
+        if rest:
+            # The remainder keeps its place, and its wait counts from now
+            self._buffers[query] = (time.monotonic(), rest, records[self.batch_size :])
+        try:
+            if self.spool is not None:
+                await asyncio.get_running_loop().run_in_executor(
+                    self._spool_executor, self.spool.sync
+                )
+            sent = await self._post(query, batch)
+        except Exception as e:
+            bt.logging.error(f"Unexpected error exporting tweets for {query}: {e}")
+            sent = False
+        if sent:
+            self.exported += len(batch)
+            self.total_delay += (time.monotonic() - since) * len(batch)
+        else:
+            self.failed += len(batch)
+        self.pending -= len(batch)
+        self._settle(batch_records, sent)
+
+    def _settle(self, records: List[Optional[int]], sent: bool):
+        """
+        Acknowledge the spool records whose tweets have now all been stored, or
+        schedule the records of a failed batch to be sent again.
+        """
+        acked = []
+        failed = set()
+        for record, count in collections.Counter(records).items():
+            if record is None or record not in self._outstanding:
+                continue
+            if not sent:
+                # Stays unacknowledged in the spool and is sent again in full
+                del self._outstanding[record]
+                failed.add(record)
+                self._schedule_resend(record)
+                continue
+            self._outstanding[record] -= count
+            if self._outstanding[record] == 0:
+                del self._outstanding[record]
+                self._attempts.pop(record, None)
+                acked.append(record)
+        if failed:
+            self._discard(failed)
+        if acked:
+            self._spool_executor.submit(self._spool_ack, acked)
+
+    def _discard(self, failed: set):
+        """Drop the queued tweets of records that will be resent in full."""
+        for query, (since, buffer, records) in list(self._buffers.items()):
+            keep = [i for i, record in enumerate(records) if record not in failed]
+            if len(keep) == len(records):
+                continue
+            self.pending -= len(records) - len(keep)
+            if keep:
+                self._buffers[query] = (
+                    since,
+                    [buffer[i] for i in keep],
+                    [records[i] for i in keep],
+                )
+            else:
+                del self._buffers[query]
+
+    async def _post(self, query: str, tweets: List[dict]) -> bool:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        for attempt in range(self.max_retries + 1):
+            self.requests += 1
+            try:
+                async with self._session.post(
+                    self.url,
+                    data=self.encoder.body(self.hotkey, query, tweets),
+                    headers=self.encoder.headers,
+                ) as response:
+                    response_text = await response.text()
+                    if response.status in ACCEPTED:
+                        bt.logging.info(
+                            f"Data sent to protocol API: {len(tweets)} tweets for {query}"
+                        )
+                        return True
+                    bt.logging.error(
+                        f"Failed to send data to protocol API: {response.status}"
+                    )
+                    bt.logging.error(f"Response body: {response_text}")
+                    retryable = response.status == 429 or response.status >= 500
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                bt.logging.error(
+                    f"Exception occurred while sending data to the protocol API: {e}"
+                )
+                retryable = True
+            if not retryable or attempt == self.max_retries:
+                break
+            self.retries += 1
+            delay = min(self.max_backoff, self.base_backoff * 2**attempt)
+            await asyncio.sleep(random.uniform(0, delay))
+        bt.logging.error(f"Giving up exporting {len(tweets)} tweets for {query}")
+        return False
+
+    def metrics(self) -> dict:
+        return {
+            "pending": self.pending,
+            "max_pending": self.max_pending_seen,
+            "submitted": self.submitted,
+            "exported": self.exported,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "requests": self.requests,
+            "retries": self.retries,
+            "resent": self.resent,
+            "avg_delay": round(self.total_delay / self.exported, 3)
+            if self.exported
+            else 0.0,
+            "spooled": self.spool.unacked() if self.spool is not None else 0,
+        }
+
+    async def close(self, timeout: float = 30.0):
+        """Send everything still queued, waiting at most `timeout` seconds."""
+        self._closing = True
+        if self._worker is not None and not self._worker.done():
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(asyncio.shield(self._worker), timeout)
+            except asyncio.TimeoutError:
+                bt.logging.warning(
+                    f"Export queue closed with {self.pending} tweets not exported"
+                )
+                self._worker.cancel()
+                await asyncio.gather(self._worker, return_exceptions=True)
+        if self.spool is not None:
+            # After every spool write still queued on the worker
+            await asyncio.get_running_loop().run_in_executor(
+                self._spool_executor, self.spool.close
+            )
+            self._spool_executor.shutdown()
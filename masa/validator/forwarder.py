@@ -17,7 +17,8 @@
 # DEALINGS IN THE SOFTWARE.
 
 import bittensor as bt
-from typing import Any, List
+import numpy as np
+from typing import Any, AsyncIterator, List
 from datetime import datetime, UTC, timedelta
 import aiohttp
 import json
@@ -31,6 +32,20 @@ from masa.synapses import (
 
 from masa.synapses import PingAxonSynapse
 from masa.base.healthcheck import get_external_ip
+from masa.validator.executor import ValidationExecutor
+from masa.validator.health import MinerHealth
+from masa.validator.seen_index import SeenTweetIndex
+from masa.validator.batch_validation import validate_batch, valid_id_mask
+from masa.validator.keyword_matcher import compile_keyword
+from masa.validator.rate_limiter import RateLimiter, RoundBudgetExhausted
+from masa.validator.verification import (
+    VerificationService,
+    TweetVerificationAdapter,
+    VALID,
+    NOT_FOUND,
+    MISMATCH,
+)
+from masa.validator.verdict_cache import VerdictCache, ERROR
 from masa.utils.uids import (
     get_random_miner_uids,
     get_uncalled_miner_uids,
@@ -45,25 +60,53 @@ import sys
 import os
 
 import logging
-from loguru import logger
-import io
-
-
-class LogCaptureHandler:
-    def __init__(self):
-        self.logs = []
-        self.output = io.StringIO()
-
-    def write(self, message):
-        self.logs.append(message.strip())
-
-    def flush(self):
-        pass
 
 
 class Forwarder:
     def __init__(self, validator):
         self.validator = validator
+        self.validation_executor = ValidationExecutor(
+            self.validator.config.validator.max_concurrent_validations
+        )
+        self.rate_limiter = RateLimiter(
+            rate=self.validator.config.validator.verification_rate,
+            burst=self.validator.config.validator.verification_burst,
+            max_concurrency=self.validator.config.validator.verification_concurrency,
+            round_budget=self.validator.config.validator.verification_round_budget,
+        )
+        # Verification adapters (each with its own TweetValidator session) are
+        # created per verification thread
+        self.verification_service = VerificationService(
+            self.create_verification_adapter,
+            max_workers=self.validator.config.validator.verification_concurrency,
+            timeout=self.validator.config.validator.verification_timeout,
+        )
+        self.external_ip = None
+        self.miner_health = MinerHealth()
+        seen_index_max_ids = self.validator.config.validator.seen_index_max_ids
+        # A full miner response must fit, or each one would evict all the others;
+        # validators have no --twitter.* arguments, so the miners' default applies
+        twitter_config = getattr(self.validator.config, "twitter", None)
+        max_tweets_per_request = (
+            getattr(twitter_config, "max_tweets_per_request", None) or 1000
+        )
+        if seen_index_max_ids < max_tweets_per_request:
+            raise ValueError(
+                f"--validator.seen_index_max_ids ({seen_index_max_ids}) must be at "
+                f"least --twitter.max_tweets_per_request ({max_tweets_per_request})"
+            )
+        self.seen_tweets = SeenTweetIndex(max_ids=seen_index_max_ids)
+        self.verdict_cache = VerdictCache(
+            max_size=self.validator.config.validator.verdict_cache_size,
+            ttl=self.validator.config.validator.verdict_cache_ttl,
+            path=(
+                os.path.join(
+                    self.validator.config.neuron.full_path, "verdict_cache.json"
+                )
+                if self.validator.config.validator.verdict_cache_persist
+                else None
+            ),
+        )
 
     def strict_tweet_id_validation(self, tweet_id: str) -> bool:
         """
@@ -71,20 +114,14 @@ class Forwarder:
         - Must be a string of pure ASCII digits
         - No leading zeros
         - No invisible/zero-width characters
+        - Fits in uint64
         """
-        if not isinstance(tweet_id, str):
-            return False
-
-        # Convert to ASCII-only and check if anything was removed
-        ascii_id = tweet_id.encode("ascii", "ignore").decode()
-        if ascii_id != tweet_id:
-            return False
-
-        # Check if it's a valid numeric string with no leading zeros
-        if not ascii_id.isdigit() or ascii_id.startswith("0"):
-            return False
+        return bool(valid_id_mask([tweet_id])[0])
 
-        return True
+    async def get_miner_uids(self, sample_size: int, sequential: bool = False):
+        if sequential:
+            return await get_uncalled_miner_uids(self.validator, k=sample_size)
+        return await get_random_miner_uids(self.validator, k=sample_size)
 
     async def forward_request(
         self,
@@ -100,34 +137,90 @@ class Forwarder:
 
         bt.logging.debug(f"Request timeout set to {timeout}s with no retries")
 
-        if sequential:
-            miner_uids = await get_uncalled_miner_uids(self.validator, k=sample_size)
-        else:
-            miner_uids = await get_random_miner_uids(self.validator, k=sample_size)
+        miner_uids = await self.get_miner_uids(sample_size, sequential)
 
         if miner_uids is None or len(miner_uids) == 0:
             return [], []
 
-        async with bt.dendrite(wallet=self.validator.wallet) as dendrite:
-            bt.logging.debug(
-                f"Sending request to {len(miner_uids)} miners with {timeout}s timeout"
+        dendrite = self.validator.dendrite_pool.dendrite
+        bt.logging.debug(
+            f"Sending request to {len(miner_uids)} miners with {timeout}s timeout"
+        )
+        try:
+            responses = await dendrite(
+                [self.validator.metagraph.axons[uid] for uid in miner_uids],
+                request,
+                deserialize=True,
+                timeout=timeout,
             )
-            try:
-                responses = await dendrite(
-                    [self.validator.metagraph.axons[uid] for uid in miner_uids],
-                    request,
-                    deserialize=True,
-                    timeout=timeout,
-                )
-            except Exception as e:
-                bt.logging.error(f"Dendrite request failed: {e}")
-                return [], []
+        except Exception as e:
+            bt.logging.error(f"Dendrite request failed: {e}")
+            return [], []
 
-            formatted_responses = [
-                {"uid": int(uid), "response": response}
-                for uid, response in zip(miner_uids, responses)
-            ]
-            return formatted_responses, miner_uids
+        formatted_responses = [
+            {"uid": int(uid), "response": response}
+            for uid, response in zip(miner_uids, responses)
+        ]
+        return formatted_responses, miner_uids
+
+    async def stream_request(
+        self,
+        request: Any,
+        sample_size: int = None,
+        timeout: int = None,
+        sequential: bool = False,
+    ) -> AsyncIterator[dict]:
+        """
+        Send a request to a sample of miners and yield each response as soon as it lands.
+
+        Unlike forward_request, which waits for the slowest miner before returning,
+        this lets callers process fast miners while slow miners are still answering.
+        Responses are yielded in order of arrival, formatted as {"uid": int, "response": Any}.
+        """
+        if not sample_size:
+            sample_size = self.validator.subnet_config.get("organic").get("sample_size")
+        if not timeout:
+            timeout = self.validator.subnet_config.get("organic").get("timeout")
+
+        miner_uids = await self.get_miner_uids(sample_size, sequential)
+
+        if miner_uids is None or len(miner_uids) == 0:
+            return
+
+        dendrite = self.validator.dendrite_pool.dendrite
+        bt.logging.debug(
+            f"Streaming request to {len(miner_uids)} miners with {timeout}s timeout"
+        )
+        tasks = [
+            asyncio.create_task(self.query_miner(dendrite, int(uid), request, timeout))
+            for uid in miner_uids
+        ]
+        try:
+            for next_response in asyncio.as_completed(tasks):
+                yield await next_response
+        finally:
+            # Only reached with pending tasks if the consumer stopped early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def query_miner(
+        self, dendrite: "bt.dendrite", uid: int, request: Any, timeout: int
+    ) -> dict:
+        """Query a single miner, never raising so one bad axon can't break a stream."""
+        try:
+            response = await dendrite.call(
+                target_axon=self.validator.metagraph.axons[uid],
+                synapse=request.model_copy(),
+                timeout=timeout,
+                deserialize=True,
+            )
+        except Exception as e:
+            bt.logging.error(
+                f"Dendrite request to {self.format_miner_info(uid)} failed: {e}"
+            )
+            response = None
+        return {"uid": uid, "response": response}
 
     async def get_twitter_profile(self, username: str = "getmasafi"):
         request = TwitterProfileSynapse(username=username)
@@ -199,16 +292,76 @@ class Forwarder:
 
         return " | ".join(summary_parts)
 
+    async def get_external_ip(self) -> str:
+        """Resolve the validator's external IP once, off the event loop."""
+        if self.external_ip is None:
+            self.external_ip = await asyncio.get_running_loop().run_in_executor(
+                None, get_external_ip
+            )
+        return self.external_ip
+
     async def ping_axons(self, current_block: int):
+        """Ping every available miner, regardless of when it was last pinged."""
+        miner_uids = get_available_uids(self.validator.metagraph)
+        self.miner_health.prune(miner_uids)
+        responses_by_uid = await self.ping_uids(current_block, miner_uids)
+        return [
+            {
+                "status_code": response.dendrite.status_code,
+                "status_message": response.dendrite.status_message,
+                "version": response.version,
+                "uid": uid,
+            }
+            for uid, response in sorted(responses_by_uid.items())
+        ]
+
+    async def refresh_miner_health(self, current_block: int):
+        """
+        Re-ping only the miners whose healthcheck result may be out of date.
+
+        A result goes stale after `healthcheck.blocks` blocks; failed pings are retried
+        after `healthcheck.retry_blocks` (default a tenth of that). Miners that are new
+        or whose axon info changed in the metagraph are pinged right away.
+        """
+        healthcheck_config = self.validator.subnet_config.get("healthcheck")
+        max_age = healthcheck_config.get("blocks")
+        retry_age = healthcheck_config.get("retry_blocks", max(1, max_age // 10))
+
+        miner_uids = get_available_uids(self.validator.metagraph)
+        self.miner_health.prune(miner_uids)
+        reasons = self.miner_health.stale_uids(
+            miner_uids,
+            self.validator.metagraph.axons,
+            current_block,
+            max_age,
+            retry_age,
+        )
+        stale_uids = sorted(uid for uids in reasons.values() for uid in uids)
+        if not stale_uids:
+            # Miners that stopped serving still need their version cleared
+            self.validator.versions = self.miner_health.versions_by_uid(
+                self.validator.metagraph.n.item()
+            )
+            return
+
+        bt.logging.info(
+            f"Healthcheck: re-pinging {len(stale_uids)}/{len(miner_uids)} miners | "
+            + " | ".join(f"{k}: {len(v)}" for k, v in reasons.items() if v)
+        )
+        await self.ping_uids(current_block, stale_uids)
+
+    async def ping_uids(self, current_block: int, miner_uids: List[int]):
+        """Ping `miner_uids` in concurrent batches and record the results by uid."""
         request = PingAxonSynapse(
-            sent_from=get_external_ip(),
+            sent_from=await self.get_external_ip(),
             is_active=False,
             version=int("0"),  # Ensure version is an integer
         )
-        sample_size = self.validator.subnet_config.get("healthcheck").get("sample_size")
-        all_responses = []
-        miner_uids = get_available_uids(self.validator.metagraph)
+        healthcheck_config = self.validator.subnet_config.get("healthcheck")
+        sample_size = healthcheck_config.get("sample_size")
+        timeout = healthcheck_config.get("timeout")
         total_miners = len(miner_uids)
+        responses_by_uid = {}
         successful_pings = 0
         failed_pings = 0
 
@@ -216,53 +369,65 @@ class Forwarder:
             f"Starting to ping {total_miners} miners in batches of {sample_size}"
         )
 
-        async with bt.dendrite(wallet=self.validator.wallet) as dendrite:
-            for i in range(0, total_miners, sample_size):
-                batch_uids = miner_uids[i : i + sample_size]
+        dendrite = self.validator.dendrite_pool.dendrite
+        # Bounds how many batches are in flight; the rest wait for a free slot
+        window = asyncio.Semaphore(
+            self.validator.config.validator.healthcheck_max_inflight_batches
+        )
+
+        async def ping_batch(batch_uids: List[int]):
+            async with window:
                 batch = [self.validator.metagraph.axons[uid] for uid in batch_uids]
                 batch_responses = await dendrite(
-                    batch,
-                    request,
-                    deserialize=False,
-                    timeout=self.validator.subnet_config.get("healthcheck").get(
-                        "timeout"
-                    ),
+                    batch, request, deserialize=False, timeout=timeout
                 )
-                all_responses.extend(batch_responses)
-
-                # Count successes and failures for this batch
-                batch_success = sum(1 for r in batch_responses if r.version > 0)
-                batch_failed = len(batch_responses) - batch_success
-                successful_pings += batch_success
-                failed_pings += batch_failed
+            return batch_uids, batch_responses
 
-                # Progress update every batch
-                progress = min(100, (i + len(batch)) * 100 // total_miners)
-                bt.logging.info(
-                    f"Ping progress: {progress}% | "
-                    f"Success: {successful_pings} | "
-                    f"Failed: {failed_pings}"
+        batches = [
+            asyncio.create_task(ping_batch(miner_uids[i : i + sample_size]))
+            for i in range(0, total_miners, sample_size)
+        ]
+        for next_batch in asyncio.as_completed(batches):
+            batch_uids, batch_responses = await next_batch
+            responses_by_uid.update(zip(batch_uids, batch_responses))
+            for uid, response in zip(batch_uids, batch_responses):
+                self.miner_health.record(
+                    uid,
+                    self.validator.metagraph.axons[uid],
+                    response.version,
+                    current_block,
                 )
 
-        self.validator.versions = [response.version for response in all_responses]
+            # Count successes and failures for this batch
+            batch_success = sum(1 for r in batch_responses if r.version > 0)
+            batch_failed = len(batch_responses) - batch_success
+            successful_pings += batch_success
+            failed_pings += batch_failed
+
+            # Progress update every batch
+            progress = min(100, len(responses_by_uid) * 100 // total_miners)
+            bt.logging.info(
+                f"Ping progress: {progress}% | "
+                f"Success: {successful_pings} | "
+                f"Failed: {failed_pings}"
+            )
+
+        # Indexed by uid; miners that are not serving report version 0
+        self.validator.versions = self.miner_health.versions_by_uid(
+            self.validator.metagraph.n.item()
+        )
 
         # Use the summarize function for a cleaner log
-        version_summary = self._summarize_versions(self.validator.versions)
+        version_summary = self._summarize_versions(
+            list(self.miner_health.versions.values())
+        )
         bt.logging.info(f"🔍 Miner Status: {version_summary}")
 
         # Keep detailed version list at DEBUG level
         bt.logging.debug(f"Detailed Miner Versions: {self.validator.versions}")
 
         self.validator.last_healthcheck_block = current_block
-        return [
-            {
-                "status_code": response.dendrite.status_code,
-                "status_message": response.dendrite.status_message,
-                "version": response.version,
-                "uid": miner_uids[all_responses.index(response)],  # Use actual UID
-            }
-            for response in all_responses
-        ]
+        return responses_by_uid
 
     async def fetch_twitter_queries(self):
         try:
@@ -303,11 +468,9 @@ class Forwarder:
     ) -> bool:
         """
         Validate a batch of tweets from a miner. Performs all validation checks in sequence:
-        1. Basic structure and ID validation
-        2. Duplicate detection within batch
-        3. Query matching
-        4. Timestamp validation
-        5. Existence verification via masa-ai
+        1. Structure, ID, duplicate and timestamp checks over every tweet
+        2. Query matching over every tweet
+        3. Existence verification via masa-ai on a random sample
 
         Returns True only if ALL validation checks pass.
         """
@@ -315,38 +478,39 @@ class Forwarder:
             # Flag to track if all tweets passed validation
             all_tweets_valid = True
 
-            # Create TweetValidator instance from masa-ai package
-            validator = TweetValidator()
-
-            # Validate all tweets first for basic structure
-            for i, tweet in enumerate(all_responses, 1):
-                if not (
-                    "Tweet" in tweet and "ID" in tweet["Tweet"] and tweet["Tweet"]["ID"]
-                ):
-                    bt.logging.info(
-                        f"❌ {self.format_miner_info(uid)} FAILED - malformed tweet at position {i}/{len(all_responses)} | Tweet: {tweet}"
-                    )
-                    all_tweets_valid = False
-                    break  # Break inner loop
-
-                tweet_id = tweet["Tweet"]["ID"]
-                if not self.strict_tweet_id_validation(tweet_id):
-                    bt.logging.info(
-                        f"❌ {self.format_miner_info(uid)} FAILED - invalid tweet ID at position {i}/{len(all_responses)} | ID: {tweet_id}\n"
-                        f"    Tweet Text: {tweet['Tweet'].get('Text', 'NO_TEXT')}\n"
-                        f"    Full Tweet: {tweet}"
-                    )
-                    all_tweets_valid = False
-                    break  # Break inner loop
+            # Structure, ID syntax, duplicates and timestamps of every tweet at once
+            yesterday = datetime.now(UTC).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ) - timedelta(days=1)
+            batch = validate_batch(all_responses, yesterday.timestamp())
+            if not batch.passed:
+                first_failure = int(np.flatnonzero(batch.failures)[0])
+                bt.logging.info(
+                    f"❌ {self.format_miner_info(uid)} FAILED - {batch.summary()} "
+                    f"in {len(all_responses)} tweets | First at position {first_failure + 1}: "
+                    f"{all_responses[first_failure]}"
+                )
+                return False
 
-            # Check for duplicates
-            unique_ids = {tweet["Tweet"]["ID"] for tweet in all_responses}
-            if len(unique_ids) != len(all_responses):
+            # Every tweet must match the query; the compiled matcher is shared by all
+            # miners of the round, so this is one cheap pass over the batch
+            matcher = compile_keyword(random_keyword)
+            on_topic = matcher.match_batch(all_responses)
+            max_off_topic = self.validator.subnet_config.get("synthetic", {}).get(
+                "max_off_topic_ratio", 0
+            )
+            off_topic = int(len(on_topic) - on_topic.sum())
+            if off_topic > max_off_topic * len(on_topic):
+                first_off_topic = int(np.flatnonzero(~on_topic)[0])
                 bt.logging.info(
-                    f"❌ {self.format_miner_info(uid)} FAILED - batch contains duplicates"
+                    f"❌ {self.format_miner_info(uid)} FAILED - {off_topic}/{len(all_responses)} tweets "
+                    f"do not match query ({random_keyword}) | First at position {first_off_topic + 1}: "
+                    f"{all_responses[first_off_topic]}"
                 )
-                all_tweets_valid = False
                 return False
+            bt.logging.info(
+                f"✅ Query match ({random_keyword}): {len(all_responses) - off_topic}/{len(all_responses)} tweets"
+            )
 
             # Select 3 random tweets for validation
             num_tweets_to_validate = min(3, len(all_responses))
@@ -369,180 +533,144 @@ class Forwarder:
                     f"    URL: {self.format_tweet_url(random_tweet.get('ID'))}"
                 )
 
-                query_words = (
-                    self.normalize_whitespace(random_keyword.replace('"', ""))
-                    .strip()
-                    .lower()
-                    .split()
-                )
-
-                fields_to_check = [
-                    self.normalize_whitespace(random_tweet.get("Text", ""))
-                    .strip()
-                    .lower(),
-                    self.normalize_whitespace(random_tweet.get("Name", ""))
-                    .strip()
-                    .lower(),
-                    self.normalize_whitespace(random_tweet.get("Username", ""))
-                    .strip()
-                    .lower(),
-                    self.normalize_whitespace(str(random_tweet.get("Hashtags", [])))
-                    .strip()
-                    .lower(),
-                ]
-
-                query_in_tweet = all(
-                    any(word in field for field in fields_to_check)
-                    for word in query_words
-                )
-
-                if not query_in_tweet:
-                    bt.logging.info(
-                        f"❌ Query match check failed for {self.format_tweet_url(random_tweet.get('ID'))}"
-                    )
-                    all_tweets_valid = False
-
-                tweet_timestamp = datetime.fromtimestamp(
-                    random_tweet.get("Timestamp", 0), UTC
-                )
-
-                yesterday = datetime.now(UTC).replace(
-                    hour=0, minute=0, second=0, microsecond=0
-                ) - timedelta(days=1)
-                is_since_date_requested = yesterday <= tweet_timestamp
-
-                if not is_since_date_requested:
-                    bt.logging.debug(
-                        f"❌ Timestamp check failed for {self.format_tweet_url(random_tweet.get('ID'))}"
-                    )
-                    all_tweets_valid = False
-
-                # Log validation results for both checks
-                tweet_url = self.format_tweet_url(random_tweet.get("ID"))
-                bt.logging.info(
-                    f"{'✅' if query_in_tweet else '❌'} Query match ({random_keyword}): {tweet_url}"
-                )
-                bt.logging.info(
-                    f"{'✅' if is_since_date_requested else '❌'} Timestamp ({tweet_timestamp.strftime('%Y-%m-%d %H:%M:%S')} >= {yesterday.strftime('%Y-%m-%d')}): {tweet_url}"
-                )
-
-                # Only proceed with masa-ai validation if other checks passed
+                # Stop verifying once a sampled tweet has been found missing
                 if all_tweets_valid:
                     try:
-                        # Make 3 attempts at masa-ai validation
-                        validation_attempts = 0
-                        successful_validations = 0
-
-                        for attempt in range(3):
-                            validation_attempts += 1
-                            try:
-                                # Validate with masa-ai's TweetValidator
-                                bt.logging.info(
-                                    f"🔍 Attempting to validate tweet {random_tweet.get('ID')} with masa-ai validator (attempt {attempt + 1}/3)"
-                                )
-                                bt.logging.info(
-                                    f"📤 Sending to masa-ai for validation:\n"
-                                    f"    tweet_id: {random_tweet.get('ID')}\n"
-                                    f"    expected_name: {random_tweet.get('Name')}\n"
-                                    f"    expected_username: {random_tweet.get('Username')}\n"
-                                    f"    expected_text: {random_tweet.get('Text')}\n"
-                                    f"    expected_timestamp: {random_tweet.get('Timestamp')}\n"
-                                    f"    expected_hashtags: {random_tweet.get('Hashtags', [])}"
-                                )
-                                # Capture masa-ai's logs to check for 404
-                                log_handler = LogCaptureHandler()
-                                logger.add(log_handler, format="{message}")
-
-                                is_valid = validator.validate_tweet(
-                                    tweet_id=random_tweet.get("ID"),
-                                    expected_name=random_tweet.get("Name"),
-                                    expected_username=random_tweet.get("Username"),
-                                    expected_text=random_tweet.get("Text"),
-                                    expected_timestamp=random_tweet.get("Timestamp"),
-                                    expected_hashtags=random_tweet.get("Hashtags", []),
-                                )
-
-                                # Check if it was a 404
-                                bt.logging.info(f"Captured logs: {log_handler.logs}")
-                                is_404 = any(
-                                    "404 Client Error" in log
-                                    for log in log_handler.logs
-                                )
-                                logger.remove()
-
-                                if is_valid:
-                                    successful_validations += 1
-                                    bt.logging.info(
-                                        f"✅ Tweet {tweet_url} passed masa-ai validation on attempt {attempt + 1}"
-                                    )
-                                else:
-                                    if is_404:
-                                        bt.logging.info(
-                                            f"❌ Tweet {tweet_url} received 404 from Twitter API on attempt {attempt + 1}"
-                                        )
-                                    else:
-                                        bt.logging.info(
-                                            f"❓ Tweet {tweet_url} encountered technical error on attempt {attempt + 1}"
-                                        )
-                                        successful_validations += 1
-
-                                # Early exit if we have enough successes
-                                if successful_validations >= 2:
-                                    bt.logging.info(
-                                        f"✅ Tweet {tweet_url} passed masa-ai validation ({successful_validations}/{validation_attempts} attempts successful)"
-                                    )
-                                    break
-
-                            except Exception as e:
-                                bt.logging.error(f"Error during validation: {e}")
-                                # Count as technical error
-                                successful_validations += 1
-                                if successful_validations >= 2:
-                                    break
-
-                            # Add a delay between attempts (3 seconds)
-                            if (
-                                attempt < 2 and successful_validations < 2
-                            ):  # Don't delay if we've succeeded or it's the last attempt
-                                bt.logging.info(
-                                    "Waiting 3 seconds before next validation attempt..."
-                                )
-                                await asyncio.sleep(3)
-
-                        # After all attempts, check if we got enough successful validations
-                        if successful_validations >= 2:
-                            bt.logging.info(
-                                f"✅ Tweet {tweet_url} passed masa-ai validation ({successful_validations}/{validation_attempts} attempts successful)"
-                            )
-                        else:
-                            bt.logging.info(
-                                f"❌ Tweet {tweet_url} failed masa-ai validation (only {successful_validations}/{validation_attempts} attempts successful)"
-                            )
+                        # Verdicts are cached by tweet ID and claimed fields, so tweets
+                        # already checked for another miner or round cost nothing
+                        verdict = await self.verdict_cache.resolve(
+                            random_tweet,
+                            lambda: self.verify_tweet_exists(random_tweet),
+                        )
+                        if verdict == NOT_FOUND:
                             all_tweets_valid = False
-
+                    except RoundBudgetExhausted:
+                        raise
                     except Exception as e:
                         bt.logging.error(
                             f"Unexpected error during masa-ai validation: {e}"
                         )
                         all_tweets_valid = False
 
-                # Add 5-second delay between validating different tweets (except for the last tweet)
-                if i < num_tweets_to_validate:
-                    bt.logging.info("Waiting 5 seconds before validating next tweet...")
-                    await asyncio.sleep(5)
-
             return all_tweets_valid
 
+        except RoundBudgetExhausted:
+            raise
         except Exception as e:
             bt.logging.error(
                 f"Error validating tweets from {self.format_miner_info(uid)}: {e}"
             )
             return False
 
+    async def verify_tweet_exists(self, tweet: dict) -> str:
+        """
+        Check with masa-ai that a tweet exists with the fields the miner claims.
+
+        Makes up to 3 attempts and passes the tweet once 2 succeed, counting technical
+        errors in the miner's favour. Returns VALID, NOT_FOUND, or ERROR when the tweet
+        passed without any attempt confirming it. Raises RoundBudgetExhausted once the
+        round's verification budget is spent, as the tweet was not checked.
+        """
+        tweet_url = self.format_tweet_url(tweet.get("ID"))
+        # Make 3 attempts at masa-ai validation
+        validation_attempts = 0
+        successful_validations = 0
+        confirmed = False
+
+        for attempt in range(3):
+            validation_attempts += 1
+            try:
+                # Every upstream call is paced by the shared rate limiter
+                # instead of fixed sleeps between attempts and tweets
+                async with self.rate_limiter.acquire():
+                    # Validate with masa-ai's TweetValidator
+                    bt.logging.info(
+                        f"🔍 Attempting to validate tweet {tweet.get('ID')} with masa-ai validator (attempt {attempt + 1}/3)"
+                    )
+                    bt.logging.info(
+                        f"📤 Sending to masa-ai for validation:\n"
+                        f"    tweet_id: {tweet.get('ID')}\n"
+                        f"    expected_name: {tweet.get('Name')}\n"
+                        f"    expected_username: {tweet.get('Username')}\n"
+                        f"    expected_text: {tweet.get('Text')}\n"
+                        f"    expected_timestamp: {tweet.get('Timestamp')}\n"
+                        f"    expected_hashtags: {tweet.get('Hashtags', [])}"
+                    )
+                    # Runs on the verification thread pool so the
+                    # event loop keeps serving while the upstream call blocks
+                    result = await self.verification_service.run(
+                        lambda adapter: adapter.verify(tweet)
+                    )
+                    bt.logging.info(f"Verification result: {result}")
+
+                if result.status_code == 429:
+                    self.rate_limiter.backoff()
+                else:
+                    self.rate_limiter.record_success()
+
+                if result.outcome == VALID:
+                    successful_validations += 1
+                    confirmed = True
+                    bt.logging.info(
+                        f"✅ Tweet {tweet_url} passed masa-ai validation on attempt {attempt + 1}"
+                    )
+                else:
+                    if result.outcome == NOT_FOUND:
+                        bt.logging.info(
+                            f"❌ Tweet {tweet_url} received 404 from Twitter API on attempt {attempt + 1}"
+                        )
+                    elif result.outcome == MISMATCH:
+                        # Mismatches keep the benefit of the doubt they had when
+                        # masa-ai reported them only as a non-404 failure
+                        bt.logging.info(
+                            f"❓ Tweet {tweet_url} did not match upstream fields ({result.detail}) on attempt {attempt + 1}"
+                        )
+                        successful_validations += 1
+                    else:
+                        bt.logging.info(
+                            f"❓ Tweet {tweet_url} encountered technical error on attempt {attempt + 1}"
+                        )
+                        successful_validations += 1
+
+                # Early exit if we have enough successes
+                if successful_validations >= 2:
+                    bt.logging.info(
+                        f"✅ Tweet {tweet_url} passed masa-ai validation ({successful_validations}/{validation_attempts} attempts successful)"
+                    )
+                    break
+
+            except RoundBudgetExhausted:
+                # Unchecked is not verified: the miner gets no credit this round
+                raise
+
+            except Exception as e:
+                bt.logging.error(f"Error during validation: {e}")
+                # Count as technical error
+                successful_validations += 1
+                if successful_validations >= 2:
+                    break
+
+        # After all attempts, check if we got enough successful validations
+        if successful_validations >= 2:
+            bt.logging.info(
+                f"✅ Tweet {tweet_url} passed masa-ai validation ({successful_validations}/{validation_attempts} attempts successful)"
+            )
+            # Passing only on technical errors is not a confirmation worth caching
+            return VALID if confirmed else ERROR
+
+        bt.logging.info(
+            f"❌ Tweet {tweet_url} failed masa-ai validation (only {successful_validations}/{validation_attempts} attempts successful)"
+        )
+        return NOT_FOUND
+
+    def create_verification_adapter(self) -> TweetVerificationAdapter:
+        return TweetVerificationAdapter(TweetValidator())
+
     async def get_miners_volumes(self, current_block: int):
         if len(self.validator.versions) == 0:
             bt.logging.info("Pinging axons to get miner versions...")
             return await self.ping_axons(current_block)
+        await self.refresh_miner_health(current_block)
         if len(self.validator.keywords) == 0 or self.check_tempo(current_block):
             await self.fetch_twitter_queries()
 
@@ -586,148 +714,46 @@ class Forwarder:
             query=query,
             timeout=timeout,
         )
-        responses, miner_uids = await self.forward_request(
+
+        self.rate_limiter.start_round()
+
+        # Track different outcomes
+        outcomes = {
+            "no_response": set(),
+            "empty_response": set(),
+            "invalid_tweets": set(),
+            "deferred": set(),
+            "successful": set(),
+        }
+
+        # Each miner is validated in its own task as soon as its response lands, so
+        # fast miners are processed while slow miners are still answering, and at
+        # most max_concurrent_validations miners are validated at once
+        async for response in self.stream_request(
             request,
             sample_size=sample_size,
             timeout=timeout,
             sequential=True,
-        )
-
-        # Convert tensor UIDs to regular integers for consistent logging
-        miner_uids = [int(uid) for uid in miner_uids]
-        bt.logging.info(f"📋 Selected {len(miner_uids)} miners | UIDs: {miner_uids}")
-
-        # Track different outcomes
-        no_response_uids = set()
-        empty_response_uids = set()
-        invalid_tweet_uids = set()
-        successful_uids = set()
-
-        for response, uid in zip(responses, miner_uids):
-            try:
-                if not response:
-                    bt.logging.info(
-                        f"❌ {self.format_miner_info(uid)} FAILED - no response received | Raw: {response}"
-                    )
-                    no_response_uids.add(uid)
-                    continue
-
-                try:
-                    all_responses = response.get("response", [])
-                    bt.logging.debug(
-                        f"Raw response from {self.format_miner_info(uid)}: {response}"
-                    )
-                except Exception as e:
-                    bt.logging.info(
-                        f"❌ {self.format_miner_info(uid)} FAILED - malformed response | Error: {e} | Raw: {response}"
-                    )
-                    empty_response_uids.add(uid)
-                    continue
-
-                if not all_responses:
-                    bt.logging.info(
-                        f"✅ {self.format_miner_info(uid)} returned no tweets"
-                    )
-                    successful_uids.add(uid)  # This is a valid response
-                    continue
-
-                bt.logging.info(
-                    f"Processing {len(all_responses)} tweets from {self.format_miner_info(uid)}"
-                )
-
-                # Validate the batch
-                if await self.validate_tweet_batch(uid, all_responses, random_keyword):
-                    uid_int = int(uid)
-
-                    # Handle volume scoring
-                    if not self.validator.tweets_by_uid.get(uid_int):
-                        self.validator.tweets_by_uid[uid_int] = {
-                            tweet["Tweet"]["ID"] for tweet in all_responses
-                        }
-                        new_tweet_count = len(all_responses)
-                        self.validator.scorer.add_volume(
-                            uid_int, new_tweet_count, current_block
-                        )
-                        bt.logging.info(
-                            f"First submission from {self.format_miner_info(uid_int)}: {new_tweet_count} new tweets"
-                        )
-                    else:
-                        existing_tweet_ids = self.validator.tweets_by_uid[uid_int]
-                        new_tweet_ids = {
-                            tweet["Tweet"]["ID"] for tweet in all_responses
-                        }
-                        updates = new_tweet_ids - existing_tweet_ids
-                        duplicate_with_history = len(new_tweet_ids) - len(updates)
-
-                        if duplicate_with_history > 0:
-                            bt.logging.info(
-                                f"Found {duplicate_with_history} previously seen tweets from {self.format_miner_info(uid_int)} "
-                                f"(reduced from {len(new_tweet_ids)} to {len(updates)} new tweets)"
-                            )
-                        else:
-                            bt.logging.debug(
-                                f"All {len(new_tweet_ids)} tweets from {self.format_miner_info(uid_int)} are new"
-                            )
-
-                        self.validator.tweets_by_uid[uid_int].update(new_tweet_ids)
-                        self.validator.scorer.add_volume(
-                            uid_int, len(updates), current_block
-                        )
-
-                    bt.logging.info(
-                        f"✅ All {len(all_responses)} tweets from {self.format_miner_info(uid)} passed validation, exporting batch"
-                    )
-
-                    # DETAILED EXPORT LOGGING
-                    tweet_ids = [tweet["Tweet"]["ID"] for tweet in all_responses]
-                    bt.logging.info(
-                        f"🚀 EXPORTING {len(all_responses)} tweets from {self.format_miner_info(uid)}"
-                    )
-                    # Show just the first few IDs as examples
-                    sample_size = min(3, len(tweet_ids))
-                    if sample_size > 0:
-                        sample_ids = tweet_ids[:sample_size]
-                        bt.logging.info(
-                            f"Sample IDs: {sample_ids}{' + more...' if len(tweet_ids) > sample_size else ''}"
-                        )
-
-                    # Add TimeParsed field to each tweet before export
-                    current_time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
-                    for tweet in all_responses:
-                        if "Tweet" in tweet:
-                            tweet["Tweet"]["TimeParsed"] = current_time_str
-
-                    # Log details of what's being exported without redundant deduplication
-                    for i, tweet in enumerate(
-                        all_responses[:3]
-                    ):  # Log first 3 tweets as sample
-                        bt.logging.info(
-                            f"  Tweet {i+1}/{min(3, len(all_responses))} Sample:\n"
-                            f"    ID: {tweet['Tweet']['ID']}\n"
-                            f"    Text: {tweet['Tweet'].get('Text', '')[:100]}...\n"
-                            f"    URL: {self.format_tweet_url(tweet['Tweet']['ID'])}\n"
-                            f"    TimeParsed: {tweet['Tweet']['TimeParsed']}\n"
-                        )
-
-                    if len(all_responses) > 3:
-                        bt.logging.info(
-                            f"  ... and {len(all_responses) - 3} more tweets"
-                        )
+        ):
+            uid = response["uid"]
+            self.validation_executor.submit(
+                uid,
+                self.process_miner_response(
+                    uid, response, random_keyword, query, current_block
+                ),
+            )
 
-                    # Export valid batch directly to API
-                    await self.validator.export_tweets(
-                        all_responses,
-                        query.strip().replace('"', ""),
-                    )
-                    successful_uids.add(uid)
-                else:
-                    bt.logging.info(
-                        f"❌ Not all tweets from {self.format_miner_info(uid)} passed validation, skipping batch"
-                    )
-                    invalid_tweet_uids.add(uid)
-            except Exception as e:
-                bt.logging.error(f"Error processing miner {uid}: {e}")
+        for uid, outcome in (await self.validation_executor.join()).items():
+            if isinstance(outcome, Exception):
+                bt.logging.error(f"Error processing miner {uid}: {outcome}")
                 continue
+            outcomes[outcome].add(uid)
+
+        no_response_uids = outcomes["no_response"]
+        empty_response_uids = outcomes["empty_response"]
+        invalid_tweet_uids = outcomes["invalid_tweets"]
+        deferred_uids = outcomes["deferred"]
+        successful_uids = outcomes["successful"]
 
         # Log detailed summary of all miners
         bt.logging.info("📊 Miner Response Summary:")
@@ -743,14 +769,180 @@ class Forwarder:
             bt.logging.info(
                 f"  Invalid Tweets ({len(invalid_tweet_uids)}): {sorted(invalid_tweet_uids)}"
             )
+        if deferred_uids:
+            bt.logging.info(
+                f"  Deferred, verification budget spent ({len(deferred_uids)}): {sorted(deferred_uids)}"
+            )
         if successful_uids:
             bt.logging.info(
                 f"  Successful ({len(successful_uids)}): {sorted(successful_uids)}"
             )
 
+        bt.logging.info(f"  Verification: {self.rate_limiter.metrics()}")
+        bt.logging.info(f"  Verdict cache: {self.verdict_cache.metrics()}")
+        bt.logging.info(f"  Export: {self.validator.exporter.metrics()}")
+        await self.verdict_cache.save()
+
         # note, set the last volume block to the current block
         self.validator.last_volume_block = current_block
 
+    async def process_miner_response(
+        self,
+        uid: int,
+        response: dict,
+        random_keyword: str,
+        query: str,
+        current_block: int,
+    ) -> str:
+        """
+        Validate, account volume for and export a single miner's tweet response.
+
+        Returns the outcome used for the round summary: one of "no_response",
+        "empty_response", "invalid_tweets", "deferred" or "successful". Miners whose
+        tweets could not be verified within the round's budget are deferred: they get
+        no volume for this round and are checked again when next sampled.
+        """
+        if not response:
+            bt.logging.info(
+                f"❌ {self.format_miner_info(uid)} FAILED - no response received | Raw: {response}"
+            )
+            return "no_response"
+
+        try:
+            all_responses = response.get("response", [])
+            bt.logging.debug(
+                f"Raw response from {self.format_miner_info(uid)}: {response}"
+            )
+        except Exception as e:
+            bt.logging.info(
+                f"❌ {self.format_miner_info(uid)} FAILED - malformed response | Error: {e} | Raw: {response}"
+            )
+            return "empty_response"
+
+        if not all_responses:
+            bt.logging.info(f"✅ {self.format_miner_info(uid)} returned no tweets")
+            return "successful"  # This is a valid response
+
+        bt.logging.info(
+            f"Processing {len(all_responses)} tweets from {self.format_miner_info(uid)}"
+        )
+
+        # Validate the batch
+        try:
+            valid = await self.validate_tweet_batch(uid, all_responses, random_keyword)
+        except RoundBudgetExhausted as e:
+            bt.logging.warning(
+                f"⏭️ {self.format_miner_info(uid)} DEFERRED - no volume this round | {e}"
+            )
+            return "deferred"
+
+        if valid:
+            uid_int = int(uid)
+
+            # Handle volume scoring
+            tweet_ids = [tweet["Tweet"]["ID"] for tweet in all_responses]
+            # Aligned with all_responses; IDs are unique within a validated batch
+            encoded_ids = np.array(tweet_ids, dtype=np.uint64)
+            # Only the first miner to return a tweet gets credit for it and exports it
+            first_seen, first_uids, first_blocks = self.seen_tweets.claim(
+                encoded_ids, uid_int, current_block
+            )
+            seen_elsewhere = first_uids != uid_int
+            if seen_elsewhere.any():
+                others = sorted(set(first_uids[seen_elsewhere].tolist()))
+                bt.logging.info(
+                    f"Found {int(seen_elsewhere.sum())} tweets from {self.format_miner_info(uid_int)} "
+                    f"already returned by miners {others} "
+                    f"(first at block {int(first_blocks[seen_elsewhere].min())})"
+                )
+
+            if not self.validator.tweets_by_uid.get(uid_int):
+                self.validator.tweets_by_uid[
+                    uid_int
+                ] = self.validator.new_tweet_history()
+                self.validator.tweets_by_uid[uid_int].update(encoded_ids, current_block)
+                new_tweet_count = int((~seen_elsewhere).sum())
+                bt.logging.info(
+                    f"First submission from {self.format_miner_info(uid_int)}: {new_tweet_count} new tweets"
+                )
+            else:
+                updates = self.validator.tweets_by_uid[uid_int].update(
+                    encoded_ids, current_block
+                )
+                duplicate_with_history = len(tweet_ids) - len(updates)
+                # Also dedup against the rest of the subnet
+                credited = ~np.isin(updates, encoded_ids[seen_elsewhere])
+                new_tweet_count = int(credited.sum())
+
+                if duplicate_with_history > 0:
+                    bt.logging.info(
+                        f"Found {duplicate_with_history} previously seen tweets from {self.format_miner_info(uid_int)} "
+                        f"(reduced from {len(tweet_ids)} to {len(updates)} new tweets)"
+                    )
+                else:
+                    bt.logging.debug(
+                        f"All {len(tweet_ids)} tweets from {self.format_miner_info(uid_int)} are new"
+                    )
+
+            self.validator.scorer.add_volume(uid_int, new_tweet_count, current_block)
+
+            # Tweets already exported by another miner, or by this one earlier, are skipped
+            export_tweets = [
+                tweet for tweet, new in zip(all_responses, first_seen) if new
+            ]
+            bt.logging.info(
+                f"✅ All {len(all_responses)} tweets from {self.format_miner_info(uid)} passed validation, "
+                f"exporting {len(export_tweets)} not exported before"
+            )
+            if not export_tweets:
+                return "successful"
+
+            # DETAILED EXPORT LOGGING
+            export_ids = [tweet["Tweet"]["ID"] for tweet in export_tweets]
+            bt.logging.info(
+                f"🚀 EXPORTING {len(export_tweets)} tweets from {self.format_miner_info(uid)}"
+            )
+            # Show just the first few IDs as examples
+            sample_size = min(3, len(export_ids))
+            if sample_size > 0:
+                sample_ids = export_ids[:sample_size]
+                bt.logging.info(
+                    f"Sample IDs: {sample_ids}{' + more...' if len(export_ids) > sample_size else ''}"
+                )
+
+            # Add TimeParsed field to each tweet before export
+            current_time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+            for tweet in export_tweets:
+                if "Tweet" in tweet:
+                    tweet["Tweet"]["TimeParsed"] = current_time_str
+
+            # Log details of what's being exported
+            for i, tweet in enumerate(
+                export_tweets[:3]
+            ):  # Log first 3 tweets as sample
+                bt.logging.info(
+                    f"  Tweet {i+1}/{min(3, len(export_tweets))} Sample:\n"
+                    f"    ID: {tweet['Tweet']['ID']}\n"
+                    f"    Text: {tweet['Tweet'].get('Text', '')[:100]}...\n"
+                    f"    URL: {self.format_tweet_url(tweet['Tweet']['ID'])}\n"
+                    f"    TimeParsed: {tweet['Tweet']['TimeParsed']}\n"
+                )
+
+            if len(export_tweets) > 3:
+                bt.logging.info(f"  ... and {len(export_tweets) - 3} more tweets")
+
+            # Queue the valid batch for background export to the API
+            await self.validator.export_tweets(
+                export_tweets,
+                query.strip().replace('"', ""),
+            )
+            return "successful"
+        else:
+            bt.logging.info(
+                f"❌ Not all tweets from {self.format_miner_info(uid)} passed validation, skipping batch"
+            )
+            return "invalid_tweets"
+
     def check_tempo(self, current_block: int) -> bool:
         if self.validator.last_tempo_block == 0:
             self.validator.last_tempo_block = current_block
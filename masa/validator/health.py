@@ -0,0 +1,62 @@
+from typing import Dict, Iterable, List, Tuple
+
+
+class MinerHealth:
+    """
+    Per-uid record of the last healthcheck ping: block, version and axon fingerprint.
+
+    Lets the validator re-ping only the miners whose answer may have changed instead of
+    sweeping the whole subnet: miners never pinged, whose axon info changed in the
+    metagraph, whose last ping is older than `max_age` blocks, or whose last ping
+    failed (version 0) and is older than `retry_age` blocks.
+    """
+
+    def __init__(self):
+        self.last_ping_block: Dict[int, int] = {}
+        self.fingerprints: Dict[int, Tuple] = {}
+        self.versions: Dict[int, int] = {}
+
+    @staticmethod
+    def fingerprint(axon) -> Tuple:
+        return (axon.hotkey, axon.ip, axon.port, axon.ip_type, axon.version)
+
+    def record(self, uid: int, axon, version: int, block: int):
+        self.last_ping_block[uid] = block
+        self.fingerprints[uid] = self.fingerprint(axon)
+        self.versions[uid] = version
+
+    def prune(self, uids: Iterable[int]):
+        """Forget every uid not in `uids`, e.g. miners that stopped serving."""
+        keep = set(uids)
+        for uid in list(self.versions):
+            if uid not in keep:
+                del self.last_ping_block[uid]
+                del self.fingerprints[uid]
+                del self.versions[uid]
+
+    def stale_uids(
+        self,
+        uids: Iterable[int],
+        axons: List,
+        current_block: int,
+        max_age: int,
+        retry_age: int,
+    ) -> Dict[str, List[int]]:
+        """Group the uids that need a new ping by reason: new, changed, stale, failed."""
+        reasons = {"new": [], "changed": [], "stale": [], "failed": []}
+        for uid in uids:
+            if uid not in self.versions:
+                reasons["new"].append(uid)
+            elif self.fingerprints[uid] != self.fingerprint(axons[uid]):
+                reasons["changed"].append(uid)
+            else:
+                age = current_block - self.last_ping_block[uid]
+                if age >= max_age:
+                    reasons["stale"].append(uid)
+                elif self.versions[uid] == 0 and age >= retry_age:
+                    reasons["failed"].append(uid)
+        return reasons
+
+    def versions_by_uid(self, n: int) -> List[int]:
+        """Versions indexed by uid; miners never pinged or not serving report 0."""
+        return [self.versions.get(uid, 0) for uid in range(n)]
@@ -0,0 +1,69 @@
+import functools
+from typing import List, Tuple
+
+import numpy as np
+
+from masa.validator.tweet_decoder import MAPPING_TYPES
+
+# Tweet fields a query word may appear in
+MATCHED_FIELDS = ("Text", "Name", "Username", "Hashtags")
+
+
+class KeywordMatcher:
+    """
+    Checks that every word of a query appears in one of a tweet's matched fields.
+
+    Equivalent to lower-casing and whitespace-normalizing the keyword and each field,
+    then requiring every query word to be a substring of some field. Query words never
+    contain whitespace, so normalizing the fields cannot change whether a word occurs
+    in them; the matcher only lower-cases one haystack per tweet (the fields joined by
+    newlines, which no word can span) and runs CPython's substring search for each of
+    the few query words, instead of re-normalizing keyword and fields every time.
+    """
+
+    __slots__ = ("keyword", "words")
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        # Longest first: it is the rarest word, so off-topic tweets fail fastest
+        self.words: Tuple[str, ...] = tuple(
+            sorted(set(keyword.replace('"', "").lower().split()), key=len, reverse=True)
+        )
+
+    def __repr__(self) -> str:
+        return f"KeywordMatcher({self.keyword!r})"
+
+    @staticmethod
+    def _haystack(tweet: dict) -> str:
+        fields = []
+        for field in MATCHED_FIELDS[:-1]:
+            value = tweet.get(field)
+            if value:
+                fields.append(value if type(value) is str else str(value))
+        # Hashtags are matched against the list's repr, as they always have been
+        fields.append(str(tweet.get("Hashtags", [])))
+        return "\n".join(fields).lower()
+
+    def matches(self, tweet: dict) -> bool:
+        haystack = self._haystack(tweet)
+        return all(word in haystack for word in self.words)
+
+    def match_batch(self, responses: List) -> np.ndarray:
+        """Boolean mask of the responses whose tweet contains every query word."""
+        matches = self.matches
+        return np.fromiter(
+            (
+                type(item) in MAPPING_TYPES
+                and type(item.get("Tweet")) in MAPPING_TYPES
+                and matches(item["Tweet"])
+                for item in responses
+            ),
+            dtype=bool,
+            count=len(responses),
+        )
+
+
+@functools.lru_cache(maxsize=64)
+def compile_keyword(keyword: str) -> KeywordMatcher:
+    """Matcher for `keyword`, built once and shared by every miner of a round."""
+    return KeywordMatcher(keyword)
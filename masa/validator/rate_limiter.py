@@ -0,0 +1,131 @@
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import bittensor as bt
+
+
+class RoundBudgetExhausted(Exception):
+    """Raised when the verification budget for the current round has been spent."""
+
+
+class RateLimiter:
+    """
+    Token bucket plus concurrency cap shared by every upstream tweet verification.
+
+    - Tokens refill continuously at `rate` per second up to `burst`; each call takes one.
+    - At most `max_concurrency` calls are in flight at once.
+    - `backoff()` pauses the whole bucket after an upstream 429, doubling the pause on
+      consecutive throttles up to `max_backoff`; `record_success()` resets it.
+    - `start_round(budget)` caps how many calls a single round may make (0 = unlimited).
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 3,
+        max_concurrency: int = 4,
+        round_budget: int = 0,
+        base_backoff: float = 5.0,
+        max_backoff: float = 60.0,
+    ):
+        self.rate = max(float(rate), 1e-6)
+        self.burst = max(1, int(burst))
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.round_budget = max(0, int(round_budget))
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.total_tokens = 0
+        self.total_wait = 0.0
+        self.total_throttled = 0
+        self.start_round()
+
+    def start_round(self, round_budget: Optional[int] = None):
+        """Reset per-round counters, optionally overriding the round budget."""
+        if round_budget is not None:
+            self.round_budget = max(0, int(round_budget))
+        self.round_tokens = 0
+        self.round_wait = 0.0
+        self.round_throttled = 0
+        self.round_rejected = 0
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def _check_budget(self):
+        if self.round_budget and self.round_tokens >= self.round_budget:
+            self.round_rejected += 1
+            raise RoundBudgetExhausted(
+                f"Verification budget of {self.round_budget} calls exhausted for this round"
+            )
+
+    async def _take_token(self):
+        # The lock makes waiters queue in order instead of racing for refilled tokens
+        async with self._lock:
+            while True:
+                self._check_budget()
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.round_tokens += 1
+                    self.total_tokens += 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Wait for a concurrency slot and a token, then hold the slot for the call."""
+        self._check_budget()
+        start = time.monotonic()
+        async with self._semaphore:
+            try:
+                await self._take_token()
+            finally:
+                waited = time.monotonic() - start
+                self.round_wait += waited
+                self.total_wait += waited
+            yield
+
+    def backoff(self, retry_after: Optional[float] = None):
+        """Pause all verification after the upstream signalled it is throttling us."""
+        self._consecutive_throttles += 1
+        self.round_throttled += 1
+        self.total_throttled += 1
+        delay = retry_after or min(
+            self.max_backoff,
+            self.base_backoff * 2 ** (self._consecutive_throttles - 1),
+        )
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        # Drain the bucket so the resumed stream starts at the sustained rate
+        self._tokens = 0.0
+        self._last_refill = self._paused_until
+        bt.logging.warning(f"Upstream verifier throttled, backing off for {delay:.1f}s")
+
+    def record_success(self):
+        self._consecutive_throttles = 0
+
+    def metrics(self) -> dict:
+        return {
+            "round_tokens": self.round_tokens,
+            "round_wait_seconds": round(self.round_wait, 3),
+            "round_throttled": self.round_throttled,
+            "round_rejected": self.round_rejected,
+            "total_tokens": self.total_tokens,
+            "total_wait_seconds": round(self.total_wait, 3),
+            "total_throttled": self.total_throttled,
+        }
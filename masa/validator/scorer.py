@@ -18,7 +18,9 @@
 
 import bittensor as bt
 import torch
+import numpy as np
 import scipy.stats as stats
+from scipy import special
 from fastapi.responses import JSONResponse
 import traceback
 import sys
@@ -33,21 +35,7 @@ class Scorer:
             tempo = (
                 current_block // self.validator.tempo
             )  # Group blocks by tempo, or roughly 72 minutes
-
-            if (
-                not self.validator.volumes
-                or self.validator.volumes[-1]["tempo"] != tempo
-            ):
-                self.validator.volumes.append({"tempo": tempo, "miners": {}})
-                self.validator.volumes = self.validator.volumes[
-                    -self.validator.volume_window :
-                ]
-
-            # Always store miner_uid as string in volumes
-            miner_uid_str = str(miner_uid)
-            if miner_uid_str not in self.validator.volumes[-1]["miners"]:
-                self.validator.volumes[-1]["miners"][miner_uid_str] = 0
-            self.validator.volumes[-1]["miners"][miner_uid_str] += volume
+            self.validator.volume_buffer.add(miner_uid, volume, tempo)
         except Exception:
             bt.logging.error(f"Exception in add_volume:\n{traceback.format_exc()}")
             raise
@@ -55,49 +43,22 @@ class Scorer:
     async def score_miner_volumes(self, current_block: int):
         try:
             bt.logging.debug("Starting score_miner_volumes...")
-            volumes = self.validator.volumes
+            volume_buffer = self.validator.volume_buffer
 
-            if not volumes:
+            if not len(volume_buffer):
                 bt.logging.info("No volumes to score")
                 return JSONResponse(content=[])
 
-            window_size = min(self.validator.volume_window, len(volumes))
-            miner_volumes = {}
+            # Summed over the window by the buffer's running totals
+            uids, totals = volume_buffer.window_totals()
+            bt.logging.debug(f"Aggregated volumes of {len(uids)} miners")
 
-            # Process volumes and aggregate miner data
             try:
-                for volume in volumes[-window_size:]:
-                    bt.logging.debug(f"Processing volume from tempo {volume['tempo']}")
-                    for miner_uid_str, vol in volume["miners"].items():
-                        # Ensure consistent string keys
-                        miner_uid_str = str(miner_uid_str)
-                        if miner_uid_str not in miner_volumes:
-                            miner_volumes[miner_uid_str] = 0
-                        miner_volumes[miner_uid_str] += vol
-            except Exception:
-                bt.logging.error(
-                    f"Exception processing volumes:\n{traceback.format_exc()}"
-                )
-                return JSONResponse(content=[])
-
-            bt.logging.debug(f"Aggregated miner volumes: {miner_volumes}")
-
-            try:
-                # Convert string UIDs to integers for scoring
-                valid_miner_uids = []
-                for uid_str in miner_volumes.keys():
-                    try:
-                        uid_int = int(uid_str)
-                        if uid_int < len(
-                            self.validator.scores
-                        ):  # Ensure UID is in valid range
-                            valid_miner_uids.append(uid_int)
-                        else:
-                            bt.logging.warning(
-                                f"UID {uid_int} is out of range, skipping"
-                            )
-                    except ValueError:
-                        bt.logging.warning(f"Invalid UID format: {uid_str}, skipping")
+                # Ensure UIDs are in valid range
+                in_range = uids < len(self.validator.scores)
+                for uid in uids[~in_range].tolist():
+                    bt.logging.warning(f"UID {uid} is out of range, skipping")
+                valid_miner_uids = uids[in_range].tolist()
 
                 bt.logging.debug(f"Valid miner UIDs for scoring: {valid_miner_uids}")
             except Exception:
@@ -110,39 +71,14 @@ class Scorer:
                 bt.logging.warning("No valid miner UIDs to score")
                 return JSONResponse(content=[])
 
-            try:
-                mean_volume = sum(miner_volumes.values()) / len(miner_volumes)
-                std_dev_volume = (
-                    sum((x - mean_volume) ** 2 for x in miner_volumes.values())
-                    / len(miner_volumes)
-                ) ** 0.5
-                bt.logging.debug(
-                    f"Volume statistics - Mean: {mean_volume:.2f}, StdDev: {std_dev_volume:.2f}"
-                )
-            except Exception:
-                bt.logging.error(
-                    f"Exception calculating statistics:\n{traceback.format_exc()}"
-                )
-                return JSONResponse(content=[])
-
             try:
                 if len(valid_miner_uids) == 1:
-                    rewards = [1]
+                    rewards = np.ones(1)
                 else:
-                    rewards = []
-                    for uid in valid_miner_uids:
-                        volume = miner_volumes[
-                            str(uid)
-                        ]  # Convert UID to string for lookup
-                        reward = self.kurtosis_based_score(
-                            volume, mean_volume, std_dev_volume
-                        )
-                        rewards.append(reward)
-                        bt.logging.debug(
-                            f"UID {uid}: volume={volume}, reward={reward:.4f}"
-                        )
+                    # Out of range miners still count toward the statistics
+                    rewards = self.volume_rewards(totals)[in_range]
 
-                scores = torch.FloatTensor(rewards).to(self.validator.device)
+                scores = torch.from_numpy(rewards).float().to(self.validator.device)
             except Exception:
                 bt.logging.error(
                     f"Exception calculating rewards:\n{traceback.format_exc()}"
@@ -156,15 +92,15 @@ class Scorer:
                 self.validator.last_scoring_block = current_block
                 bt.logging.debug("score_miner_volumes completed successfully")
 
-                if volumes:
+                if valid_miner_uids:
                     try:
                         serializable_volumes = [
-                            {
-                                "uid": uid,
-                                "volume": float(miner_volumes[str(uid)]),
-                                "score": rewards[valid_miner_uids.index(uid)],
-                            }
-                            for uid in valid_miner_uids
+                            {"uid": uid, "volume": volume, "score": reward}
+                            for uid, volume, reward in zip(
+                                valid_miner_uids,
+                                totals[in_range].tolist(),
+                                rewards.tolist(),
+                            )
                         ]
                         return JSONResponse(content=serializable_volumes)
                     except Exception:
@@ -192,6 +128,19 @@ class Scorer:
         similarity_percentage = (cosine_similarity + 1) / 2 * 100
         return similarity_percentage
 
+    def volume_rewards(self, volumes: np.ndarray, scale_factor=1.0) -> np.ndarray:
+        """
+        `kurtosis_based_score` of every volume against the mean and standard deviation
+        of all of them, in one ndtr call (the normal CDF behind `stats.norm.cdf`).
+        """
+        # cumsum adds in order, as sum() does, so the statistics match to the bit
+        mean = float(np.cumsum(volumes)[-1]) / len(volumes)
+        std_dev = (float(np.cumsum((volumes - mean) ** 2)[-1]) / len(volumes)) ** 0.5
+        bt.logging.debug(f"Volume statistics - Mean: {mean:.2f}, StdDev: {std_dev:.2f}")
+        if std_dev == 0:
+            return np.zeros(len(volumes))
+        return special.ndtr((volumes - mean) / std_dev) * scale_factor
+
     def kurtosis_based_score(self, volume, mean, std_dev, scale_factor=1.0):
         if std_dev == 0:
             return 0
@@ -0,0 +1,157 @@
+from typing import Tuple
+
+import numpy as np
+
+# Multiplicative (Fibonacci) hashing constant, 2**64 / golden ratio
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_EMPTY = np.uint64(0)
+_NO_UID = -1
+# Linear probing stays short up to about this load factor
+_MAX_LOAD = 0.7
+
+
+class SeenTweetIndex:
+    """
+    Subnet-wide index of which miner first returned each tweet ID, and at which block.
+
+    An open-addressing hash table over three flat numpy arrays (ID, uid, block: 14 bytes
+    a slot), so lookups and inserts are O(1) per ID and batches are processed with
+    vectorized probing instead of a Python loop per tweet. Tweet IDs are never 0, which
+    marks an empty slot. The table doubles to keep its load factor at or below 0.7; once
+    it would hold more than `max_ids` IDs, the entries from the oldest half of the
+    stored blocks are evicted, so memory stays under `3 * max_ids` slots. A single
+    claim of `max_ids` IDs or more evicts everything else and is stored whole. Lookups
+    are exact (no false positives); an evicted ID simply counts as unseen again.
+    """
+
+    def __init__(self, max_ids: int = 5_000_000, initial_capacity: int = 1 << 16):
+        self.max_ids = max(1, int(max_ids))
+        self.evictions = 0
+        self._allocate(max(16, 1 << (int(initial_capacity) - 1).bit_length()))
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self._shift = np.uint64(64 - (capacity.bit_length() - 1))
+        self._ids = np.zeros(capacity, dtype=np.uint64)
+        self._uids = np.full(capacity, _NO_UID, dtype=np.int16)
+        self._blocks = np.zeros(capacity, dtype=np.uint32)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def nbytes(self) -> int:
+        return self._ids.nbytes + self._uids.nbytes + self._blocks.nbytes
+
+    def _slots(self, ids: np.ndarray) -> np.ndarray:
+        with np.errstate(over="ignore"):
+            return ((ids * _HASH_MULTIPLIER) >> self._shift).astype(np.int64)
+
+    def _probe(self, ids: np.ndarray, insert: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the slot of each unique ID, claiming empty slots for missing ones if
+        `insert`. Returns (slot, found) where slot is -1 for IDs missing on lookup.
+        """
+        mask = np.int64(self.capacity - 1)
+        slots = self._slots(ids)
+        result = np.full(len(ids), -1, dtype=np.int64)
+        found = np.zeros(len(ids), dtype=bool)
+        pending = np.arange(len(ids))
+        while len(pending):
+            slot = slots[pending]
+            stored = self._ids[slot]
+            hit = stored == ids[pending]
+            result[pending[hit]] = slot[hit]
+            found[pending[hit]] = True
+
+            empty = stored == _EMPTY
+            if insert and empty.any():
+                # Several IDs may race for one empty slot; the first of each wins and
+                # the rest see it taken on their next probe
+                candidates = pending[empty]
+                _, first = np.unique(slot[empty], return_index=True)
+                winners = candidates[first]
+                self._ids[slots[winners]] = ids[winners]
+                result[winners] = slots[winners]
+                self.size += len(winners)
+                retry = np.setdiff1d(candidates, winners, assume_unique=True)
+            else:
+                retry = pending[:0]
+
+            # Occupied by another ID: move to the next slot
+            collided = pending[~hit & ~empty]
+            slots[collided] = (slots[collided] + 1) & mask
+            pending = np.concatenate([collided, retry])
+        return result, found
+
+    def lookup(self, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """First-seen (uid, block) for each ID; uid is -1 for IDs never seen."""
+        ids = np.asarray(ids, dtype=np.uint64)
+        unique, inverse = np.unique(ids, return_inverse=True)
+        slots, found = self._probe(unique, insert=False)
+        uids = np.full(len(unique), _NO_UID, dtype=np.int16)
+        blocks = np.zeros(len(unique), dtype=np.uint32)
+        uids[found] = self._uids[slots[found]]
+        blocks[found] = self._blocks[slots[found]]
+        return uids[inverse], blocks[inverse]
+
+    def claim(
+        self, ids: np.ndarray, uid: int, block: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Record `uid` as the first miner to return every ID not seen before.
+
+        Returns (new, uids, blocks) aligned with `ids`: whether this call claimed the ID,
+        and the uid and block that first returned it (this uid and block if new).
+        """
+        ids = np.asarray(ids, dtype=np.uint64)
+        unique, inverse = np.unique(ids, return_inverse=True)
+        self._reserve(len(unique))
+        slots, found = self._probe(unique, insert=True)
+        new = ~found
+        self._uids[slots[new]] = uid
+        self._blocks[slots[new]] = block
+        return new[inverse], self._uids[slots][inverse], self._blocks[slots][inverse]
+
+    def _reserve(self, count: int):
+        """Make room for `count` more IDs, growing or evicting as needed."""
+        while True:
+            if self.size and self.size + count > self.max_ids:
+                if count >= self.max_ids:
+                    # The batch alone fills the index, so nothing else can stay
+                    self._evict_all()
+                else:
+                    self._evict_oldest()
+            elif self.size + count > self.capacity * _MAX_LOAD:
+                self._rehash(self.capacity * 2)
+            else:
+                return
+
+    def _evict_oldest(self):
+        occupied = self._ids != _EMPTY
+        blocks = self._blocks[occupied]
+        cutoff = np.median(blocks)
+        keep = blocks > cutoff
+        if keep.all() or not keep.any():
+            # One block holds everything; drop an arbitrary half (rounded up) instead,
+            # so even a single entry is evicted
+            keep = np.arange(len(blocks)) % 2 == 1
+        self.evictions += int(len(blocks) - keep.sum())
+        self._rehash(self.capacity, occupied, keep)
+
+    def _evict_all(self):
+        self.evictions += self.size
+        self._allocate(self.capacity)
+
+    def _rehash(self, capacity: int, occupied=None, keep=None):
+        if occupied is None:
+            occupied = self._ids != _EMPTY
+        ids = self._ids[occupied]
+        uids = self._uids[occupied]
+        blocks = self._blocks[occupied]
+        if keep is not None:
+            ids, uids, blocks = ids[keep], uids[keep], blocks[keep]
+        self._allocate(capacity)
+        slots, _ = self._probe(ids, insert=True)
+        self._uids[slots] = uids
+        self._blocks[slots] = blocks
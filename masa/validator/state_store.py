@@ -0,0 +1,411 @@
+import asyncio
+import collections
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import bittensor as bt
+import numpy as np
+import torch
+
+from masa.validator.checkpoint import load_legacy_state
+from masa.validator.tweet_ids import TweetIdHistory, TweetIdSet
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scores (
+    uid INTEGER PRIMARY KEY,
+    score REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hotkeys (
+    uid INTEGER PRIMARY KEY,
+    hotkey TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS volumes (
+    tempo INTEGER NOT NULL,
+    uid INTEGER NOT NULL,
+    volume NUMERIC NOT NULL,
+    PRIMARY KEY (tempo, uid)
+);
+CREATE TABLE IF NOT EXISTS tweet_segments (
+    uid INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    ids BLOB NOT NULL,
+    PRIMARY KEY (uid, start)
+);
+CREATE INDEX IF NOT EXISTS tweet_segments_by_start ON tweet_segments (start);
+"""
+
+
+class SQLiteStateStore:
+    """
+    Validator state in one SQLite database in WAL mode, as an alternative to the
+    Checkpointer's files, with the same save/load interface.
+
+    Each concern has its own table keyed the way it is updated: scores and hotkeys by
+    uid, volumes by (tempo, uid), and tweet histories by (uid, segment start) with the
+    segment's uint64 IDs as a blob. A save diffs the state against what was last
+    written and applies only the changed rows, the volumes added by `add_volume` and
+    the scores from `update_scores` alike, in one transaction, so a crash leaves the
+    last committed save intact without ever rewriting the whole state. Saves follow
+    the same `interval` / `max_pending_bytes` cadence as the Checkpointer.
+
+    The `read_*` methods serve the API from a separate connection, which WAL lets read
+    while a save is being written, so requests never touch the live objects. Their
+    results are kept in an LRU cache of `cache_entries` entries that every save
+    invalidates, and SQLite's own page cache is held to `cache_kib` per connection.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = 60.0,
+        max_pending_bytes: int = 16 * 2**20,
+        cache_entries: int = 64,
+        cache_kib: int = 8192,
+    ):
+        self.path = path
+        self.interval = max(0.0, float(interval))
+        self.max_pending_bytes = max(1, int(max_pending_bytes))
+        self.cache_entries = max(0, int(cache_entries))
+        self.cache_kib = max(0, int(cache_kib))
+        self._lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+        self._reader = self._connect()
+        self._read_lock = threading.Lock()
+        # (method, args) -> (generation, result), least recently used first
+        self._cache: collections.OrderedDict = collections.OrderedDict()
+        self._generation = 0
+
+        # What the database holds, per table
+        self._saved_step: Optional[int] = None
+        self._saved_scores: Optional[torch.Tensor] = None
+        self._saved_hotkeys: List[str] = []
+        self._saved_volumes: Dict[Tuple[int, int], float] = {}
+        self._saved_segments: Dict[Tuple[int, int], int] = {}
+        self.last_save = time.monotonic()
+
+        self.saves = 0
+        self.rows_written = 0
+        self.bytes_written = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Saves run in executor threads; every use is serialized by a lock
+        connection = sqlite3.connect(
+            self.path, isolation_level=None, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode a process crash never loses a committed transaction
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA cache_size=-{self.cache_kib}")
+        return connection
+
+    def exists(self) -> bool:
+        row = self._writer.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        return row is not None
+
+    def prepare(self, state: dict, force: bool = False) -> Optional[dict]:
+        """
+        Collect the rows of `state` changed since the last save, if a save is due.
+        Called on the event loop, so the snapshot is consistent; the rows are written
+        by `write()`.
+        """
+        plan = {}
+        step = int(state["step"])
+        if step != self._saved_step:
+            plan["step"] = step
+
+        scores = state["scores"].detach().cpu()
+        saved = self._saved_scores
+        if saved is None or saved.shape != scores.shape:
+            changed = range(len(scores))
+        else:
+            changed = (saved != scores).nonzero().flatten().tolist()
+        if changed:
+            values = scores.tolist()
+            plan["scores"] = (
+                [(uid, values[uid]) for uid in changed],
+                len(scores),
+                scores.clone(),
+            )
+
+        hotkeys = list(state["hotkeys"])
+        if hotkeys != self._saved_hotkeys:
+            rows = [
+                (uid, hotkey)
+                for uid, hotkey in enumerate(hotkeys)
+                if uid >= len(self._saved_hotkeys) or self._saved_hotkeys[uid] != hotkey
+            ]
+            plan["hotkeys"] = (rows, len(hotkeys), hotkeys)
+
+        volumes = {
+            (int(volume["tempo"]), int(uid)): value
+            for volume in state["volumes"]
+            for uid, value in volume["miners"].items()
+        }
+        if volumes != self._saved_volumes:
+            plan["volumes"] = (
+                [
+                    (tempo, uid, value)
+                    for (tempo, uid), value in volumes.items()
+                    if self._saved_volumes.get((tempo, uid)) != value
+                ],
+                [key for key in self._saved_volumes if key not in volumes],
+                volumes,
+            )
+
+        pending_bytes = 0
+        segments = {}
+        upserts = []
+        for uid, history in state["tweets_by_uid"].items():
+            for start, tweet_ids in history.segments:
+                segments[(uid, start)] = len(tweet_ids)
+                if self._saved_segments.get((uid, start)) != len(tweet_ids):
+                    # TweetIdSet replaces its array on update, so this is a snapshot
+                    upserts.append((uid, start, tweet_ids.ids))
+                    pending_bytes += tweet_ids.ids.nbytes
+        expired = [key for key in self._saved_segments if key not in segments]
+        if upserts or expired:
+            plan["tweet_segments"] = (upserts, expired, segments)
+
+        if not plan:
+            return None
+        if (
+            force
+            or time.monotonic() - self.last_save >= self.interval
+            or pending_bytes >= self.max_pending_bytes
+        ):
+            return plan
+        return None
+
+    def write(self, plan: dict) -> int:
+        """Apply a prepared plan in one transaction. Returns bytes of IDs written."""
+        rows = written = 0
+        with self._lock:
+            cursor = self._writer.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                    (SCHEMA_VERSION,),
+                )
+                if "step" in plan:
+                    cursor.execute(
+                        "INSERT OR REPLACE INTO meta VALUES ('step', ?)",
+                        (plan["step"],),
+                    )
+                if "scores" in plan:
+                    changed, size, _ = plan["scores"]
+                    cursor.executemany(
+                        "INSERT OR REPLACE INTO scores VALUES (?, ?)", changed
+                    )
+                    cursor.execute("DELETE FROM scores WHERE uid >= ?", (size,))
+                    rows += len(changed)
+                if "hotkeys" in plan:
+                    changed, size, _ = plan["hotkeys"]
+                    cursor.executemany(
+                        "INSERT OR REPLACE INTO hotkeys VALUES (?, ?)", changed
+                    )
+                    cursor.execute("DELETE FROM hotkeys WHERE uid >= ?", (size,))
+                    rows += len(changed)
+                if "volumes" in plan:
+                    changed, removed, _ = plan["volumes"]
+                    cursor.executemany(
+                        "INSERT OR REPLACE INTO volumes VALUES (?, ?, ?)", changed
+                    )
+                    cursor.executemany(
+                        "DELETE FROM volumes WHERE tempo = ? AND uid = ?", removed
+                    )
+                    rows += len(changed) + len(removed)
+                if "tweet_segments" in plan:
+                    upserts, expired, _ = plan["tweet_segments"]
+                    cursor.executemany(
+                        "INSERT OR REPLACE INTO tweet_segments VALUES (?, ?, ?, ?)",
+                        (
+                            (uid, start, len(ids), ids.astype("<u8").tobytes())
+                            for uid, start, ids in upserts
+                        ),
+                    )
+                    cursor.executemany(
+                        "DELETE FROM tweet_segments WHERE uid = ? AND start = ?",
+                        expired,
+                    )
+                    rows += len(upserts) + len(expired)
+                    written += sum(ids.nbytes for _, _, ids in upserts)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+
+        if "step" in plan:
+            self._saved_step = plan["step"]
+        if "scores" in plan:
+            self._saved_scores = plan["scores"][2]
+        if "hotkeys" in plan:
+            self._saved_hotkeys = plan["hotkeys"][2]
+        if "volumes" in plan:
+            self._saved_volumes = plan["volumes"][2]
+        if "tweet_segments" in plan:
+            self._saved_segments = plan["tweet_segments"][2]
+        self._generation += 1
+        self.last_save = time.monotonic()
+        self.saves += 1
+        self.rows_written += rows
+        self.bytes_written += written
+        bt.logging.debug(f"Saved {rows} changed rows to {self.path}")
+        return written
+
+    async def save(self, state: dict, force: bool = False) -> int:
+        """Write the changed rows of `state` in a worker thread, if due."""
+        plan = self.prepare(state, force)
+        if plan is None:
+            return 0
+        return await asyncio.get_event_loop().run_in_executor(None, self.write, plan)
+
+    def load(self, new_history: Callable[[], TweetIdHistory]) -> dict:
+        """Reassemble the state, rebuilding tweet histories with `new_history()`."""
+        with self._lock:
+            query = self._writer.execute
+            meta = dict(query("SELECT key, value FROM meta").fetchall())
+            if meta.get("version") != SCHEMA_VERSION:
+                raise ValueError(
+                    f"Unsupported state store version {meta.get('version')}"
+                )
+            scores = query("SELECT uid, score FROM scores ORDER BY uid").fetchall()
+            hotkeys = query("SELECT uid, hotkey FROM hotkeys ORDER BY uid").fetchall()
+            volumes = query(
+                "SELECT tempo, uid, volume FROM volumes ORDER BY tempo, uid"
+            ).fetchall()
+            segments = query(
+                "SELECT uid, start, ids FROM tweet_segments ORDER BY uid, start"
+            ).fetchall()
+
+        state = {"step": meta.get("step", 0)}
+        state["scores"] = torch.zeros(len(scores), dtype=torch.float32)
+        for uid, score in scores:
+            state["scores"][uid] = score
+        state["hotkeys"] = [hotkey for _, hotkey in hotkeys]
+        state["volumes"] = []
+        for tempo, uid, volume in volumes:
+            if not state["volumes"] or state["volumes"][-1]["tempo"] != tempo:
+                state["volumes"].append({"tempo": tempo, "miners": {}})
+            state["volumes"][-1]["miners"][str(uid)] = volume
+
+        tweets_by_uid: Dict[int, TweetIdHistory] = {}
+        for uid, start, ids in segments:
+            if uid not in tweets_by_uid:
+                tweets_by_uid[uid] = new_history()
+            tweet_ids = TweetIdSet.from_sorted(np.frombuffer(ids, dtype="<u8"))
+            tweets_by_uid[uid].segments.append((start, tweet_ids))
+        state["tweets_by_uid"] = tweets_by_uid
+
+        self._saved_step = state["step"]
+        self._saved_scores = state["scores"].clone()
+        self._saved_hotkeys = list(state["hotkeys"])
+        self._saved_volumes = {
+            (volume["tempo"], int(uid)): value
+            for volume in state["volumes"]
+            for uid, value in volume["miners"].items()
+        }
+        self._saved_segments = {
+            (uid, start): len(tweet_ids)
+            for uid, history in tweets_by_uid.items()
+            for start, tweet_ids in history.segments
+        }
+        return state
+
+    def migrate(
+        self, state_path: str, load_history: Callable[[object], TweetIdHistory]
+    ) -> dict:
+        """
+        One-shot conversion of a pickled state.pt (see `load_legacy_state`): write it
+        into the database and rename it to state.pt.migrated.
+        """
+        state = load_legacy_state(state_path, load_history)
+        self.write(self.prepare(state, force=True))
+        os.replace(state_path, state_path + ".migrated")
+        bt.logging.success(f"Migrated {state_path} to {self.path}")
+        return state
+
+    def _read(self, name: str, sql: str, args: tuple = ()) -> list:
+        with self._read_lock:
+            key = (name, args)
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == self._generation:
+                self._cache.move_to_end(key)
+                return cached[1]
+            generation = self._generation
+            rows = self._reader.execute(sql, args).fetchall()
+            if self.cache_entries:
+                self._cache[key] = (generation, rows)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+            return rows
+
+    def read_scores(self) -> List[float]:
+        """Saved scores, indexed by uid."""
+        return [
+            score
+            for _, score in self._read(
+                "scores", "SELECT uid, score FROM scores ORDER BY uid"
+            )
+        ]
+
+    def read_volumes(self) -> List[dict]:
+        """Saved volumes as [{"tempo": ..., "miners": {uid: volume}}], oldest first."""
+        volumes = []
+        for tempo, uid, volume in self._read(
+            "volumes", "SELECT tempo, uid, volume FROM volumes ORDER BY tempo, uid"
+        ):
+            if not volumes or volumes[-1]["tempo"] != tempo:
+                volumes.append({"tempo": tempo, "miners": {}})
+            volumes[-1]["miners"][uid] = volume
+        return volumes
+
+    def read_tweet_counts(self) -> Dict[int, int]:
+        """Number of saved tweet IDs per miner."""
+        return dict(
+            self._read(
+                "tweet_counts",
+                "SELECT uid, SUM(count) FROM tweet_segments GROUP BY uid ORDER BY uid",
+            )
+        )
+
+    def read_tweet_ids(self, uid: int) -> List[str]:
+        """A miner's saved tweet IDs, oldest segment first."""
+        rows = self._read(
+            "tweet_ids",
+            "SELECT ids FROM tweet_segments WHERE uid = ? ORDER BY start",
+            (uid,),
+        )
+        return [
+            str(tweet_id)
+            for (ids,) in rows
+            for tweet_id in np.frombuffer(ids, dtype="<u8").tolist()
+        ]
+
+    def metrics(self) -> dict:
+        return {
+            "saves": self.saves,
+            "rows_written": self.rows_written,
+            "bytes_written": self.bytes_written,
+        }
+
+    def close(self):
+        with self._lock:
+            self._writer.close()
+        with self._read_lock:
+            self._reader.close()
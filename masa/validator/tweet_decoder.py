@@ -0,0 +1,162 @@
+import json
+from typing import Any, Dict, List, Optional, Union
+
+import aiohttp
+
+from masa.synapses import RecentTweetsSynapse
+
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+if msgspec is not None:
+
+    class _MappingStruct(
+        msgspec.Struct, forbid_unknown_fields=True, omit_defaults=True
+    ):
+        """
+        Read and write a struct like the dict it replaces. Missing fields are UNSET and
+        behave like absent keys; Raw fields are only decoded when they are read.
+        """
+
+        def __getitem__(self, key: str) -> Any:
+            value = getattr(self, key, msgspec.UNSET)
+            if value is msgspec.UNSET:
+                raise KeyError(key)
+            if type(value) is msgspec.Raw:
+                value = msgspec.json.decode(value)
+                setattr(self, key, value)
+            return value
+
+        def __setitem__(self, key: str, value: Any):
+            setattr(self, key, value)
+
+        def __contains__(self, key: str) -> bool:
+            return getattr(self, key, msgspec.UNSET) is not msgspec.UNSET
+
+        def get(self, key: str, default: Any = None) -> Any:
+            try:
+                return self[key]
+            except KeyError:
+                return default
+
+        def keys(self) -> List[str]:
+            return [field for field in self.__struct_fields__ if field in self]
+
+    class TweetStruct(_MappingStruct):
+        """
+        TwitterTweetObject (see masa/types/twitter.py) as a typed struct.
+
+        Fields the validator reads are decoded; the bulky ones it only passes through
+        to the export (HTML, media, quoted/retweeted/replied statuses, ...) are kept
+        as raw JSON until accessed.
+        """
+
+        ID: str = msgspec.UNSET
+        Text: Optional[str] = msgspec.UNSET
+        Name: Optional[str] = msgspec.UNSET
+        Username: Optional[str] = msgspec.UNSET
+        UserID: Optional[str] = msgspec.UNSET
+        Hashtags: Optional[List[str]] = msgspec.UNSET
+        Timestamp: Optional[Union[int, float]] = msgspec.UNSET
+        TimeParsed: Optional[str] = msgspec.UNSET
+        ConversationID: Optional[str] = msgspec.UNSET
+        PermanentURL: Optional[str] = msgspec.UNSET
+        InReplyToStatusID: Optional[str] = msgspec.UNSET
+        QuotedStatusID: Optional[str] = msgspec.UNSET
+        RetweetedStatusID: Optional[str] = msgspec.UNSET
+        IsQuoted: Optional[bool] = msgspec.UNSET
+        IsPin: Optional[bool] = msgspec.UNSET
+        IsReply: Optional[bool] = msgspec.UNSET
+        IsRetweet: Optional[bool] = msgspec.UNSET
+        IsSelfThread: Optional[bool] = msgspec.UNSET
+        SensitiveContent: Optional[bool] = msgspec.UNSET
+        Likes: Optional[int] = msgspec.UNSET
+        Replies: Optional[int] = msgspec.UNSET
+        Retweets: Optional[int] = msgspec.UNSET
+        Views: Optional[int] = msgspec.UNSET
+        HTML: msgspec.Raw = msgspec.UNSET
+        GIFs: msgspec.Raw = msgspec.UNSET
+        Photos: msgspec.Raw = msgspec.UNSET
+        Videos: msgspec.Raw = msgspec.UNSET
+        URLs: msgspec.Raw = msgspec.UNSET
+        Mentions: msgspec.Raw = msgspec.UNSET
+        Thread: msgspec.Raw = msgspec.UNSET
+        Place: msgspec.Raw = msgspec.UNSET
+        InReplyToStatus: msgspec.Raw = msgspec.UNSET
+        QuotedStatus: msgspec.Raw = msgspec.UNSET
+        RetweetedStatus: msgspec.Raw = msgspec.UNSET
+
+    class TweetResponseStruct(_MappingStruct):
+        """ProtocolTwitterTweetResponse as a typed struct."""
+
+        Tweet: TweetStruct = msgspec.UNSET
+        Error: msgspec.Raw = msgspec.UNSET
+
+    # The synapse fields around the response, decoded generically
+    _Envelope = msgspec.defstruct(
+        "_Envelope",
+        [
+            (name, Any, msgspec.UNSET)
+            for name in RecentTweetsSynapse.model_fields
+            if name != "response"
+        ]
+        + [("response", Optional[List[TweetResponseStruct]], msgspec.UNSET)],
+    )
+    _envelope_decoder = msgspec.json.Decoder(_Envelope)
+    MAPPING_TYPES = (dict, TweetStruct, TweetResponseStruct)
+else:
+    MAPPING_TYPES = (dict,)
+
+
+def decode_recent_tweets(body: bytes) -> Dict[str, Any]:
+    """
+    Decode a RecentTweetsSynapse response body into the dict the dendrite expects.
+
+    With msgspec installed the tweets become TweetResponseStruct objects; a body that
+    does not fit the typed shape (unknown fields, unexpected types) is decoded
+    generically instead, so the struct path never rejects a response the dict path
+    would accept.
+    """
+    if msgspec is not None:
+        try:
+            envelope = _envelope_decoder.decode(body)
+            return {
+                field: value
+                for field in envelope.__struct_fields__
+                if (value := getattr(envelope, field)) is not msgspec.UNSET
+            }
+        except msgspec.ValidationError:
+            pass
+    return loads(body)
+
+
+def to_builtins(tweet: Any) -> Any:
+    """A tweet response as plain dicts and lists, ready for any JSON encoder."""
+    if msgspec is not None and isinstance(tweet, _MappingStruct):
+        return msgspec.json.decode(msgspec.json.encode(tweet))
+    return tweet
+
+
+class DecodingClientResponse(aiohttp.ClientResponse):
+    """
+    Response class for the dendrite session that decodes RecentTweetsSynapse bodies
+    with decode_recent_tweets, and everything else with orjson when available.
+    """
+
+    async def json(self, *args, **kwargs) -> Any:
+        if self.status == 200 and self.url.path.endswith(
+            "/" + RecentTweetsSynapse.__name__
+        ):
+            return decode_recent_tweets(await self.read())
+        kwargs.setdefault("loads", loads)
+        return await super().json(*args, **kwargs)
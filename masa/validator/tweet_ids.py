@@ -0,0 +1,131 @@
+import collections
+import itertools
+from typing import Deque, Iterable, Iterator, Tuple
+
+import numpy as np
+
+
+def encode_tweet_ids(tweet_ids: Iterable) -> np.ndarray:
+    """Sorted, de-duplicated uint64 array of tweet IDs (decimal strings or ints)."""
+    if isinstance(tweet_ids, np.ndarray):
+        return np.unique(tweet_ids.astype(np.uint64, copy=False))
+    return np.unique(np.array(list(tweet_ids), dtype=np.uint64))
+
+
+class TweetIdSet:
+    """
+    Set of tweet IDs stored as one sorted uint64 array.
+
+    Tweet IDs are pure ASCII digits (see Forwarder.strict_tweet_id_validation), so each
+    fits in 8 bytes instead of a ~100 byte Python str inside a set. Membership and
+    difference are binary searches over the sorted array; iteration yields the IDs back
+    as strings so callers that serialize the set are unaffected.
+    """
+
+    __slots__ = ("ids",)
+
+    def __init__(self, tweet_ids: Iterable = ()):
+        self.ids = encode_tweet_ids(tweet_ids)
+
+    @classmethod
+    def from_sorted(cls, ids: np.ndarray) -> "TweetIdSet":
+        """Wrap an array that is already sorted and de-duplicated, without copying it."""
+        tweet_ids = cls.__new__(cls)
+        tweet_ids.ids = ids
+        return tweet_ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(tweet_id) for tweet_id in self.ids.tolist())
+
+    def __contains__(self, tweet_id) -> bool:
+        return bool(self._mask(encode_tweet_ids([tweet_id]))[0])
+
+    def __repr__(self) -> str:
+        return f"TweetIdSet({len(self)} ids)"
+
+    def _mask(self, candidates: np.ndarray) -> np.ndarray:
+        """Boolean mask of which sorted `candidates` are already in the set."""
+        if len(self.ids) == 0:
+            return np.zeros(len(candidates), dtype=bool)
+        positions = np.searchsorted(self.ids, candidates)
+        positions[positions == len(self.ids)] = 0
+        return self.ids[positions] == candidates
+
+    def difference(self, tweet_ids: Iterable) -> np.ndarray:
+        """IDs from `tweet_ids` not in the set, as a sorted uint64 array."""
+        candidates = encode_tweet_ids(tweet_ids)
+        return candidates[~self._mask(candidates)]
+
+    def update(self, tweet_ids: Iterable) -> np.ndarray:
+        """Add `tweet_ids` and return the ones that were not already present."""
+        new_ids = self.difference(tweet_ids)
+        if len(new_ids) == 0:
+            return new_ids
+        if len(self.ids) == 0 or new_ids[0] > self.ids[-1]:
+            # Fresh tweets are newer than everything stored, so usually just append
+            self.ids = np.concatenate([self.ids, new_ids])
+        else:
+            self.ids = np.insert(self.ids, np.searchsorted(self.ids, new_ids), new_ids)
+        return new_ids
+
+
+class TweetIdHistory:
+    """
+    A miner's seen tweet IDs over the last `retention_blocks` blocks.
+
+    IDs are kept as a ring of TweetIdSet segments, one per `segment_blocks` (a tempo by
+    default) in which they were first returned. New IDs only ever go into the newest,
+    small segment, so inserting never copies the whole history, and a segment is
+    dropped as a whole once it falls out of the retention window. Lookups check every
+    segment, of which there are retention_blocks / segment_blocks at most.
+    """
+
+    __slots__ = ("retention_blocks", "segment_blocks", "segments")
+
+    def __init__(self, retention_blocks: int = 50400, segment_blocks: int = 360):
+        self.retention_blocks = max(1, int(retention_blocks))
+        self.segment_blocks = max(1, int(segment_blocks))
+        # (first block of the segment, ids first returned in it), oldest first
+        self.segments: Deque[Tuple[int, TweetIdSet]] = collections.deque()
+
+    def __len__(self) -> int:
+        return sum(len(tweet_ids) for _, tweet_ids in self.segments)
+
+    def __iter__(self) -> Iterator[str]:
+        return itertools.chain.from_iterable(ids for _, ids in self.segments)
+
+    def __contains__(self, tweet_id) -> bool:
+        return any(tweet_id in tweet_ids for _, tweet_ids in self.segments)
+
+    def __repr__(self) -> str:
+        return f"TweetIdHistory({len(self)} ids in {len(self.segments)} segments)"
+
+    def difference(self, tweet_ids: Iterable) -> np.ndarray:
+        """IDs from `tweet_ids` not in the history, as a sorted uint64 array."""
+        candidates = encode_tweet_ids(tweet_ids)
+        for _, segment in self.segments:
+            if len(candidates) == 0:
+                break
+            candidates = candidates[~segment._mask(candidates)]
+        return candidates
+
+    def update(self, tweet_ids: Iterable, block: int) -> np.ndarray:
+        """Record `tweet_ids` as returned at `block` and return the ones not seen before."""
+        self.expire(block)
+        new_ids = self.difference(tweet_ids)
+        if len(new_ids) == 0:
+            return new_ids
+        start = block - block % self.segment_blocks
+        if not self.segments or start > self.segments[-1][0]:
+            self.segments.append((start, TweetIdSet()))
+        self.segments[-1][1].update(new_ids)
+        return new_ids
+
+    def expire(self, block: int):
+        """Drop every segment that ended more than `retention_blocks` before `block`."""
+        cutoff = block - self.retention_blocks
+        while self.segments and self.segments[0][0] + self.segment_blocks <= cutoff:
+            self.segments.popleft()
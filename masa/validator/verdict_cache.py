@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+import bittensor as bt
+
+# Tweet passed verification on technical errors alone, without upstream confirmation
+ERROR = "error"
+
+
+class VerdictCache:
+    """
+    Bounded LRU + TTL cache of upstream tweet existence verdicts.
+
+    Entries are keyed by tweet ID plus a hash of the fields the miner claims for it, so a
+    miner returning a real ID with altered text or author never reuses another miner's
+    "valid" verdict. Only definitive verdicts (valid / not_found) are cached by default;
+    technical errors are retried unless `error_ttl` is set.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 100000,
+        ttl: float = 86400,
+        error_ttl: float = 0,
+        path: Optional[str] = None,
+    ):
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.path = path
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def key(tweet: dict) -> str:
+        expected = json.dumps(
+            [
+                tweet.get("Name"),
+                tweet.get("Username"),
+                tweet.get("Text"),
+                tweet.get("Timestamp"),
+                tweet.get("Hashtags") or [],
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.blake2b(expected.encode(), digest_size=8).hexdigest()
+        return f"{tweet.get('ID')}:{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        verdict, expires_at = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return verdict
+
+    def put(self, key: str, verdict: str):
+        ttl = self.error_ttl if verdict == ERROR else self.ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (verdict, time.time() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def resolve(self, tweet: dict, verify: Callable[[], Awaitable[str]]) -> str:
+        """
+        Return the cached verdict for `tweet`, calling `verify()` only on a miss.
+
+        Concurrent lookups of the same tweet (e.g. several miners returning it in one
+        round) share a single upstream verification.
+        """
+        key = self.key(tweet)
+        while (inflight := self._inflight.get(key)) is not None:
+            await inflight.wait()
+
+        verdict = self.get(key)
+        if verdict is not None:
+            self.hits += 1
+            return verdict
+
+        self.misses += 1
+        done = self._inflight[key] = asyncio.Event()
+        try:
+            verdict = await verify()
+            self.put(key, verdict)
+            return verdict
+        finally:
+            self._inflight.pop(key, None)
+            done.set()
+
+    def metrics(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def load(self):
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+            now = time.time()
+            self._entries = OrderedDict(
+                (key, (verdict, expires_at))
+                for key, verdict, expires_at in entries
+                if expires_at >= now
+            )
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            bt.logging.info(f"Loaded {len(self._entries)} cached tweet verdicts")
+        except Exception as e:
+            bt.logging.warning(f"Failed to load tweet verdict cache: {e}")
+
+    async def save(self):
+        """Persist the cache atomically; the file write runs off the event loop."""
+        if not self.path:
+            return
+        # Snapshot on the loop so the worker thread never sees a mutating dict
+        snapshot = [
+            [key, verdict, exp] for key, (verdict, exp) in self._entries.items()
+        ]
+        try:
+            await asyncio.get_event_loop().run_in_executor(None, self._write, snapshot)
+        except Exception as e:
+            bt.logging.error(f"Failed to save tweet verdict cache: {e}")
+
+    def _write(self, snapshot: list):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple, Optional
+
+import requests
+
+VALID = "valid"
+NOT_FOUND = "not_found"
+TRANSIENT_ERROR = "transient_error"
+MISMATCH = "mismatch"
+
+
+class VerificationResult(NamedTuple):
+    outcome: str
+    status_code: Optional[int] = None
+    detail: str = ""
+
+
+class TweetVerificationAdapter:
+    """
+    Classifies masa-ai's tweet verification into a typed VerificationResult.
+
+    TweetValidator.validate_tweet returns only True or False and swallows the HTTP
+    errors behind it. The adapter registers a response hook on the validator's own
+    requests session and classifies a failure from the tweet lookup response it
+    recorded. A 404, or a 200 without the tweet in it, is NOT_FOUND. Any other
+    status, or no lookup response at all, is TRANSIENT_ERROR. A tweet that was
+    fetched but still failed is a MISMATCH of the claimed fields.
+
+    Each adapter owns its validator, so it must only be used from one thread at a time.
+    """
+
+    def __init__(self, tweet_validator: Any):
+        self.tweet_validator = tweet_validator
+        self._lookup: Optional[requests.Response] = None
+        tweet_validator.session.hooks["response"].append(self._record_response)
+
+    def _record_response(self, response: requests.Response, *args, **kwargs):
+        # The guest token is a POST; only the tweet lookup is a GET
+        if response.request is not None and response.request.method == "GET":
+            self._lookup = response
+
+    def verify(self, tweet: dict) -> VerificationResult:
+        """Check that `tweet` exists upstream with the name, text, time and tags claimed."""
+        self._lookup = None
+        try:
+            is_valid = self.tweet_validator.validate_tweet(
+                tweet_id=tweet.get("ID"),
+                expected_name=tweet.get("Name"),
+                expected_username=tweet.get("Username"),
+                expected_text=tweet.get("Text"),
+                expected_timestamp=tweet.get("Timestamp"),
+                expected_hashtags=tweet.get("Hashtags", []),
+            )
+        except requests.RequestException as e:
+            status = e.response.status_code if e.response is not None else None
+            outcome = NOT_FOUND if status == 404 else TRANSIENT_ERROR
+            return VerificationResult(outcome, status, str(e))
+
+        if is_valid:
+            return VerificationResult(VALID)
+        return self._classify_failure(self._lookup)
+
+    @staticmethod
+    def _classify_failure(lookup: Optional[requests.Response]) -> VerificationResult:
+        if lookup is None:
+            return VerificationResult(TRANSIENT_ERROR, None, "no tweet lookup response")
+
+        status = lookup.status_code
+        detail = f"{status} {lookup.reason or ''}".strip()
+        if status == 404:
+            return VerificationResult(NOT_FOUND, status, detail)
+        if not lookup.ok:
+            return VerificationResult(TRANSIENT_ERROR, status, detail)
+
+        try:
+            body = lookup.json()
+        except ValueError:
+            return VerificationResult(TRANSIENT_ERROR, status, "unreadable lookup body")
+        # A deleted or protected tweet comes back as a 200 without a result
+        result = ((body or {}).get("data") or {}).get("tweetResult") or {}
+        if not result.get("result"):
+            return VerificationResult(NOT_FOUND, status, "tweet missing from lookup")
+        return VerificationResult(MISMATCH, status, "claimed fields do not match")
+
+
+class VerificationService:
+    """
+    Runs blocking upstream tweet verification on a dedicated thread pool.
+
+    masa-ai's TweetValidator does synchronous network I/O, so calling it directly from a
+    coroutine stalls the whole validator event loop. This service hands each call to a
+    worker thread and awaits it, with a per-call timeout. Each worker lazily builds its
+    own validator through `validator_factory`, so validator instances are never shared
+    between threads.
+    """
+
+    def __init__(
+        self,
+        validator_factory: Callable[[], Any],
+        max_workers: int = 4,
+        timeout: float = 30.0,
+    ):
+        self.validator_factory = validator_factory
+        self.timeout = timeout
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)),
+            thread_name_prefix="tweet-verification",
+        )
+
+    def _thread_validator(self) -> Any:
+        validator = getattr(self._local, "validator", None)
+        if validator is None:
+            validator = self._local.validator = self.validator_factory()
+        return validator
+
+    def _invoke(self, fn: Callable[[Any], Any]) -> Any:
+        return fn(self._thread_validator())
+
+    async def run(
+        self, fn: Callable[[Any], Any], timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Call `fn(validator)` on a worker thread and await its result.
+
+        Raises asyncio.TimeoutError if the call takes longer than `timeout` seconds
+        (defaults to the service timeout). A call that is cancelled or times out before a
+        worker picks it up never runs; one already running is left to finish in its thread
+        and its result is discarded.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self._invoke, fn)
+        return await asyncio.wait_for(future, timeout or self.timeout)
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and drop any calls still queued."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,113 @@
+from typing import List, Tuple
+
+import numpy as np
+
+
+class VolumeWindow:
+    """
+    Miner volumes of the last `window` tempos, as a (window x uids) ring buffer.
+
+    Row `head` is the current tempo. Adding a volume is O(1) and also updates the
+    per-uid running totals. Starting a new tempo recycles the oldest row and
+    subtracts it from those totals, so a windowed sum is a read of `totals`, not a
+    re-aggregation. `present` records which uids reported in each tempo, even a
+    volume of 0, as the keys of the former {"tempo", "miners"} list did. The
+    columns grow with the metagraph.
+    """
+
+    def __init__(self, window: int, n_uids: int = 0):
+        self.window = window
+        self.volumes = np.zeros((window, n_uids), dtype=np.float64)
+        self.present = np.zeros((window, n_uids), dtype=bool)
+        # -1 marks a row that holds no tempo yet
+        self.tempos = np.full(window, -1, dtype=np.int64)
+        self.totals = np.zeros(n_uids, dtype=np.float64)
+        # Number of tempos in the window each uid reported in
+        self.counts = np.zeros(n_uids, dtype=np.int64)
+        self.head = -1
+
+    @property
+    def n_uids(self) -> int:
+        return self.volumes.shape[1]
+
+    def __len__(self) -> int:
+        """Number of tempos in the window."""
+        return int((self.tempos >= 0).sum())
+
+    def __repr__(self) -> str:
+        return f"VolumeWindow({len(self)}/{self.window} tempos, {self.n_uids} uids)"
+
+    def resize(self, n_uids: int):
+        """Grow to at least `n_uids` columns; uids are never dropped."""
+        if n_uids <= self.n_uids:
+            return
+        extra = n_uids - self.n_uids
+        self.volumes = np.pad(self.volumes, ((0, 0), (0, extra)))
+        self.present = np.pad(self.present, ((0, 0), (0, extra)))
+        self.totals = np.pad(self.totals, (0, extra))
+        self.counts = np.pad(self.counts, (0, extra))
+
+    def _advance(self, tempo: int):
+        self.head = (self.head + 1) % self.window
+        self.totals -= self.volumes[self.head]
+        self.counts -= self.present[self.head]
+        self.volumes[self.head] = 0
+        self.present[self.head] = False
+        self.tempos[self.head] = tempo
+
+    def add(self, uid: int, volume: float, tempo: int):
+        """Add `volume` to `uid` in `tempo`, which starts a new row if it is new."""
+        if self.head < 0 or self.tempos[self.head] != tempo:
+            self._advance(tempo)
+        if uid >= self.n_uids:
+            # Doubling keeps a run of new uids amortized O(1)
+            self.resize(max(uid + 1, 2 * self.n_uids))
+        self.volumes[self.head, uid] += volume
+        self.totals[uid] += volume
+        if not self.present[self.head, uid]:
+            self.present[self.head, uid] = True
+            self.counts[uid] += 1
+
+    def clear(self, uid: int):
+        """Zero the volumes of `uid` in the window, e.g. when its hotkey is replaced."""
+        if uid < self.n_uids:
+            self.volumes[:, uid] = 0
+            self.totals[uid] = 0
+
+    def window_totals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The uids that reported in the window, ascending, and their summed volumes."""
+        uids = np.flatnonzero(self.counts)
+        return uids, self.totals[uids]
+
+    def _rows(self) -> List[int]:
+        """Rows holding a tempo, oldest first."""
+        rows = [(self.head + 1 + i) % self.window for i in range(self.window)]
+        return [row for row in rows if self.tempos[row] >= 0]
+
+    def to_list(self) -> List[dict]:
+        """The window as [{"tempo": ..., "miners": {"<uid>": volume}}], oldest first."""
+        volumes = []
+        for row in self._rows():
+            uids = np.flatnonzero(self.present[row])
+            volumes.append(
+                {
+                    "tempo": int(self.tempos[row]),
+                    "miners": dict(
+                        zip(map(str, uids.tolist()), self.volumes[row, uids].tolist())
+                    ),
+                }
+            )
+        return volumes
+
+    @classmethod
+    def from_list(
+        cls, volumes: List[dict], window: int, n_uids: int = 0
+    ) -> "VolumeWindow":
+        """Build from the list form of `to_list()`, keeping its last `window` tempos."""
+        volume_window = cls(window, n_uids)
+        for volume in volumes[-window:]:
+            # Start the tempo even if no miner reported in it
+            volume_window._advance(int(volume["tempo"]))
+            for uid, value in volume["miners"].items():
+                volume_window.add(int(uid), value, int(volume["tempo"]))
+        return volume_window
@@ -0,0 +1,302 @@
+import datetime
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import bittensor as bt
+import numpy as np
+
+from masa.validator.checkpoint import atomic_write
+
+INDEX = "index.json"
+SEGMENT_SUFFIX = ".npz"
+COLUMNS = ("timestamps", "netuids", "hotkeys", "weights")
+
+
+def _day(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime(
+        "%Y-%m-%d"
+    )
+
+
+def _as_timestamp(value) -> Optional[float]:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return datetime.datetime.fromisoformat(str(value)).timestamp()
+
+
+class WeightsHistory:
+    """
+    History of the weights set on chain, as columnar segments plus a tail index.
+
+    Every entry is a row of four columns: timestamp, netuid, hotkey, and the weights of
+    every uid as one dense float64 row (uids not in the entry are 0), scaled as in
+    scores.log. Rows go to one .npz segment per UTC day; once a month is over its day
+    segments are compacted into one month segment, and segments older than
+    `retention_days` are deleted (0 keeps them all). The index, index.json, lists the
+    segments and points at the latest entry of each netuid, so `latest()` reads one
+    segment however long the history is. `query()` and `to_frame()` load a time range
+    for analysis.
+    """
+
+    def __init__(self, path: str, retention_days: int = 0):
+        self.path = path
+        self.retention_days = max(0, int(retention_days))
+        os.makedirs(self.path, exist_ok=True)
+        self._index = {"segments": [], "latest": {}}
+        if os.path.isfile(self._file(INDEX)):
+            with open(self._file(INDEX)) as f:
+                self._index = json.load(f)
+        # The segment being appended to, as columns of Python lists
+        self._tail_name: Optional[str] = None
+        self._tail: Dict[str, list] = {}
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _segment_file(self, segment: str) -> str:
+        return self._file(segment + SEGMENT_SUFFIX)
+
+    def _read_segment(self, segment: str) -> Dict[str, np.ndarray]:
+        with np.load(self._segment_file(segment), allow_pickle=False) as data:
+            return {column: data[column] for column in COLUMNS}
+
+    def _write_segment(self, segment: str, columns: Dict[str, np.ndarray]):
+        atomic_write(
+            self._segment_file(segment),
+            lambda f: np.savez(f, **columns),
+        )
+
+    def _write_index(self):
+        data = json.dumps(self._index).encode()
+        atomic_write(self._file(INDEX), lambda f: f.write(data))
+
+    @staticmethod
+    def _dense(rows: List[np.ndarray]) -> np.ndarray:
+        width = max((len(row) for row in rows), default=0)
+        weights = np.zeros((len(rows), width), dtype=np.float64)
+        for i, row in enumerate(rows):
+            weights[i, : len(row)] = row
+        return weights
+
+    def _open_tail(self, segment: str):
+        if self._tail_name == segment:
+            return
+        self._tail_name = segment
+        self._tail = {column: [] for column in COLUMNS}
+        if segment in self._index["segments"]:
+            # Restarted during the day
+            for column, values in self._read_segment(segment).items():
+                self._tail[column] = list(values)
+        else:
+            self._index["segments"].append(segment)
+            self._index["segments"].sort()
+
+    def extend(self, entries: Iterable[Tuple[float, int, str, Dict[int, float]]]):
+        """
+        Append entries of (timestamp, netuid, hotkey, {uid: weight}), oldest first,
+        writing each segment they touch and the index once.
+        """
+        dirty = False
+        for timestamp, netuid, hotkey, weights in entries:
+            segment = _day(timestamp)
+            if segment != self._tail_name:
+                if dirty:
+                    self._flush()
+                self._open_tail(segment)
+            row = np.zeros(max(weights, default=-1) + 1, dtype=np.float64)
+            for uid, weight in weights.items():
+                row[uid] = weight
+            self._tail["timestamps"].append(timestamp)
+            self._tail["netuids"].append(netuid)
+            self._tail["hotkeys"].append(hotkey)
+            self._tail["weights"].append(row)
+            self._index["latest"][str(netuid)] = {
+                "segment": segment,
+                "row": len(self._tail["timestamps"]) - 1,
+                "timestamp": timestamp,
+            }
+            dirty = True
+        if dirty:
+            self._flush()
+            self._write_index()
+            self.rotate()
+
+    def _flush(self):
+        self._write_segment(
+            self._tail_name,
+            {
+                "timestamps": np.array(self._tail["timestamps"], dtype=np.float64),
+                "netuids": np.array(self._tail["netuids"], dtype=np.int64),
+                "hotkeys": np.array(self._tail["hotkeys"], dtype=np.str_),
+                "weights": self._dense(self._tail["weights"]),
+            },
+        )
+
+    def append(
+        self,
+        netuid: int,
+        hotkey: str,
+        weights: Dict[int, float],
+        timestamp: Optional[float] = None,
+    ):
+        """Record the weights set for `netuid` now, or at `timestamp`."""
+        timestamp = time.time() if timestamp is None else timestamp
+        self.extend([(timestamp, netuid, hotkey, weights)])
+
+    def latest(self, netuid: int) -> Optional[dict]:
+        """The latest entry for `netuid`, as {timestamp, hotkey, weights}, or None."""
+        pointer = self._index["latest"].get(str(netuid))
+        if pointer is None:
+            return None
+        if pointer["segment"] == self._tail_name:
+            row = self._tail["weights"][pointer["row"]]
+            hotkey = self._tail["hotkeys"][pointer["row"]]
+        else:
+            segment = self._read_segment(pointer["segment"])
+            row = segment["weights"][pointer["row"]]
+            hotkey = segment["hotkeys"][pointer["row"]]
+        return {
+            "timestamp": pointer["timestamp"],
+            "hotkey": str(hotkey),
+            "weights": np.array(row),
+        }
+
+    def rotate(self, now: Optional[float] = None):
+        """Compact the day segments of past months and drop expired segments."""
+        now = time.time() if now is None else now
+        month = _day(now)[:7]
+        for past in sorted(
+            {s[:7] for s in self._index["segments"] if len(s) == 10 and s[:7] < month}
+        ):
+            self._compact(past)
+        if self.retention_days:
+            cutoff = _day(now - self.retention_days * 86400)
+            for segment in list(self._index["segments"]):
+                # A month segment ends on the last day of its month
+                last_day = segment if len(segment) == 10 else segment + "-31"
+                if last_day < cutoff:
+                    self._drop(segment)
+
+    def _compact(self, month: str):
+        # The month's segment, if an older entry already made one, then its days
+        segments = [s for s in self._index["segments"] if s[:7] == month]
+        parts = [self._read_segment(segment) for segment in segments]
+        columns = {
+            column: np.concatenate([part[column] for part in parts])
+            for column in ("timestamps", "netuids", "hotkeys")
+        }
+        columns["weights"] = self._dense(
+            [row for part in parts for row in part["weights"]]
+        )
+        self._write_segment(month, columns)
+
+        offsets, offset = {}, 0
+        for segment, part in zip(segments, parts):
+            offsets[segment] = offset
+            offset += len(part["timestamps"])
+        for pointer in self._index["latest"].values():
+            if pointer["segment"] in offsets:
+                pointer["row"] += offsets[pointer["segment"]]
+                pointer["segment"] = month
+        days = [segment for segment in segments if segment != month]
+        self._index["segments"] = sorted(
+            [s for s in self._index["segments"] if s[:7] != month] + [month]
+        )
+        self._write_index()
+        for day in days:
+            os.remove(self._segment_file(day))
+        if self._tail_name in segments:
+            self._tail_name, self._tail = None, {}
+        bt.logging.debug(f"Compacted {len(days)} weights history segments into {month}")
+
+    def _drop(self, segment: str):
+        self._index["segments"].remove(segment)
+        self._index["latest"] = {
+            netuid: pointer
+            for netuid, pointer in self._index["latest"].items()
+            if pointer["segment"] != segment
+        }
+        self._write_index()
+        os.remove(self._segment_file(segment))
+        if self._tail_name == segment:
+            self._tail_name, self._tail = None, {}
+
+    def query(self, netuid: Optional[int] = None, start=None, end=None) -> dict:
+        """
+        Entries between `start` and `end` (datetimes, ISO strings or unix timestamps,
+        both optional) for `netuid` (every netuid if None), as columns: timestamps,
+        netuids, hotkeys and a dense (entries x uids) weights matrix, oldest first.
+        """
+        start, end = _as_timestamp(start), _as_timestamp(end)
+        parts = []
+        for segment in self._index["segments"]:
+            # Segment names are dates, so skip those wholly outside the range
+            if start is not None and segment < _day(start)[: len(segment)]:
+                continue
+            if end is not None and segment[:10] > _day(end):
+                continue
+            part = self._read_segment(segment)
+            mask = np.ones(len(part["timestamps"]), dtype=bool)
+            if netuid is not None:
+                mask &= part["netuids"] == netuid
+            if start is not None:
+                mask &= part["timestamps"] >= start
+            if end is not None:
+                mask &= part["timestamps"] <= end
+            parts.append({column: values[mask] for column, values in part.items()})
+
+        columns = {
+            "timestamps": np.zeros(0, dtype=np.float64),
+            "netuids": np.zeros(0, dtype=np.int64),
+            "hotkeys": np.zeros(0, dtype=np.str_),
+        }
+        for column in columns:
+            if parts:
+                columns[column] = np.concatenate([part[column] for part in parts])
+        columns["weights"] = self._dense(
+            [row for part in parts for row in part["weights"]]
+        )
+        return columns
+
+    def to_frame(self, netuid: Optional[int] = None, start=None, end=None):
+        """`query()` as a pandas DataFrame: one row per entry, one column per uid."""
+        import pandas as pd
+
+        columns = self.query(netuid, start, end)
+        frame = pd.DataFrame(
+            columns["weights"],
+            index=pd.to_datetime(columns["timestamps"], unit="s", utc=True),
+        )
+        frame.index.name = "timestamp"
+        frame.columns.name = "uid"
+        return frame
+
+    def import_log(self, log_path: str) -> int:
+        """
+        One-shot import of a scores.log of JSON lines: append its entries and rename it
+        to scores.log.imported. Returns the number of entries imported.
+        """
+        entries = []
+        with open(log_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    # Written in local time by set_weights
+                    timestamp = datetime.datetime.strptime(
+                        entry["timestamp"], "%Y-%m-%d %H:%M:%S.%f"
+                    ).timestamp()
+                    weights = {w["uid"]: w["weight"] for w in entry["weights"]}
+                    entries.append(
+                        (timestamp, entry["netuid"], entry.get("hotkey", ""), weights)
+                    )
+                except (ValueError, KeyError, TypeError):
+                    continue
+        entries.sort(key=lambda entry: entry[0])
+        self.extend(entries)
+        os.replace(log_path, log_path + ".imported")
+        bt.logging.success(f"Imported {len(entries)} entries from {log_path}")
+        return len(entries)
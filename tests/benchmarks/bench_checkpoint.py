@@ -0,0 +1,128 @@
+"""
+Benchmark saving validator state as the tweet history grows.
+
+For each history size in --ids-per-uid, fills --uids miner histories spread over
+--segments tempo segments, then times a scoring pass' save: one round adds --batch
+new IDs per miner and changes the scores, step and volumes. Compares the full
+torch.save of the state dict into state.pt with the Checkpointer, which writes only
+the components and the history segment that changed, and with the SQLiteStateStore,
+which writes only the changed rows. Reports save time and bytes written per round.
+
+Usage:
+    python -m tests.benchmarks.bench_checkpoint --ids-per-uid 1000 10000 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import torch
+
+from masa.validator.checkpoint import Checkpointer
+from masa.validator.state_store import SQLiteStateStore
+from masa.validator.tweet_ids import TweetIdHistory
+
+FIRST_TWEET_ID = 1_800_000_000_000_000_000
+SEGMENT_BLOCKS = 360
+
+
+def make_state(uids: int, ids_per_uid: int, segments: int) -> dict:
+    rng = np.random.default_rng(0)
+    tweets_by_uid = {}
+    for uid in range(uids):
+        history = TweetIdHistory(
+            retention_blocks=segments * SEGMENT_BLOCKS, segment_blocks=SEGMENT_BLOCKS
+        )
+        ids = FIRST_TWEET_ID + rng.integers(0, 10**17, ids_per_uid, dtype=np.uint64)
+        for segment, chunk in enumerate(np.array_split(np.sort(ids), segments)):
+            history.update(chunk, segment * SEGMENT_BLOCKS)
+        tweets_by_uid[uid] = history
+    return {
+        "step": 0,
+        "scores": torch.rand(uids),
+        "hotkeys": [f"hotkey-{uid}" for uid in range(uids)],
+        "volumes": [
+            {"tempo": tempo, "miners": {str(uid): 100 for uid in range(uids)}}
+            for tempo in range(6)
+        ],
+        "tweets_by_uid": tweets_by_uid,
+    }
+
+
+def next_round(state: dict, batch: int, block: int):
+    state["step"] += 1
+    state["scores"] = state["scores"] * 0.9 + 0.01
+    state["volumes"][-1]["miners"]["0"] += batch
+    # Fresh IDs, newer than anything stored
+    first = (
+        FIRST_TWEET_ID + 10**17 + state["step"] * len(state["tweets_by_uid"]) * batch
+    )
+    for uid, history in state["tweets_by_uid"].items():
+        start = first + uid * batch
+        history.update(np.arange(start, start + batch, dtype=np.uint64), block)
+
+
+def save_legacy(state: dict, path: str) -> int:
+    torch.save(state, path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--uids", type=int, default=256)
+    parser.add_argument(
+        "--ids-per-uid", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    parser.add_argument("--segments", type=int, default=140)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.uids} miners, {args.segments} segments, {args.batch} new ids/round")
+    print(
+        f"{'ids/uid':>9} {'state.pt':>10} {'written':>10} "
+        f"{'checkpoint':>11} {'written':>10} {'first':>8} {'sqlite':>9}"
+    )
+    for ids_per_uid in args.ids_per_uid:
+        state = make_state(args.uids, ids_per_uid, args.segments)
+        block = args.segments * SEGMENT_BLOCKS
+        with tempfile.TemporaryDirectory() as path:
+            checkpointer = Checkpointer(os.path.join(path, "checkpoint"), interval=0)
+            start = time.perf_counter()
+            checkpointer.write(checkpointer.prepare(state, force=True))
+            first = time.perf_counter() - start
+            store = SQLiteStateStore(os.path.join(path, "state.db"), interval=0)
+            store.write(store.prepare(state, force=True))
+
+            legacy_time = legacy_bytes = checkpoint_time = checkpoint_bytes = 0
+            sqlite_time = 0
+            for _ in range(args.rounds):
+                next_round(state, args.batch, block)
+                start = time.perf_counter()
+                legacy_bytes += save_legacy(state, os.path.join(path, "state.pt"))
+                legacy_time += time.perf_counter() - start
+
+                start = time.perf_counter()
+                checkpoint_bytes += checkpointer.write(checkpointer.prepare(state))
+                checkpoint_time += time.perf_counter() - start
+
+                start = time.perf_counter()
+                store.write(store.prepare(state))
+                sqlite_time += time.perf_counter() - start
+            store.close()
+
+        rounds = args.rounds
+        print(
+            f"{ids_per_uid:>9,} {legacy_time / rounds * 1e3:>8.1f}ms "
+            f"{legacy_bytes / rounds / 2**20:>8.1f}MB "
+            f"{checkpoint_time / rounds * 1e3:>9.1f}ms "
+            f"{checkpoint_bytes / rounds / 2**20:>8.2f}MB {first * 1e3:>6.0f}ms "
+            f"{sqlite_time / rounds * 1e3:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark decoding RecentTweetsSynapse responses for a synthetic round.
+
+Builds --miners response bodies of --tweets realistic tweets each (HTML, media, a
+quoted status, mentions and URLs included) and runs each through what the dendrite
+does with a body: decode it, build the server synapse, copy its fields onto the local
+synapse, record its headers and deserialize. Compares the stock json decoder, orjson,
+and the typed struct decoder from tweet_decoder, keeping every miner's tweets alive
+until the end as a round does. Reports wall-clock time, and peak traced memory from a
+second, traced run.
+
+Usage:
+    python -m tests.benchmarks.bench_decode --miners 20 --tweets 1000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import bittensor as bt
+
+from masa.synapses import RecentTweetsSynapse
+from masa.validator.tweet_decoder import decode_recent_tweets, msgspec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FIRST_TWEET_ID = 1_800_000_000_000_000_000
+
+
+def make_tweet(i: int) -> dict:
+    tweet_id = str(FIRST_TWEET_ID + i)
+    text = f"Breaking: bitcoin ETF flows hit a new record today #{i} " * 3
+    quoted = {
+        "ID": str(FIRST_TWEET_ID - i),
+        "Text": "Earlier take on the ETF approval, with a long thread below " * 4,
+        "Username": f"quoted{i}",
+        "Name": "Quoted Account",
+        "Timestamp": 1_760_000_000 - i,
+        "Photos": [f"https://pbs.twimg.com/media/q{i}.jpg"],
+        "Hashtags": ["bitcoin", "etf"],
+    }
+    return {
+        "Tweet": {
+            "ConversationID": tweet_id,
+            "GIFs": [],
+            "Hashtags": ["bitcoin", "etf", "crypto"],
+            "HTML": f"<p>{text}</p><a href='https://t.co/{i}'>https://t.co/{i}</a>",
+            "ID": tweet_id,
+            "InReplyToStatus": None,
+            "InReplyToStatusID": "",
+            "IsQuoted": True,
+            "IsPin": False,
+            "IsReply": False,
+            "IsRetweet": False,
+            "IsSelfThread": False,
+            "Likes": i % 1000,
+            "Mentions": [{"ID": "42", "Username": "masa", "Name": "Masa"}],
+            "Name": "Bench Account",
+            "PermanentURL": f"https://x.com/bench/status/{tweet_id}",
+            "Photos": [f"https://pbs.twimg.com/media/{i}-{n}.jpg" for n in range(2)],
+            "Place": None,
+            "QuotedStatus": quoted,
+            "QuotedStatusID": quoted["ID"],
+            "Replies": i % 50,
+            "Retweets": i % 200,
+            "RetweetedStatus": None,
+            "RetweetedStatusID": "",
+            "Text": text,
+            "Thread": [],
+            "TimeParsed": "",
+            "Timestamp": 1_760_000_000 + i,
+            "URLs": [f"https://example.com/article/{i}"],
+            "UserID": "123456789",
+            "Username": "bench",
+            "Videos": [],
+            "Views": i * 10,
+            "SensitiveContent": False,
+        }
+    }
+
+
+def make_body(miner: int, tweets: int) -> bytes:
+    synapse = {
+        "name": "RecentTweetsSynapse",
+        "timeout": 60,
+        "query": '"bitcoin etf"',
+        "axon": {"status_code": 200, "status_message": "Success"},
+        "response": [make_tweet(miner * tweets + i) for i in range(tweets)],
+    }
+    return json.dumps(synapse).encode()
+
+
+def receive(body: bytes, loads) -> list:
+    """What dendrite.call does with a 200 response body."""
+    local = RecentTweetsSynapse(query='"bitcoin etf"')
+    server = RecentTweetsSynapse(**loads(body))
+    for key in local.model_dump().keys():
+        try:
+            setattr(local, key, getattr(server, key))
+        except Exception:
+            pass
+    bt.Synapse.from_headers(local.to_headers())
+    return local.deserialize()
+
+
+def run(bodies: list, loads) -> tuple:
+    # Timed without tracing, which slows every allocation down
+    gc.collect()
+    start = time.perf_counter()
+    responses = [receive(body, loads) for body in bodies]
+    elapsed = time.perf_counter() - start
+    del responses
+
+    gc.collect()
+    tracemalloc.start()
+    responses = [receive(body, loads) for body in bodies]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Every miner's tweets decoded, and held until the peak was read
+    assert len(responses) == len(bodies) and all(responses)
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--miners", type=int, default=20)
+    parser.add_argument("--tweets", type=int, default=1000)
+    args = parser.parse_args()
+
+    bodies = [make_body(miner, args.tweets) for miner in range(args.miners)]
+    decoders = {"json": json.loads}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    if msgspec is not None:
+        decoders["structs"] = decode_recent_tweets
+
+    size = sum(len(body) for body in bodies)
+    print(f"{args.miners} miners x {args.tweets} tweets, {size / 2**20:.1f}MB of JSON")
+    print(f"{'':>10} {'time':>10} {'peak':>10}")
+    for name, loads in decoders.items():
+        elapsed, peak = run(bodies, loads)
+        print(f"{name:>10} {elapsed * 1000:>8.0f}ms {peak / 2**20:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
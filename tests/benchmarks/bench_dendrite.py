@@ -0,0 +1,133 @@
+"""
+Benchmark per-round connection setup: a fresh dendrite per round vs the pooled dendrite.
+
+Starts --miners local aiohttp servers that answer PingAxonSynapse like a miner axon, then
+runs --rounds query rounds against all of them both ways. For each mode it reports the
+mean round wall-clock and how many new TCP connections the miners saw per round.
+Everything runs on localhost, so the timings (dominated by synapse header serialization)
+understate what a fresh TCP (and TLS) handshake costs against remote miners; the
+connection counts are what carry over. The external IP lookup a new dendrite performs
+is stubbed out and not included.
+
+Usage:
+    python -m tests.benchmarks.bench_dendrite --miners 32 --rounds 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import bittensor as bt
+from aiohttp import web
+from bittensor.core import dendrite as dendrite_module
+
+from masa.synapses import PingAxonSynapse
+from masa.validator.dendrite_pool import DendritePool
+
+PING = PingAxonSynapse(sent_from="127.0.0.1", is_active=False, version=0)
+
+
+class FakeMiners:
+    """Local axons that answer every ping and record the client connections they see."""
+
+    def __init__(self, count: int, base_port: int):
+        self.count = count
+        self.base_port = base_port
+        self.peers = set()
+        self.runners = []
+
+    async def handle_ping(self, request: web.Request) -> web.Response:
+        self.peers.add((request.url.port, request.transport.get_extra_info("peername")))
+        body = await request.json()
+        body["version"] = 1
+        return web.json_response(body)
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/PingAxonSynapse", self.handle_ping)
+        for port in range(self.base_port, self.base_port + self.count):
+            runner = web.AppRunner(app, keepalive_timeout=75)
+            await runner.setup()
+            await web.TCPSite(runner, "127.0.0.1", port).start()
+            self.runners.append(runner)
+
+    async def stop(self):
+        for runner in self.runners:
+            await runner.cleanup()
+
+    def axons(self, hotkey: str) -> list:
+        return [
+            bt.AxonInfo(
+                version=1,
+                ip="127.0.0.1",
+                port=port,
+                ip_type=4,
+                hotkey=hotkey,
+                coldkey=hotkey,
+            )
+            for port in range(self.base_port, self.base_port + self.count)
+        ]
+
+
+async def fresh_round(keypair, axons: list, timeout: float):
+    async with bt.dendrite(wallet=keypair) as dendrite:
+        return await dendrite(axons, PING, deserialize=False, timeout=timeout)
+
+
+async def pooled_round(pool: DendritePool, axons: list, timeout: float):
+    return await pool.dendrite(axons, PING, deserialize=False, timeout=timeout)
+
+
+async def measure(miners: FakeMiners, rounds: int, run_round) -> tuple:
+    durations, new_connections = [], []
+    for _ in range(rounds):
+        seen = len(miners.peers)
+        start = time.perf_counter()
+        responses = await run_round()
+        durations.append(time.perf_counter() - start)
+        new_connections.append(len(miners.peers) - seen)
+        assert all(r.version == 1 for r in responses), "a fake miner did not answer"
+    return statistics.mean(durations), statistics.mean(new_connections)
+
+
+async def run(args):
+    keypair = bt.Keypair.create_from_mnemonic(bt.Keypair.generate_mnemonic())
+    miners = FakeMiners(args.miners, args.base_port)
+    await miners.start()
+    axons = miners.axons(keypair.ss58_address)
+    try:
+        fresh = await measure(
+            miners, args.rounds, lambda: fresh_round(keypair, axons, args.timeout)
+        )
+        pool = DendritePool(keypair, limit_per_host=args.connections_per_miner)
+        pooled = await measure(
+            miners, args.rounds, lambda: pooled_round(pool, axons, args.timeout)
+        )
+        await pool.close()
+    finally:
+        await miners.stop()
+
+    print(f"{'mode':>8} {'round':>10} {'new conns/round':>16}")
+    for name, (duration, connections) in (("fresh", fresh), ("pooled", pooled)):
+        print(f"{name:>8} {duration * 1000:>8.1f}ms {connections:>16.1f}")
+    print(f"pool metrics: {pool.metrics()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--miners", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--connections-per-miner", type=int, default=4)
+    parser.add_argument("--base-port", type=int, default=18000)
+    args = parser.parse_args()
+
+    # A new dendrite looks up the validator's external IP; keep the network out of it
+    dendrite_module.networking.get_external_ip = lambda: "127.0.0.1"
+    bt.logging.off()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark export request bodies: bytes on the wire and CPU per exported tweet.
+
+Encodes --batches requests of --tweets realistic tweets each (see bench_decode) the way
+aiohttp's json= did (json.dumps of the whole payload), and with PayloadEncoder's
+streamed orjson body, uncompressed, gzip and zstd (if zstandard is installed). Reports
+body size, CPU time per tweet, and the peak memory traced while encoding a batch.
+
+Usage:
+    python -m tests.benchmarks.bench_export --batches 20 --tweets 1000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from masa.validator.export_encoding import PayloadEncoder, zstandard
+from tests.benchmarks.bench_decode import make_tweet
+
+
+def encode_json(hotkey: str, query: str, tweets: list) -> list:
+    return [json.dumps({"Hotkey": hotkey, "Query": query, "Tweets": tweets}).encode()]
+
+
+def measure(encode, batches: list) -> tuple:
+    start = time.process_time()
+    size = sum(len(chunk) for batch in batches for chunk in encode(*batch))
+    cpu = time.process_time() - start
+
+    tracemalloc.start()
+    for chunk in encode(*batches[0]):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, cpu, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--tweets", type=int, default=1000)
+    args = parser.parse_args()
+
+    batches = [
+        (
+            "hotkey",
+            "bitcoin etf",
+            [make_tweet(b * args.tweets + i) for i in range(args.tweets)],
+        )
+        for b in range(args.batches)
+    ]
+    encoders = {"json=": encode_json}
+    for content_encoding in ("identity", "gzip", "zstd"):
+        if content_encoding == "zstd" and zstandard is None:
+            continue
+        encoders[f"stream {content_encoding}"] = PayloadEncoder(content_encoding).chunks
+
+    total = args.batches * args.tweets
+    print(f"{args.batches} batches x {args.tweets} tweets")
+    print(
+        f"{'':>16} {'wire':>10} {'bytes/tweet':>12} {'cpu/tweet':>10} {'peak/batch':>11}"
+    )
+    for name, encode in encoders.items():
+        size, cpu, peak = measure(encode, batches)
+        print(
+            f"{name:>16} {size / 2**20:>8.1f}MB {size / total:>12,.0f} "
+            f"{cpu / total * 1e6:>8.1f}us {peak / 2**20:>9.2f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark scoring miner volumes.
+
+Compares the rewards of --uids miners computed one uid at a time, through
+`kurtosis_based_score` and `stats.norm.cdf` as score_miner_volumes used to, with
+`Scorer.volume_rewards`, which computes them in one ndtr call. Also times a whole
+score_miner_volumes call, with update_scores stubbed out.
+
+Usage:
+    python -m tests.benchmarks.bench_scoring --uids 256 4096
+"""
+
+import argparse
+import asyncio
+import time
+
+import bittensor as bt
+import numpy as np
+
+from masa.validator.scorer import Scorer
+from tests.test_scorer import make_validator, reference_rewards
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--uids", type=int, nargs="+", default=[256, 4096])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    bt.logging.off()
+
+    print(f"{'uids':>6} {'per uid':>10} {'vectorized':>11} {'score_miner_volumes':>20}")
+    for n in args.uids:
+        rng = np.random.default_rng(0)
+        miner_volumes = dict(enumerate(rng.integers(0, 10**4, n).astype(float)))
+        volumes = np.array(list(miner_volumes.values()))
+        scorer = Scorer(None)
+
+        per_uid = timed(
+            lambda: reference_rewards(scorer, miner_volumes, n), args.repeat
+        )
+        vectorized = timed(lambda: scorer.volume_rewards(volumes), args.repeat)
+
+        validator, _ = make_validator(miner_volumes, n)
+        scorer = Scorer(validator)
+        loop = asyncio.new_event_loop()
+        whole = timed(
+            lambda: loop.run_until_complete(scorer.score_miner_volumes(0)), args.repeat
+        )
+        loop.close()
+        print(
+            f"{n:>6} {per_uid * 1e3:>8.2f}ms {vectorized * 1e3:>9.3f}ms "
+            f"{whole * 1e3:>18.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
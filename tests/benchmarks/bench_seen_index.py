@@ -0,0 +1,95 @@
+"""
+Benchmark the subnet-wide SeenTweetIndex at 10M+ tweet IDs.
+
+Claims --ids tweet IDs in batches of --batch (as miners' responses would arrive, spread
+over 256 uids and increasing blocks), then looks them up again mixed with unseen IDs.
+Reports table memory, claim and lookup throughput, and the same for a plain Python
+dict {id: (uid, block)} unless --skip-dict is given (it needs several GB at 10M IDs).
+
+Usage:
+    python -m tests.benchmarks.bench_seen_index --ids 10000000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from masa.validator.seen_index import SeenTweetIndex
+
+FIRST_TWEET_ID = 1_800_000_000_000_000_000
+
+
+def bench_index(batches: list, probes: list, max_ids: int) -> dict:
+    index = SeenTweetIndex(max_ids=max_ids)
+    start = time.perf_counter()
+    for block, batch in enumerate(batches):
+        index.claim(batch, block % 256, block)
+    claim_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for probe in probes:
+        index.lookup(probe)
+    lookup_time = time.perf_counter() - start
+    return {
+        "memory": index.nbytes(),
+        "claim": claim_time,
+        "lookup": lookup_time,
+        "size": len(index),
+    }
+
+
+def bench_dict(batches: list, probes: list) -> dict:
+    tracemalloc.start()
+    seen = {}
+    start = time.perf_counter()
+    for block, batch in enumerate(batches):
+        uid = block % 256
+        for tweet_id in batch.tolist():
+            seen.setdefault(tweet_id, (uid, block))
+    claim_time = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for probe in probes:
+        [seen.get(tweet_id) for tweet_id in probe.tolist()]
+    lookup_time = time.perf_counter() - start
+    return {"memory": memory, "claim": claim_time, "lookup": lookup_time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ids", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--skip-dict", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ids = FIRST_TWEET_ID + rng.choice(10**17, args.ids, replace=False).astype(
+        np.uint64
+    )
+    batches = np.array_split(ids, max(1, args.ids // args.batch))
+    # Half of every probe batch was seen before, half never was
+    unseen = FIRST_TWEET_ID + np.uint64(10**17) + np.arange(args.ids, dtype=np.uint64)
+    probes = [
+        np.concatenate([batch[: len(batch) // 2], unseen[i : i + len(batch) // 2]])
+        for i, batch in zip(range(0, args.ids, args.batch), batches)
+    ]
+
+    results = {"SeenTweetIndex": bench_index(batches, probes, max_ids=args.ids)}
+    if not args.skip_dict:
+        results["dict"] = bench_dict(batches, probes)
+
+    print(f"{args.ids:,} ids in batches of {args.batch}")
+    print(f"{'':>16} {'memory':>10} {'claim/s':>14} {'lookup/s':>14}")
+    for name, result in results.items():
+        print(
+            f"{name:>16} {result['memory'] / 2**20:>8.0f}MB "
+            f"{args.ids / result['claim']:>14,.0f} {args.ids / result['lookup']:>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark validator startup to the end of its first scoring round.
+
+Saves one state of --uids miner histories of --ids-per-uid IDs each (see
+bench_checkpoint) both as a pickled state.pt and as a checkpoint, then, in a fresh
+child process per format, loads it and runs a first round: --sample miners each
+return --batch IDs, half of them already seen, which are checked against and added
+to their history. Reports time to load, time to the end of the first round, and the
+peak resident memory the child added (read from /proc, so Linux only). Both formats
+are read from the page cache, as on a restart.
+
+Usage:
+    python -m tests.benchmarks.bench_startup --ids-per-uid 100000
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+import torch
+
+from masa.validator.checkpoint import Checkpointer
+from masa.validator.tweet_ids import TweetIdHistory
+from tests.benchmarks.bench_checkpoint import SEGMENT_BLOCKS, make_state
+
+
+def first_round(tweets_by_uid: dict, sample: int, batch: int, block: int):
+    rng = np.random.default_rng(1)
+    for uid in rng.choice(list(tweets_by_uid), sample, replace=False).tolist():
+        history = tweets_by_uid[uid]
+        seen = history.segments[-1][1].ids[: batch // 2]
+        fresh = 2 * 10**18 + rng.integers(
+            0, 10**17, batch - len(seen), dtype=np.uint64
+        )
+        history.update(np.concatenate([seen, fresh]), block)
+
+
+def load(name: str, path: str, args) -> dict:
+    if name == "state.pt":
+        state = torch.load(os.path.join(path, "state.pt"), weights_only=False)
+        return state["tweets_by_uid"]
+
+    def new_history():
+        return TweetIdHistory(
+            retention_blocks=args.segments * SEGMENT_BLOCKS,
+            segment_blocks=SEGMENT_BLOCKS,
+        )
+
+    checkpointer = Checkpointer(os.path.join(path, "checkpoint"))
+    return checkpointer.load(new_history, mmap=name == "checkpoint mmap")[
+        "tweets_by_uid"
+    ]
+
+
+def memory_status(field: str) -> int:
+    """VmRSS, VmHWM (peak resident memory), ... of this process in bytes."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def run(name: str, path: str, args, results):
+    rss = memory_status("VmRSS")
+    start = time.perf_counter()
+    tweets_by_uid = load(name, path, args)
+    loaded = time.perf_counter() - start
+    first_round(tweets_by_uid, args.sample, args.batch, args.segments * SEGMENT_BLOCKS)
+    total = time.perf_counter() - start
+    results.put((loaded, total, memory_status("VmHWM") - rss))
+
+
+def measure(name: str, path: str, args) -> tuple:
+    # A fresh interpreter, so nothing of the parent's state is resident
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    child = context.Process(target=run, args=(name, path, args, results))
+    child.start()
+    result = results.get()
+    child.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--uids", type=int, default=256)
+    parser.add_argument("--ids-per-uid", type=int, default=100000)
+    parser.add_argument("--segments", type=int, default=140)
+    parser.add_argument("--sample", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        state = make_state(args.uids, args.ids_per_uid, args.segments)
+        torch.save(state, os.path.join(path, "state.pt"))
+        checkpointer = Checkpointer(os.path.join(path, "checkpoint"))
+        checkpointer.write(checkpointer.prepare(state, force=True))
+        del state
+
+        print(
+            f"{args.uids} miners x {args.ids_per_uid:,} ids, {args.segments} segments"
+        )
+        print(f"{'':>16} {'load':>9} {'first round':>12} {'peak rss':>10}")
+        for name in ("state.pt", "checkpoint", "checkpoint mmap"):
+            loaded, total, added = measure(name, path, args)
+            print(
+                f"{name:>16} {loaded * 1e3:>7.0f}ms {total * 1e3:>10.0f}ms "
+                f"{added / 2**20:>8.0f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
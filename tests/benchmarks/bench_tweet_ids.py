@@ -0,0 +1,95 @@
+"""
+Benchmark tweets_by_uid storage: Python sets of ID strings vs TweetIdSet (uint64 arrays).
+
+Fills --uids stores with --ids-per-uid realistic 19-digit tweet IDs each, then measures
+resident memory of the stores including the ID strings (tracemalloc), the time to
+compute `new - existing` for a batch of --batch IDs per uid (half already seen, half
+newer than anything stored, as fresh tweets are), the time to add that batch, and the
+pickled size that torch.save (protocol 2) writes into state.pt.
+
+Usage:
+    python -m tests.benchmarks.bench_tweet_ids --uids 256 --ids-per-uid 100000
+"""
+
+import argparse
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+
+from masa.validator.tweet_ids import TweetIdSet
+
+FIRST_TWEET_ID = 1_800_000_000_000_000_000
+
+
+def make_ids(rng: np.random.Generator, count: int, offset: int = 0) -> list:
+    return [str(i) for i in FIRST_TWEET_ID + offset + rng.integers(0, 10**17, count)]
+
+
+def build(factory, id_lists: list) -> tuple:
+    tracemalloc.start()
+    # Copy the strings inside the trace so a set is charged for the ones it holds
+    stores = {
+        uid: factory("".join(tweet_id) for tweet_id in ids)
+        for uid, ids in enumerate(id_lists)
+    }
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return stores, size
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--uids", type=int, default=256)
+    parser.add_argument("--ids-per-uid", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    id_lists = [make_ids(rng, args.ids_per_uid) for _ in range(args.uids)]
+    batches = [
+        ids[: args.batch // 2]
+        + make_ids(rng, args.batch - args.batch // 2, offset=10**17)
+        for ids in id_lists
+    ]
+
+    sets, set_memory = build(set, id_lists)
+    arrays, array_memory = build(TweetIdSet, id_lists)
+
+    set_diff = timed(
+        lambda: [set(batch) - sets[uid] for uid, batch in enumerate(batches)]
+    )
+    array_diff = timed(
+        lambda: [arrays[uid].difference(batch) for uid, batch in enumerate(batches)]
+    )
+    set_update = timed(lambda: [sets[uid].update(b) for uid, b in enumerate(batches)])
+    array_update = timed(
+        lambda: [arrays[uid].update(b) for uid, b in enumerate(batches)]
+    )
+    set_pickle = len(pickle.dumps(sets, protocol=2))
+    array_pickle = len(pickle.dumps(arrays, protocol=2))
+
+    total = args.uids * args.ids_per_uid
+    print(f"{total:,} ids across {args.uids} uids, batch of {args.batch} per uid")
+    print(f"{'':>16} {'set[str]':>12} {'TweetIdSet':>12}")
+    print(
+        f"{'memory':>16} {set_memory / 2**20:>10.1f}MB {array_memory / 2**20:>10.1f}MB"
+    )
+    print(
+        f"{'pickled':>16} {set_pickle / 2**20:>10.1f}MB {array_pickle / 2**20:>10.1f}MB"
+    )
+    print(
+        f"{'new - existing':>16} {set_diff * 1000:>10.2f}ms {array_diff * 1000:>10.2f}ms"
+    )
+    print(f"{'update':>16} {set_update * 1000:>10.2f}ms {array_update * 1000:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
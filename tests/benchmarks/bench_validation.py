@@ -0,0 +1,149 @@
+"""
+Benchmark synthetic round wall-clock against sample_size.
+
+Drives Forwarder.get_miners_volumes end to end with a fake dendrite and a stubbed
+verification adapter, so no network or chain access is needed. The stub answers
+after --verify-latency seconds and upstream calls are paced by the validator's shared
+rate limiter at --verification-rate calls per second.
+
+Usage:
+    python -m tests.benchmarks.bench_validation --sample-sizes 1 5 10 20 --concurrency 1 10
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, UTC
+from types import SimpleNamespace
+
+import bittensor as bt
+
+from masa.validator.forwarder import Forwarder
+from masa.validator.verification import VerificationResult, VALID
+from masa.validator.tweet_ids import TweetIdHistory
+
+
+class StubVerificationAdapter:
+    """Stands in for TweetVerificationAdapter; every tweet exists."""
+
+    latency = 0.0
+
+    def verify(self, tweet: dict) -> VerificationResult:
+        time.sleep(self.latency)
+        return VerificationResult(VALID, 200)
+
+
+class FakeDendrite:
+    """Answers every query after `latency` seconds with `tweets_per_miner` tweets."""
+
+    latency = 0.0
+    tweets_per_miner = 3
+
+    async def call(self, target_axon, synapse, timeout, deserialize=True):
+        await asyncio.sleep(self.latency)
+        now = int(datetime.now(UTC).timestamp())
+        return [
+            {
+                "Tweet": {
+                    "ID": f"{target_axon}{i:06d}",
+                    "Text": f"news about {synapse.query.strip(chr(34))}",
+                    "Name": "bench",
+                    "Username": "bench",
+                    "Timestamp": now,
+                    "Hashtags": [],
+                }
+            }
+            for i in range(1, self.tweets_per_miner + 1)
+        ]
+
+
+def make_validator(
+    sample_size: int, max_concurrency: int, verification_rate: float
+) -> SimpleNamespace:
+    n = max(256, sample_size)
+
+    async def export_tweets(tweets, query):
+        pass
+
+    validator = SimpleNamespace(
+        config=SimpleNamespace(
+            validator=SimpleNamespace(
+                max_concurrent_validations=max_concurrency,
+                healthcheck_max_inflight_batches=16,
+                seen_index_max_ids=5000000,
+                verification_rate=verification_rate,
+                verification_burst=max_concurrency,
+                verification_concurrency=max_concurrency,
+                verification_round_budget=0,
+                verification_timeout=30.0,
+                verdict_cache_size=100000,
+                verdict_cache_ttl=86400,
+                verdict_cache_persist=False,
+            )
+        ),
+        wallet=None,
+        dendrite_pool=SimpleNamespace(dendrite=FakeDendrite()),
+        metagraph=SimpleNamespace(axons=list(range(n)), hotkeys=[""] * n),
+        subnet_config={"synthetic": {"sample_size": sample_size, "timeout": 10}},
+        versions=[1] * n,
+        keywords=["bitcoin"],
+        uncalled_uids=set(range(n)),
+        tweets_by_uid={},
+        new_tweet_history=TweetIdHistory,
+        tempo=360,
+        last_tempo_block=1,
+        last_volume_block=0,
+        scorer=SimpleNamespace(add_volume=lambda uid, volume, block: None),
+        export_tweets=export_tweets,
+        exporter=SimpleNamespace(metrics=dict),
+    )
+    return validator
+
+
+async def run_round(
+    sample_size: int, max_concurrency: int, verification_rate: float
+) -> float:
+    validator = make_validator(sample_size, max_concurrency, verification_rate)
+    forwarder = Forwarder(validator)
+
+    async def get_miner_uids(k, sequential=False):
+        return list(range(1, k + 1))
+
+    forwarder.get_miner_uids = get_miner_uids
+    # Healthcheck pings are outside what this benchmark measures
+    forwarder.refresh_miner_health = lambda current_block: asyncio.sleep(0)
+    start = time.perf_counter()
+    await forwarder.get_miners_volumes(current_block=1)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sample-sizes", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--tweets-per-miner", type=int, default=3)
+    parser.add_argument("--dendrite-latency", type=float, default=0.05)
+    parser.add_argument("--verify-latency", type=float, default=0.02)
+    parser.add_argument("--verification-rate", type=float, default=1000.0)
+    args = parser.parse_args()
+
+    FakeDendrite.latency = args.dendrite_latency
+    FakeDendrite.tweets_per_miner = args.tweets_per_miner
+    StubVerificationAdapter.latency = args.verify_latency
+    Forwarder.create_verification_adapter = lambda self: StubVerificationAdapter()
+    bt.logging.off()
+
+    print(
+        f"{'sample_size':>11} "
+        + " ".join(f"{'c=' + str(c):>10}" for c in args.concurrency)
+    )
+    for sample_size in args.sample_sizes:
+        row = [
+            asyncio.run(run_round(sample_size, c, args.verification_rate))
+            for c in args.concurrency
+        ]
+        print(f"{sample_size:>11} " + " ".join(f"{t:>9.3f}s" for t in row))
+
+
+if __name__ == "__main__":
+    main()
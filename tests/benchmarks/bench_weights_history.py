@@ -0,0 +1,108 @@
+"""
+Benchmark restoring the last weights set on startup.
+
+Writes --days of history, --per-day entries a day for --uids miners, both as a
+scores.log of JSON lines and as a weights history, then times what load_state does
+with each: scanning scores.log for the last entry of the netuid, and reading the
+index plus one segment of the weights history. Also times a one-month query.
+
+Usage:
+    python -m tests.benchmarks.bench_weights_history --days 90
+"""
+
+import argparse
+import datetime
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from masa.validator.weights_history import WeightsHistory
+
+NETUID = 42
+
+
+def make_entries(days: int, per_day: int, uids: int) -> list:
+    rng = np.random.default_rng(0)
+    start = time.time() - days * 86400
+    return [
+        (
+            start + i * 86400 / per_day,
+            NETUID,
+            "hotkey",
+            dict(enumerate((rng.random(uids) * 65535).tolist())),
+        )
+        for i in range(days * per_day)
+    ]
+
+
+def scan_log(log_path: str):
+    last = None
+    with open(log_path) as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry["netuid"] == NETUID:
+                last = entry["weights"]
+    return last
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--per-day", type=int, default=72)
+    parser.add_argument("--uids", type=int, default=256)
+    args = parser.parse_args()
+
+    entries = make_entries(args.days, args.per_day, args.uids)
+    with tempfile.TemporaryDirectory() as path:
+        log_path = os.path.join(path, "scores.log")
+        with open(log_path, "w") as f:
+            for timestamp, netuid, hotkey, weights in entries:
+                entry = {
+                    "timestamp": datetime.datetime.fromtimestamp(timestamp).strftime(
+                        "%Y-%m-%d %H:%M:%S.%f"
+                    ),
+                    "netuid": netuid,
+                    "hotkey": hotkey,
+                    "weights": [{"uid": u, "weight": w} for u, w in weights.items()],
+                }
+                f.write(json.dumps(entry) + "\n")
+        history_path = os.path.join(path, "weights_history")
+        WeightsHistory(history_path).extend(entries)
+
+        def size(directory: str) -> int:
+            return sum(
+                os.path.getsize(os.path.join(directory, name))
+                for name in os.listdir(directory)
+            )
+
+        print(
+            f"{len(entries):,} entries x {args.uids} uids: scores.log "
+            f"{os.path.getsize(log_path) / 2**20:.1f}MB, weights history "
+            f"{size(history_path) / 2**20:.1f}MB"
+        )
+        scan = timed(lambda: scan_log(log_path))
+        latest = timed(lambda: WeightsHistory(history_path).latest(NETUID))
+        month = timed(
+            lambda: WeightsHistory(history_path).query(
+                NETUID, start=time.time() - 30 * 86400
+            )
+        )
+        print(f"scan scores.log   {scan * 1e3:>9.1f}ms")
+        print(f"latest()          {latest * 1e3:>9.1f}ms")
+        print(f"query(30 days)    {month * 1e3:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,5 +3,24 @@
 # Run each test file separately with coverage
 python -m pytest --cov --cov-append --cov-report=html tests/test_miner.py
 python -m pytest --cov --cov-append --cov-report=html tests/test_validator.py
-
-
+python -m pytest --cov --cov-append --cov-report=html tests/test_verification.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_health.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_tweet_ids.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_seen_index.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_batch_validation.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_keyword_matcher.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_tweet_decoder.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_exporter.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_export_spool.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_export_encoding.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_checkpoint.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_state_store.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_weights_history.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_volumes.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_scorer.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_sim.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_rate_limiter.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_verdict_cache.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_dendrite_pool.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_forwarder.py
+python -m pytest --cov --cov-append --cov-report=html tests/test_executor.py
@@ -0,0 +1,66 @@
+from masa.validator.batch_validation import (
+    validate_batch,
+    valid_id_mask,
+    MALFORMED,
+    INVALID_ID,
+    DUPLICATE,
+    STALE,
+)
+
+CUTOFF = 1_700_000_000
+
+
+def tweet(tweet_id, timestamp=CUTOFF + 60) -> dict:
+    return {"Tweet": {"ID": tweet_id, "Timestamp": timestamp}}
+
+
+class TestValidIdMask:
+    def test_matches_strict_id_rules(self):
+        ids = [
+            "1850000000000000000",
+            "18446744073709551615",
+            "18446744073709551616",
+            "0123",
+            "12a",
+            "",
+            "١٢٣",
+            "123​",
+            "123\x00",
+            123,
+            None,
+        ]
+        assert valid_id_mask(ids).tolist() == [True, True] + [False] * 9
+
+
+class TestValidateBatch:
+    def test_clean_batch_passes(self):
+        batch = validate_batch([tweet("1"), tweet("2")], CUTOFF)
+        assert batch.passed
+        assert batch.ids.tolist() == [1, 2]
+
+    def test_flags_every_failing_tweet(self):
+        responses = [
+            tweet("10"),
+            tweet("10"),
+            {"Tweet": {}},
+            "not a tweet",
+            tweet("0x1"),
+            tweet("11", timestamp=CUTOFF - 1),
+            tweet("12", timestamp="yesterday"),
+        ]
+        batch = validate_batch(responses, CUTOFF)
+        assert not batch.passed
+        assert batch.failures.tolist() == [
+            0,
+            DUPLICATE,
+            MALFORMED,
+            MALFORMED,
+            INVALID_ID,
+            STALE,
+            STALE,
+        ]
+        assert batch.failed_positions(MALFORMED).tolist() == [2, 3]
+        assert batch.summary() == "2 malformed, 1 invalid ID, 1 duplicate, 2 too old"
+
+    def test_empty_batch_passes(self):
+        assert validate_batch([], CUTOFF).passed
@@ -0,0 +1,191 @@
+import os
+
+import pytest
+import torch
+
+from masa.validator.checkpoint import Checkpointer, atomic_write, read_segment
+from masa.validator.tweet_ids import TweetIdHistory
+
+
+def new_history() -> TweetIdHistory:
+    return TweetIdHistory(retention_blocks=1000, segment_blocks=100)
+
+
+def make_state() -> dict:
+    tweets_by_uid = {uid: new_history() for uid in range(3)}
+    for uid, history in tweets_by_uid.items():
+        history.update([1000 * uid + i for i in range(10)], 0)
+        history.update([1000 * uid + i for i in range(10, 15)], 150)
+    return {
+        "step": 1,
+        "scores": torch.tensor([0.1, 0.2, 0.3]),
+        "hotkeys": ["a", "b", "c"],
+        "volumes": [{"tempo": 0, "miners": {"0": 10}}],
+        "tweets_by_uid": tweets_by_uid,
+    }
+
+
+def written_files(plan) -> list:
+    return sorted(name for _, name, write, _ in plan if write is not None)
+
+
+class TestCheckpointer:
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_restores_the_saved_state(self, tmp_path, mmap):
+        state = make_state()
+        checkpointer = Checkpointer(str(tmp_path))
+        assert not checkpointer.exists()
+        checkpointer.write(checkpointer.prepare(state, force=True))
+
+        restored = Checkpointer(str(tmp_path)).load(new_history, mmap=mmap)
+        assert restored["step"] == 1
+        assert torch.equal(restored["scores"], state["scores"])
+        assert restored["hotkeys"] == state["hotkeys"]
+        assert restored["volumes"] == state["volumes"]
+        assert restored["tweets_by_uid"].keys() == state["tweets_by_uid"].keys()
+        for uid, history in restored["tweets_by_uid"].items():
+            original = state["tweets_by_uid"][uid]
+            assert [start for start, _ in history.segments] == [0, 100]
+            assert list(history) == list(original)
+            # Mapped read-only
+            assert history.segments[0][1].ids.flags.writeable != mmap
+            assert len(history.update([1000 * uid + 3], 160)) == 0
+
+    def test_writes_only_changed_components(self, tmp_path):
+        state = make_state()
+        checkpointer = Checkpointer(str(tmp_path))
+        checkpointer.write(checkpointer.prepare(state, force=True))
+        assert checkpointer.prepare(state, force=True) is None
+
+        state["step"] = 2
+        state["scores"][1] = 0.5
+        state["tweets_by_uid"][2].update([5000], 180)
+        plan = checkpointer.prepare(state, force=True)
+        assert written_files(plan) == [
+            "manifest.json",
+            "scores.2.npy",
+            os.path.join("tweets", "100.2.bin"),
+        ]
+        checkpointer.write(plan)
+        restored = Checkpointer(str(tmp_path)).load(new_history)
+        assert restored["step"] == 2
+        assert "5000" in restored["tweets_by_uid"][2]
+        # The files replaced are gone
+        assert sorted(os.listdir(tmp_path)) == [
+            "hotkeys.1.npy",
+            "manifest.json",
+            "scores.2.npy",
+            "tweets",
+            "volumes.1.json",
+        ]
+        assert sorted(os.listdir(tmp_path / "tweets")) == ["0.1.bin", "100.2.bin"]
+
+    def test_interrupted_save_leaves_the_previous_checkpoint(self, tmp_path):
+        state = make_state()
+        checkpointer = Checkpointer(str(tmp_path))
+        checkpointer.write(checkpointer.prepare(state, force=True))
+
+        state["step"] = 2
+        state["scores"][0] = 0.9
+        state["tweets_by_uid"][0].update([9000], 180)
+        # Crash before the manifest: every changed component is written, under new names
+        for _, name, write, _ in checkpointer.prepare(state, force=True)[:-1]:
+            atomic_write(str(tmp_path / name), write)
+
+        restored = Checkpointer(str(tmp_path)).load(new_history)
+        assert restored["step"] == 1
+        assert restored["scores"][0].item() == pytest.approx(0.1)
+        assert "9000" not in restored["tweets_by_uid"][0]
+        assert sorted(os.listdir(tmp_path / "tweets")) == ["0.1.bin", "100.1.bin"]
+
+    def test_loaded_state_is_not_rewritten(self, tmp_path):
+        state = make_state()
+        checkpointer = Checkpointer(str(tmp_path))
+        checkpointer.write(checkpointer.prepare(state, force=True))
+
+        checkpointer = Checkpointer(str(tmp_path))
+        restored = checkpointer.load(new_history)
+        assert checkpointer.prepare(restored, force=True) is None
+
+    def test_deletes_expired_segments(self, tmp_path):
+        state = make_state()
+        checkpointer = Checkpointer(str(tmp_path))
+        checkpointer.write(checkpointer.prepare(state, force=True))
+
+        for history in state["tweets_by_uid"].values():
+            history.expire(1150)
+        checkpointer.write(checkpointer.prepare(state, force=True))
+        assert os.listdir(tmp_path / "tweets") == ["100.1.bin"]
+
+    def test_waits_for_the_interval_or_pending_size(self, tmp_path):
+        state = make_state()
+        checkpointer = Checkpointer(str(tmp_path), interval=3600, max_pending_bytes=200)
+        assert checkpointer.prepare(state) is not None
+        checkpointer.write(checkpointer.prepare(state, force=True))
+
+        state["step"] = 2
+        state["tweets_by_uid"][0].update([7000], 190)
+        # The changed segment now holds 16 ids, 128 bytes to write
+        assert checkpointer.prepare(state) is None
+        state["tweets_by_uid"][0].update(range(7001, 7010), 190)
+        assert checkpointer.prepare(state) is not None
+
+    @pytest.mark.asyncio
+    async def test_saves_in_a_worker_thread(self, tmp_path):
+        checkpointer = Checkpointer(str(tmp_path), interval=0)
+        assert await checkpointer.save(make_state()) > 0
+        assert await checkpointer.save(make_state()) == 0
+        assert checkpointer.metrics()["saves"] == 1
+
+    def test_rejects_corrupt_segments(self, tmp_path):
+        checkpointer = Checkpointer(str(tmp_path))
+        checkpointer.write(checkpointer.prepare(make_state(), force=True))
+        path = tmp_path / "tweets" / "0.1.bin"
+        data = path.read_bytes()
+
+        path.write_bytes(data[:-8])
+        with pytest.raises(ValueError):
+            read_segment(str(path))
+        path.write_bytes(b"not a segment" + data)
+        with pytest.raises(ValueError):
+            read_segment(str(path))
+
+    def test_ignores_files_of_an_interrupted_save(self, tmp_path):
+        state = make_state()
+        checkpointer = Checkpointer(str(tmp_path))
+        checkpointer.write(checkpointer.prepare(state, force=True))
+        (tmp_path / "tweets" / "200.2.bin").write_bytes(b"partial")
+        (tmp_path / "tweets" / "100.2.bin.tmp").write_bytes(b"partial")
+        (tmp_path / "scores.2.npy.tmp").write_bytes(b"partial")
+
+        restored = Checkpointer(str(tmp_path)).load(new_history)
+        assert [start for start, _ in restored["tweets_by_uid"][0].segments] == [0, 100]
+        assert sorted(os.listdir(tmp_path / "tweets")) == ["0.1.bin", "100.1.bin"]
+        assert not (tmp_path / "scores.2.npy.tmp").exists()
+
+
+class TestMigration:
+    def test_converts_pickled_state(self, tmp_path):
+        state = make_state()
+        # Older state files hold sets of ID strings
+        state["tweets_by_uid"][0] = {"1", "2"}
+        state_path = str(tmp_path / "state.pt")
+        torch.save(state, state_path)
+
+        def load_history(tweet_ids):
+            if isinstance(tweet_ids, TweetIdHistory):
+                return tweet_ids
+            history = new_history()
+            history.update(tweet_ids, 500)
+            return history
+
+        checkpointer = Checkpointer(str(tmp_path / "checkpoint"))
+        migrated = checkpointer.migrate(state_path, load_history)
+        assert not os.path.exists(state_path)
+        assert os.path.exists(state_path + ".migrated")
+
+        restored = Checkpointer(str(tmp_path / "checkpoint")).load(new_history)
+        assert restored["step"] == migrated["step"] == 1
+        assert torch.equal(restored["scores"], state["scores"])
+        assert list(restored["tweets_by_uid"][0]) == ["1", "2"]
+        assert list(restored["tweets_by_uid"][1]) == list(state["tweets_by_uid"][1])
@@ -0,0 +1,85 @@
+import contextlib
+
+import pytest
+import bittensor as bt
+from aiohttp import web
+from bittensor.core import dendrite as dendrite_module
+
+from masa.synapses import PingAxonSynapse
+from masa.validator.dendrite_pool import DendritePool
+from masa.validator.tweet_decoder import DecodingClientResponse
+
+
+@pytest.fixture
+def keypair(monkeypatch):
+    # A new dendrite looks up the validator's external IP; keep the network out of it
+    monkeypatch.setattr(
+        dendrite_module.networking, "get_external_ip", lambda: "127.0.0.1"
+    )
+    return bt.Keypair.create_from_mnemonic(bt.Keypair.generate_mnemonic())
+
+
+@contextlib.asynccontextmanager
+async def miner():
+    """A local axon that answers every ping like a miner; yields its port."""
+
+    async def handle_ping(request: web.Request) -> web.Response:
+        body = await request.json()
+        body["version"] = 1
+        return web.json_response(body)
+
+    app = web.Application()
+    app.router.add_post("/PingAxonSynapse", handle_ping)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        yield runner.addresses[0][1]
+    finally:
+        await runner.cleanup()
+
+
+class TestDendritePool:
+    @pytest.mark.asyncio
+    async def test_dendrite_uses_the_pooled_session(self, keypair):
+        pool = DendritePool(keypair, limit=16, limit_per_host=2, history_size=5)
+        dendrite = pool.dendrite
+        assert isinstance(dendrite, bt.dendrite)
+        assert pool.dendrite is dendrite
+        assert dendrite.synapse_history.maxlen == 5
+
+        session = await dendrite.session
+        assert session is await dendrite.session
+        assert session.connector.limit == 16
+        assert session.connector.limit_per_host == 2
+        assert session._response_class is DecodingClientResponse
+
+        await pool.close()
+        assert session.closed
+        # A closed session is replaced on next use
+        replacement = await dendrite.session
+        assert replacement is not session and not replacement.closed
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_rounds_reuse_connections(self, keypair):
+        pool = DendritePool(keypair)
+        ping = PingAxonSynapse(sent_from="127.0.0.1", is_active=False, version=0)
+        async with miner() as port:
+            axon = bt.AxonInfo(
+                version=1,
+                ip="127.0.0.1",
+                port=port,
+                ip_type=4,
+                hotkey=keypair.ss58_address,
+                coldkey=keypair.ss58_address,
+            )
+            try:
+                for _ in range(3):
+                    responses = await pool.dendrite(
+                        [axon], ping, deserialize=False, timeout=5
+                    )
+                    assert responses[0].version == 1
+            finally:
+                await pool.close()
+        assert pool.metrics() == {"connections_created": 1, "connections_reused": 2}
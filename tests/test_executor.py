@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from masa.validator.executor import ValidationExecutor
+
+
+class Tracker:
+    """Counts how many validations run at once."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def validate(self, result, delay: float = 0.01):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.active -= 1
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class TestValidationExecutor:
+    @pytest.mark.asyncio
+    async def test_returns_results_keyed_by_submission(self):
+        executor = ValidationExecutor(max_concurrency=4)
+        tracker = Tracker()
+        for uid in range(5):
+            executor.submit(uid, tracker.validate(f"outcome {uid}"))
+        assert await executor.join() == {uid: f"outcome {uid}" for uid in range(5)}
+
+    @pytest.mark.asyncio
+    async def test_bounds_concurrency(self):
+        executor = ValidationExecutor(max_concurrency=3)
+        tracker = Tracker()
+        for uid in range(12):
+            executor.submit(uid, tracker.validate(uid))
+        await executor.join()
+        assert tracker.peak == 3
+
+    @pytest.mark.asyncio
+    async def test_bound_is_shared_across_rounds(self):
+        executor = ValidationExecutor(max_concurrency=2)
+        tracker = Tracker()
+        first = [
+            executor.submit(uid, tracker.validate(uid, delay=0.05)) for uid in range(4)
+        ]
+        await asyncio.sleep(0)
+        # The next round's miners are submitted while the first round still runs
+        for uid in range(4, 8):
+            executor.submit(uid, tracker.validate(uid, delay=0.05))
+        await asyncio.gather(*first)
+        assert len(await executor.join()) == 8
+        assert tracker.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_join_captures_exceptions(self):
+        executor = ValidationExecutor()
+        tracker = Tracker()
+        error = ValueError("malformed response")
+        executor.submit(1, tracker.validate("successful"))
+        executor.submit(2, tracker.validate(error))
+        executor.submit(3, tracker.validate("invalid_tweets"))
+        results = await executor.join()
+        assert results == {1: "successful", 2: error, 3: "invalid_tweets"}
+
+    @pytest.mark.asyncio
+    async def test_join_starts_a_new_round(self):
+        executor = ValidationExecutor()
+        tracker = Tracker()
+        executor.submit(1, tracker.validate("first"))
+        assert await executor.join() == {1: "first"}
+        assert executor.tasks == {}
+        assert await executor.join() == {}
+        executor.submit(2, tracker.validate("second"))
+        assert await executor.join() == {2: "second"}
@@ -0,0 +1,55 @@
+import gzip
+import json
+
+import pytest
+
+from masa.validator.export_encoding import PayloadEncoder, zstandard
+from masa.validator.exporter import ExportQueue
+from tests.test_exporter import StubProtocolApi, tweets
+
+
+def decode(encoder: PayloadEncoder, body: bytes) -> dict:
+    if encoder.content_encoding == "gzip":
+        body = gzip.decompress(body)
+    elif encoder.content_encoding == "zstd":
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return json.loads(body)
+
+
+class TestPayloadEncoder:
+    @pytest.mark.parametrize("content_encoding", ["identity", "gzip", "zstd"])
+    @pytest.mark.parametrize("count", [0, 1, 250])
+    def test_streams_the_payload_in_chunks(self, content_encoding, count):
+        if content_encoding == "zstd" and zstandard is None:
+            pytest.skip("zstandard is not installed")
+        encoder = PayloadEncoder(content_encoding, tweets_per_chunk=100)
+        batch = tweets(0, count)
+        chunks = list(encoder.chunks("hotkey", 'bitcoin "etf"', batch))
+        assert decode(encoder, b"".join(chunks)) == {
+            "Hotkey": "hotkey",
+            "Query": 'bitcoin "etf"',
+            "Tweets": batch,
+        }
+        if content_encoding == "identity":
+            assert len(chunks) == 2 + (count + 99) // 100
+
+    def test_headers_name_the_encoding(self):
+        assert "Content-Encoding" not in PayloadEncoder().headers
+        assert PayloadEncoder("gzip").headers["Content-Encoding"] == "gzip"
+
+    def test_rejects_unknown_encodings(self):
+        with pytest.raises(ValueError):
+            PayloadEncoder("brotli")
+
+    @pytest.mark.asyncio
+    async def test_posts_compressed_stream(self):
+        api = StubProtocolApi()
+        async with api as url:
+            queue = ExportQueue(
+                url, "hotkey", max_latency=0, encoder=PayloadEncoder("gzip")
+            )
+            queue.submit(tweets(0, 300), "btc")
+            await queue.close()
+        assert api.payloads == [
+            {"Hotkey": "hotkey", "Query": "btc", "Tweets": tweets(0, 300)}
+        ]
@@ -0,0 +1,198 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from masa.validator.export_spool import ExportSpool, dumps
+from masa.validator.exporter import ExportQueue
+from tests.test_exporter import StubProtocolApi, tweets
+
+
+def segment_files(path) -> list:
+    return sorted(name for name in os.listdir(path) if name.endswith(".wal"))
+
+
+class TestExportSpool:
+    def test_recovers_unacknowledged_batches(self, tmp_path):
+        spool = ExportSpool(str(tmp_path))
+        first = spool.append("btc", tweets(0, 2))
+        second = spool.append("eth", tweets(2, 1))
+        spool.ack([first])
+        spool.close()
+
+        recovered = ExportSpool(str(tmp_path)).recover()
+        assert recovered == [(second, "eth", tweets(2, 1))]
+
+    def test_ignores_torn_last_line(self, tmp_path):
+        spool = ExportSpool(str(tmp_path))
+        record = spool.append("btc", tweets(0, 1))
+        spool.close()
+        with open(tmp_path / segment_files(tmp_path)[-1], "ab") as f:
+            f.write(b'{"id": 1, "query": "btc", "twe')
+
+        spool = ExportSpool(str(tmp_path))
+        assert [batch[0] for batch in spool.recover()] == [record]
+        # New ids never collide with recovered ones
+        assert spool.append("btc", tweets(1, 1)) > record
+
+    def test_compaction_carries_only_unacknowledged_records(self, tmp_path):
+        spool = ExportSpool(str(tmp_path), segment_bytes=1)
+        records = [spool.append("btc", tweets(i, 1)) for i in range(4)]
+        spool.ack(records[:3])
+        spool.append("btc", tweets(4, 1))
+        # Every append seals a segment; the sealed ones are gone once compacted
+        assert len(segment_files(tmp_path)) == 1
+        spool.close()
+
+        recovered = ExportSpool(str(tmp_path)).recover()
+        assert [batch[0] for batch in recovered] == [records[3], records[3] + 1]
+
+    def test_reads_back_unacknowledged_batches(self, tmp_path):
+        spool = ExportSpool(str(tmp_path), segment_bytes=200)
+        records = [spool.append("btc", tweets(i, 2)) for i in range(4)]
+        spool.ack([records[1]])
+        # Some were carried forward when the spool rolled
+        assert segment_files(tmp_path) != ["00000000.wal"]
+        assert spool.read([records[3], records[1], records[0], 99]) == [
+            (records[0], "btc", tweets(0, 2)),
+            (records[3], "btc", tweets(3, 2)),
+        ]
+        spool.close()
+
+    def test_carried_backlog_does_not_roll_every_append(self, tmp_path):
+        record_bytes = len(dumps({"id": 0, "query": "btc", "tweets": tweets(0, 1)}))
+        spool = ExportSpool(str(tmp_path), segment_bytes=4 * record_bytes)
+        records = [spool.append("btc", tweets(i, 1)) for i in range(40)]
+        # Nothing is acknowledged, so each roll carries the whole backlog forward;
+        # only new records count towards the next one
+        sequence = int(segment_files(tmp_path)[-1][: -len(".wal")])
+        assert sequence <= 10
+        spool.close()
+
+        recovered = ExportSpool(str(tmp_path)).recover()
+        assert [batch[0] for batch in recovered] == records
+
+
+class SpyingSpool(ExportSpool):
+    """Records the thread every spool write runs on."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.threads = set()
+
+    def append(self, *args, **kwargs) -> int:
+        self.threads.add(threading.current_thread().name)
+        return super().append(*args, **kwargs)
+
+    def ack(self, record_ids):
+        self.threads.add(threading.current_thread().name)
+        super().ack(record_ids)
+
+
+class TestExportRecovery:
+    @pytest.mark.asyncio
+    async def test_spool_writes_run_off_the_event_loop(self, tmp_path):
+        spool = SpyingSpool(str(tmp_path))
+        api = StubProtocolApi()
+        async with api as url:
+            queue = ExportQueue(url, "hotkey", max_latency=0, spool=spool)
+            queue.submit(tweets(0, 2), "btc")
+            queue.submit(tweets(2, 1), "eth")
+            await queue.close()
+
+        assert spool.threads and all(
+            name.startswith("export-spool") for name in spool.threads
+        )
+        assert ExportSpool(str(tmp_path)).recover() == []
+
+    @pytest.mark.asyncio
+    async def test_replays_batches_after_crash(self, tmp_path):
+        path = str(tmp_path / "export_spool")
+
+        # The API stores the first request, then fails until the process dies
+        api = StubProtocolApi(statuses=[200] + [503] * 10)
+        async with api as url:
+            queue = ExportQueue(
+                url,
+                "hotkey",
+                batch_size=2,
+                max_latency=0,
+                max_retries=0,
+                spool=ExportSpool(path),
+            )
+            queue.submit(tweets(0, 2), "btc")
+            await asyncio.sleep(0.2)
+            queue.submit(tweets(2, 2), "btc")
+            queue.submit(tweets(4, 1), "eth")
+            await asyncio.sleep(0.2)
+            # Crash: no close, nothing flushed beyond what was already written
+            queue._worker.cancel()
+            await asyncio.gather(queue._worker, return_exceptions=True)
+        stored = [t["Tweet"]["ID"] for t in api.payloads[0]["Tweets"]]
+        assert stored == ["0", "1"]
+
+        api = StubProtocolApi()
+        async with api as url:
+            queue = ExportQueue(
+                url, "hotkey", batch_size=2, max_latency=0, spool=ExportSpool(path)
+            )
+            assert queue.restore() == 2
+            await queue.close()
+
+        replayed = sorted(
+            (p["Query"], t["Tweet"]["ID"]) for p in api.payloads for t in p["Tweets"]
+        )
+        assert replayed == [("btc", "2"), ("btc", "3"), ("eth", "4")]
+        assert ExportSpool(path).recover() == []
+
+    @pytest.mark.asyncio
+    async def test_resends_failed_batches_without_a_restart(self, tmp_path):
+        path = str(tmp_path / "export_spool")
+        # The API rejects the first request, then stores everything
+        api = StubProtocolApi(statuses=[503])
+        async with api as url:
+            queue = ExportQueue(
+                url,
+                "hotkey",
+                batch_size=2,
+                max_latency=0,
+                max_retries=0,
+                spool=ExportSpool(path),
+                resend_backoff=0.1,
+            )
+            queue.submit(tweets(0, 3), "btc")
+            await asyncio.sleep(0.05)
+            assert queue.metrics()["failed"] == 2
+            await asyncio.sleep(0.3)
+            metrics = queue.metrics()
+            assert metrics["spooled"] == 0
+            await queue.close()
+
+        sent = [[t["Tweet"]["ID"] for t in p["Tweets"]] for p in api.payloads]
+        # The failed record is sent again in full; its unsent tweet is not sent twice
+        assert sent == [["0", "1"], ["0", "1"], ["2"]]
+        assert metrics["resent"] == 3
+        assert queue.pending == 0
+        assert ExportSpool(path).recover() == []
+
+    @pytest.mark.asyncio
+    async def test_resends_dropped_batches_once_there_is_room(self, tmp_path):
+        api = StubProtocolApi()
+        async with api as url:
+            queue = ExportQueue(
+                url,
+                "hotkey",
+                max_latency=0,
+                max_pending=2,
+                spool=ExportSpool(str(tmp_path)),
+                resend_backoff=0.1,
+            )
+            queue.submit(tweets(0, 2), "btc")
+            assert not queue.submit(tweets(2, 2), "btc")
+            await asyncio.sleep(0.3)
+            await queue.close()
+
+        sent = sorted(t["Tweet"]["ID"] for p in api.payloads for t in p["Tweets"])
+        assert sent == ["0", "1", "2", "3"]
+        assert ExportSpool(str(tmp_path)).recover() == []
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from masa.validator.exporter import ExportQueue
+
+
+class StubProtocolApi:
+    """Local stand-in for the protocol API, answering `statuses` in turn, then 200."""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.payloads = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.payloads.append(await request.json())
+        status = self.statuses.pop(0) if self.statuses else 200
+        return web.Response(status=status, text="ok")
+
+    async def __aenter__(self) -> str:
+        app = web.Application()
+        app.router.add_post("/tweets", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/tweets"
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+def tweets(start: int, count: int) -> list:
+    return [{"Tweet": {"ID": str(i)}} for i in range(start, start + count)]
+
+
+class TestExportQueue:
+    @pytest.mark.asyncio
+    async def test_coalesces_miners_into_full_batches(self):
+        api = StubProtocolApi()
+        async with api as url:
+            queue = ExportQueue(url, "hotkey", batch_size=5, max_latency=60)
+            for miner in range(3):
+                assert queue.submit(tweets(miner * 3, 3), "btc")
+            queue.submit(tweets(100, 1), "eth")
+            await asyncio.sleep(0.2)
+            # Only the full batch went out; the rest waits for more tweets
+            assert [len(p["Tweets"]) for p in api.payloads] == [5]
+            await queue.close()
+
+        assert sorted((p["Query"], len(p["Tweets"])) for p in api.payloads) == [
+            ("btc", 4),
+            ("btc", 5),
+            ("eth", 1),
+        ]
+        sent = [
+            t["Tweet"]["ID"]
+            for p in api.payloads
+            if p["Query"] == "btc"
+            for t in p["Tweets"]
+        ]
+        assert sent == [str(i) for i in range(9)]
+        assert api.payloads[0]["Hotkey"] == "hotkey"
+        assert queue.metrics()["exported"] == 10
+        assert queue.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_flushes_partial_batch_after_max_latency(self):
+        api = StubProtocolApi()
+        async with api as url:
+            queue = ExportQueue(url, "hotkey", batch_size=1000, max_latency=0.1)
+            queue.submit(tweets(0, 2), "btc")
+            await asyncio.sleep(0.5)
+            assert len(api.payloads) == 1
+            await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_failures(self):
+        api = StubProtocolApi(statuses=[503, 429])
+        async with api as url:
+            queue = ExportQueue(url, "hotkey", max_latency=0, base_backoff=0.01)
+            queue.submit(tweets(0, 2), "btc")
+            await queue.close()
+        metrics = queue.metrics()
+        assert len(api.payloads) == 3
+        assert (metrics["exported"], metrics["retries"], metrics["failed"]) == (2, 2, 0)
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_rejected_batches(self):
+        api = StubProtocolApi(statuses=[400])
+        async with api as url:
+            queue = ExportQueue(url, "hotkey", max_latency=0, base_backoff=0.01)
+            queue.submit(tweets(0, 2), "btc")
+            await queue.close()
+        assert len(api.payloads) == 1
+        assert queue.metrics()["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_drops_instead_of_blocking_when_full(self):
+        queue = ExportQueue(
+            "http://127.0.0.1:9/tweets", "hotkey", max_latency=60, max_pending=3
+        )
+        assert queue.submit(tweets(0, 3), "btc")
+        assert not queue.submit(tweets(3, 1), "btc")
+        assert queue.metrics()["dropped"] == 1
+        assert queue.metrics()["pending"] == 3
+        queue._worker.cancel()
@@ -0,0 +1,194 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from masa.validator.forwarder import Forwarder
+from masa.validator.health import MinerHealth
+
+
+class FakeDendrite:
+    """Answers each uid's axon after that uid's latency; records what was cancelled."""
+
+    def __init__(self, latencies: dict, failing: tuple = ()):
+        self.latencies = latencies
+        self.failing = failing
+        self.cancelled = []
+
+    async def call(self, target_axon, synapse, timeout, deserialize=True):
+        uid = target_axon
+        try:
+            await asyncio.sleep(self.latencies[uid])
+        except asyncio.CancelledError:
+            self.cancelled.append(uid)
+            raise
+        if uid in self.failing:
+            raise ConnectionError(f"axon {uid} unreachable")
+        return f"response from {uid}"
+
+
+def make_forwarder(dendrite: FakeDendrite, uids: list) -> Forwarder:
+    forwarder = object.__new__(Forwarder)
+    n = max(uids, default=0) + 1
+    forwarder.validator = SimpleNamespace(
+        dendrite_pool=SimpleNamespace(dendrite=dendrite),
+        metagraph=SimpleNamespace(axons=list(range(n)), hotkeys=[""] * n),
+        subnet_config={"organic": {"sample_size": len(uids), "timeout": 5}},
+    )
+
+    async def get_miner_uids(sample_size, sequential=False):
+        return uids
+
+    forwarder.get_miner_uids = get_miner_uids
+    return forwarder
+
+
+class Request:
+    def model_copy(self):
+        return self
+
+
+async def collect(stream) -> list:
+    return [response async for response in stream]
+
+
+class TestStreamRequest:
+    @pytest.mark.asyncio
+    async def test_yields_responses_in_arrival_order(self):
+        dendrite = FakeDendrite({1: 0.15, 2: 0.0, 3: 0.05})
+        forwarder = make_forwarder(dendrite, [1, 2, 3])
+        responses = await collect(forwarder.stream_request(Request()))
+        assert responses == [
+            {"uid": 2, "response": "response from 2"},
+            {"uid": 3, "response": "response from 3"},
+            {"uid": 1, "response": "response from 1"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_queries_yield_no_response(self):
+        dendrite = FakeDendrite({1: 0.0, 2: 0.01}, failing=(1,))
+        forwarder = make_forwarder(dendrite, [1, 2])
+        responses = await collect(forwarder.stream_request(Request()))
+        assert {r["uid"]: r["response"] for r in responses} == {
+            1: None,
+            2: "response from 2",
+        }
+
+    @pytest.mark.asyncio
+    async def test_stopping_early_cancels_pending_queries(self):
+        dendrite = FakeDendrite({1: 0.0, 2: 10.0, 3: 10.0})
+        forwarder = make_forwarder(dendrite, [1, 2, 3])
+        stream = forwarder.stream_request(Request())
+        async for response in stream:
+            assert response["uid"] == 1
+            break
+        await stream.aclose()
+        assert sorted(dendrite.cancelled) == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_no_miners_yields_nothing(self):
+        forwarder = make_forwarder(FakeDendrite({}), [])
+        assert await collect(forwarder.stream_request(Request())) == []
+
+
+class PingDendrite:
+    """Answers healthcheck pings with each axon's version and records every batch."""
+
+    def __init__(self, versions: dict):
+        self.versions = versions
+        self.batches = []
+
+    async def __call__(self, axons, synapse, deserialize=False, timeout=None):
+        self.batches.append([axon.uid for axon in axons])
+        return [
+            SimpleNamespace(
+                version=self.versions.get(axon.uid, 0),
+                dendrite=SimpleNamespace(status_code=200, status_message="Success"),
+            )
+            for axon in axons
+        ]
+
+    @property
+    def pinged(self) -> list:
+        return sorted(uid for batch in self.batches for uid in batch)
+
+
+def make_axon(uid: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        uid=uid,
+        hotkey=f"hotkey-{uid}",
+        ip="1.2.3.4",
+        port=8091 + uid,
+        ip_type=4,
+        version=1,
+    )
+
+
+def make_health_forwarder(n: int, monkeypatch) -> tuple:
+    dendrite = PingDendrite({uid: 5 for uid in range(n)})
+    forwarder = object.__new__(Forwarder)
+    forwarder.external_ip = "127.0.0.1"
+    forwarder.miner_health = MinerHealth()
+    forwarder.validator = SimpleNamespace(
+        config=SimpleNamespace(
+            validator=SimpleNamespace(healthcheck_max_inflight_batches=2)
+        ),
+        dendrite_pool=SimpleNamespace(dendrite=dendrite),
+        metagraph=SimpleNamespace(
+            n=np.int64(n), axons=[make_axon(uid) for uid in range(n)]
+        ),
+        subnet_config={
+            "healthcheck": {
+                "blocks": 360,
+                "retry_blocks": 36,
+                "sample_size": 2,
+                "timeout": 5,
+            }
+        },
+        versions=[],
+    )
+    monkeypatch.setattr(
+        "masa.validator.forwarder.get_available_uids", lambda metagraph: list(range(n))
+    )
+    return forwarder, dendrite
+
+
+class TestMinerHealthRefresh:
+    @pytest.mark.asyncio
+    async def test_pings_only_stale_and_unseen_miners(self, monkeypatch):
+        forwarder, dendrite = make_health_forwarder(5, monkeypatch)
+        axons = forwarder.validator.metagraph.axons
+        health = forwarder.miner_health
+        health.record(0, axons[0], version=5, block=300)  # fresh
+        health.record(1, axons[1], version=5, block=0)  # stale
+        health.record(2, axons[2], version=0, block=380)  # failed, retried later
+        health.record(3, axons[3], version=0, block=300)  # failed, due for a retry
+        # uid 4 has never been pinged
+
+        await forwarder.refresh_miner_health(400)
+        assert dendrite.pinged == [1, 3, 4]
+        assert health.last_ping_block == {0: 300, 1: 400, 2: 380, 3: 400, 4: 400}
+        assert forwarder.validator.versions == [5, 5, 0, 5, 5]
+        assert forwarder.validator.last_healthcheck_block == 400
+
+    @pytest.mark.asyncio
+    async def test_skips_the_ping_when_every_miner_is_fresh(self, monkeypatch):
+        forwarder, dendrite = make_health_forwarder(3, monkeypatch)
+        for uid, axon in enumerate(forwarder.validator.metagraph.axons):
+            forwarder.miner_health.record(uid, axon, version=5, block=300)
+
+        await forwarder.refresh_miner_health(400)
+        assert dendrite.batches == []
+        assert forwarder.validator.versions == [5, 5, 5]
+
+    @pytest.mark.asyncio
+    async def test_pings_in_batches_and_records_every_uid(self, monkeypatch):
+        forwarder, dendrite = make_health_forwarder(5, monkeypatch)
+        dendrite.versions[2] = 0
+        responses = await forwarder.ping_uids(100, [0, 1, 2, 3, 4])
+
+        assert sorted(len(batch) for batch in dendrite.batches) == [1, 2, 2]
+        assert sorted(responses) == [0, 1, 2, 3, 4]
+        assert forwarder.miner_health.versions == {0: 5, 1: 5, 2: 0, 3: 5, 4: 5}
+        assert forwarder.validator.versions == [5, 5, 0, 5, 5]
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from masa.validator.health import MinerHealth
+
+
+def make_axon(ip: str = "1.2.3.4", port: int = 8091, hotkey: str = "hk"):
+    return SimpleNamespace(hotkey=hotkey, ip=ip, port=port, ip_type=4, version=1)
+
+
+class TestMinerHealth:
+    def test_new_miners_need_a_ping(self):
+        health = MinerHealth()
+        axons = [make_axon(), make_axon()]
+        reasons = health.stale_uids([0, 1], axons, 100, max_age=360, retry_age=36)
+        assert reasons["new"] == [0, 1]
+
+    def test_fresh_healthy_miners_are_skipped(self):
+        health = MinerHealth()
+        axons = [make_axon()]
+        health.record(0, axons[0], version=5, block=100)
+        reasons = health.stale_uids([0], axons, 400, max_age=360, retry_age=36)
+        assert not any(reasons.values())
+
+    def test_old_results_go_stale(self):
+        health = MinerHealth()
+        axons = [make_axon()]
+        health.record(0, axons[0], version=5, block=100)
+        reasons = health.stale_uids([0], axons, 460, max_age=360, retry_age=36)
+        assert reasons["stale"] == [0]
+
+    def test_changed_axon_is_repinged_immediately(self):
+        health = MinerHealth()
+        health.record(0, make_axon(), version=5, block=100)
+        axons = [make_axon(ip="5.6.7.8")]
+        reasons = health.stale_uids([0], axons, 101, max_age=360, retry_age=36)
+        assert reasons["changed"] == [0]
+
+    def test_failed_pings_retry_sooner(self):
+        health = MinerHealth()
+        axons = [make_axon()]
+        health.record(0, axons[0], version=0, block=100)
+        assert not any(health.stale_uids([0], axons, 120, 360, 36).values())
+        assert health.stale_uids([0], axons, 136, 360, 36)["failed"] == [0]
+
+    def test_prune_clears_miners_that_stopped_serving(self):
+        health = MinerHealth()
+        health.record(0, make_axon(), version=5, block=100)
+        health.record(2, make_axon(), version=6, block=100)
+        health.prune([2])
+        assert health.versions_by_uid(3) == [0, 0, 6]
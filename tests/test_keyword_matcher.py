@@ -0,0 +1,70 @@
+import random
+
+from masa.validator.keyword_matcher import KeywordMatcher, compile_keyword
+
+
+def normalized_match(keyword: str, tweet: dict) -> bool:
+    """The per-tweet check validate_tweet_batch used to run on its 3 samples."""
+
+    def normalize(s: str) -> str:
+        return " ".join(s.split()).strip().lower()
+
+    query_words = normalize(keyword.replace('"', "")).split()
+    fields = [
+        normalize(tweet.get("Text", "")),
+        normalize(tweet.get("Name", "")),
+        normalize(tweet.get("Username", "")),
+        normalize(str(tweet.get("Hashtags", []))),
+    ]
+    return all(any(word in field for field in fields) for word in query_words)
+
+
+def tweet(text="", name="", username="", hashtags=None) -> dict:
+    return {
+        "Tweet": {
+            "ID": "1",
+            "Text": text,
+            "Name": name,
+            "Username": username,
+            "Hashtags": hashtags or [],
+        }
+    }
+
+
+class TestKeywordMatcher:
+    def test_every_word_must_appear_in_some_field(self):
+        matcher = KeywordMatcher('"Bitcoin ETF"')
+        responses = [
+            tweet(text="New bitcoin etf approved"),
+            tweet(text="BITCOIN to the moon", hashtags=["ETF"]),
+            tweet(text="bitcoin only"),
+            tweet(name="Bit", username="coinETF"),
+        ]
+        assert matcher.match_batch(responses).tolist() == [True, True, False, False]
+
+    def test_words_do_not_span_fields(self):
+        matcher = KeywordMatcher("bitcoin")
+        assert not matcher.match_batch([tweet(text="bit", name="coin")])[0]
+
+    def test_malformed_responses_do_not_match(self):
+        matcher = KeywordMatcher("btc")
+        responses = ["btc", {"Tweet": "btc"}, {}, {"Tweet": {"Text": None}}]
+        assert not matcher.match_batch(responses).any()
+
+    def test_matches_normalized_check(self):
+        rng = random.Random(0)
+        alphabet = ["a", "b", "A", "B", " ", "\t", "\n", '"', "é", "É"]
+
+        def text(size: int) -> str:
+            return "".join(rng.choice(alphabet) for _ in range(rng.randrange(size)))
+
+        for _ in range(500):
+            keyword = text(8)
+            response = tweet(text(30), text(8), text(8), [text(4) for _ in range(2)])
+            assert KeywordMatcher(keyword).match_batch([response])[0] == (
+                normalized_match(keyword, response["Tweet"])
+            )
+
+    def test_compiled_once_per_keyword(self):
+        assert compile_keyword("eth") is compile_keyword("eth")
+        assert compile_keyword("eth") is not compile_keyword("btc")
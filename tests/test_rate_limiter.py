@@ -0,0 +1,120 @@
+import time
+import asyncio
+
+import pytest
+
+from masa.validator.forwarder import Forwarder
+from masa.validator.rate_limiter import RateLimiter, RoundBudgetExhausted
+from masa.validator.verdict_cache import VerdictCache
+
+TWEET = {"ID": "1850000000000000000", "Text": "hello"}
+
+
+async def take(limiter: RateLimiter, count: int = 1):
+    for _ in range(count):
+        async with limiter.acquire():
+            pass
+
+
+class TestRateLimiter:
+    def test_tokens_refill_at_rate_up_to_burst(self):
+        limiter = RateLimiter(rate=2.0, burst=3)
+        limiter._tokens = 0.0
+        limiter._refill(limiter._last_refill + 0.5)
+        assert limiter._tokens == pytest.approx(1.0)
+        limiter._refill(limiter._last_refill + 60)
+        assert limiter._tokens == 3
+
+    @pytest.mark.asyncio
+    async def test_burst_is_available_at_once(self):
+        limiter = RateLimiter(rate=0.01, burst=3)
+        start = time.monotonic()
+        await take(limiter, 3)
+        assert time.monotonic() - start < 0.1
+        assert limiter.metrics()["round_tokens"] == 3
+
+        # The bucket is empty and refills far slower than the test waits
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(take(limiter), 0.1)
+
+    @pytest.mark.asyncio
+    async def test_calls_beyond_the_burst_wait_for_a_refill(self):
+        limiter = RateLimiter(rate=20.0, burst=1)
+        start = time.monotonic()
+        await take(limiter, 3)
+        assert time.monotonic() - start >= 0.09
+        assert limiter.metrics()["round_wait_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        limiter = RateLimiter(rate=1000.0, burst=10, max_concurrency=2)
+        active, peak = 0, 0
+
+        async def call():
+            nonlocal active, peak
+            async with limiter.acquire():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert peak == 2
+
+    def test_backoff_doubles_until_success(self):
+        limiter = RateLimiter(base_backoff=1.0, max_backoff=3.0)
+
+        def pause() -> float:
+            return limiter._paused_until - time.monotonic()
+
+        limiter.backoff()
+        assert pause() == pytest.approx(1.0, abs=0.05)
+        assert limiter._tokens == 0
+        limiter.backoff()
+        assert pause() == pytest.approx(2.0, abs=0.05)
+        limiter.backoff()
+        assert pause() == pytest.approx(3.0, abs=0.05)
+        assert limiter.metrics()["total_throttled"] == 3
+
+        limiter.record_success()
+        limiter._paused_until = 0.0
+        limiter.backoff()
+        assert pause() == pytest.approx(1.0, abs=0.05)
+
+        limiter.backoff(retry_after=10.0)
+        assert pause() == pytest.approx(10.0, abs=0.05)
+
+    @pytest.mark.asyncio
+    async def test_calls_wait_out_a_backoff(self):
+        limiter = RateLimiter(rate=1000.0, burst=5, base_backoff=0.1)
+        limiter.backoff()
+        start = time.monotonic()
+        await take(limiter)
+        assert time.monotonic() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_spent_budget_rejects_calls_until_the_next_round(self):
+        limiter = RateLimiter(rate=1000.0, burst=5, round_budget=2)
+        await take(limiter, 2)
+        with pytest.raises(RoundBudgetExhausted):
+            await take(limiter)
+        assert limiter.metrics()["round_rejected"] == 1
+
+        limiter.start_round()
+        await take(limiter, 2)
+        limiter.start_round(round_budget=0)
+        await take(limiter, 5)
+        assert limiter.metrics()["round_tokens"] == 5
+
+
+class TestRoundBudget:
+    @pytest.mark.asyncio
+    async def test_unchecked_tweets_are_not_passed_or_cached(self):
+        forwarder = object.__new__(Forwarder)
+        forwarder.rate_limiter = RateLimiter(rate=1000.0, round_budget=1)
+        await take(forwarder.rate_limiter)
+        cache = VerdictCache()
+
+        with pytest.raises(RoundBudgetExhausted):
+            await cache.resolve(TWEET, lambda: forwarder.verify_tweet_exists(TWEET))
+        assert cache.get(cache.key(TWEET)) is None
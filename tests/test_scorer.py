@@ -0,0 +1,97 @@
+import json
+import types
+
+import numpy as np
+import pytest
+import torch
+
+from masa.validator.scorer import Scorer
+from masa.validator.volumes import VolumeWindow
+
+
+def reference_rewards(scorer: Scorer, miner_volumes: dict, n_scores: int):
+    """Rewards as score_miner_volumes computed them, one uid at a time."""
+    valid_miner_uids = [uid for uid in miner_volumes if uid < n_scores]
+    mean_volume = sum(miner_volumes.values()) / len(miner_volumes)
+    std_dev_volume = (
+        sum((x - mean_volume) ** 2 for x in miner_volumes.values()) / len(miner_volumes)
+    ) ** 0.5
+    if len(valid_miner_uids) == 1:
+        return valid_miner_uids, [1]
+    return valid_miner_uids, [
+        scorer.kurtosis_based_score(miner_volumes[uid], mean_volume, std_dev_volume)
+        for uid in valid_miner_uids
+    ]
+
+
+def random_miner_volumes(seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 300))
+    uids = np.sort(rng.choice(300, n, replace=False))
+    kind = seed % 4
+    if kind == 0:
+        volumes = rng.integers(0, 10**6, n)
+    elif kind == 1:
+        # Heavy tailed, with many miners at 0
+        volumes = np.where(rng.random(n) < 0.3, 0, rng.pareto(1.5, n) * 1000)
+    elif kind == 2:
+        volumes = np.full(n, float(rng.integers(0, 100)))
+    else:
+        volumes = rng.random(n) * 1e-3
+    return dict(zip(uids.tolist(), volumes.astype(np.float64).tolist()))
+
+
+def make_validator(miner_volumes: dict, n_scores: int):
+    updates = []
+
+    async def update_scores(rewards, uids):
+        updates.append((rewards, uids))
+
+    volume_buffer = VolumeWindow(6)
+    for uid, volume in miner_volumes.items():
+        volume_buffer.add(uid, volume, tempo=0)
+    validator = types.SimpleNamespace(
+        tempo=360,
+        volume_buffer=volume_buffer,
+        scores=torch.zeros(n_scores),
+        device="cpu",
+        update_scores=update_scores,
+    )
+    return validator, updates
+
+
+class TestVolumeRewards:
+    @pytest.mark.parametrize("seed", range(40))
+    def test_matches_the_per_uid_scores(self, seed):
+        scorer = Scorer(None)
+        miner_volumes = random_miner_volumes(seed)
+        rewards = scorer.volume_rewards(np.array(list(miner_volumes.values())))
+        _, expected = reference_rewards(scorer, miner_volumes, n_scores=300)
+        if len(miner_volumes) > 1:
+            assert rewards.tolist() == [float(reward) for reward in expected]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("seed", range(20))
+    async def test_score_miner_volumes_is_unchanged(self, seed):
+        miner_volumes = random_miner_volumes(seed)
+        # Some uids are past the scores tensor
+        n_scores = 256
+        validator, updates = make_validator(miner_volumes, n_scores)
+        scorer = Scorer(validator)
+        response = await scorer.score_miner_volumes(current_block=0)
+
+        uids, rewards = reference_rewards(scorer, miner_volumes, n_scores)
+        if not uids:
+            assert updates == []
+            return
+        scores, scored_uids = updates[0]
+        assert scored_uids == uids
+        assert torch.equal(scores, torch.FloatTensor(rewards))
+        assert json.loads(response.body) == [
+            {"uid": uid, "volume": miner_volumes[uid], "score": float(reward)}
+            for uid, reward in zip(uids, rewards)
+        ]
+
+    def test_equal_volumes_score_zero(self):
+        rewards = Scorer(None).volume_rewards(np.full(5, 7.0))
+        assert rewards.tolist() == [0.0] * 5
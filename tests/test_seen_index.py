@@ -0,0 +1,70 @@
+import numpy as np
+
+from masa.validator.seen_index import SeenTweetIndex
+
+
+def ids(*values) -> np.ndarray:
+    return np.array(values, dtype=np.uint64)
+
+
+class TestSeenTweetIndex:
+    def test_first_miner_keeps_the_claim(self):
+        index = SeenTweetIndex()
+        new, uids, blocks = index.claim(ids(11, 12), uid=1, block=100)
+        assert new.tolist() == [True, True]
+
+        new, uids, blocks = index.claim(ids(12, 13), uid=2, block=101)
+        assert new.tolist() == [False, True]
+        assert uids.tolist() == [1, 2]
+        assert blocks.tolist() == [100, 101]
+
+    def test_lookup_reports_unseen_ids(self):
+        index = SeenTweetIndex()
+        index.claim(ids(7), uid=3, block=5)
+        uids, blocks = index.lookup(ids(7, 8))
+        assert uids.tolist() == [3, -1]
+        assert blocks.tolist() == [5, 0]
+
+    def test_matches_a_dict_through_growth(self):
+        rng = np.random.default_rng(0)
+        index = SeenTweetIndex(max_ids=100_000, initial_capacity=16)
+        expected = {}
+        for block in range(200):
+            batch = np.unique(rng.integers(1, 20_000, 100)).astype(np.uint64)
+            uid = block % 7
+            new, uids, _ = index.claim(batch, uid, block)
+            for tweet_id, is_new, owner in zip(batch.tolist(), new, uids):
+                assert is_new == (tweet_id not in expected)
+                expected.setdefault(tweet_id, uid)
+                assert owner == expected[tweet_id]
+        assert len(index) == len(expected)
+
+    def test_memory_is_bounded_by_evicting_oldest_blocks(self):
+        index = SeenTweetIndex(max_ids=1000, initial_capacity=16)
+        for block in range(1, 101):
+            index.claim(np.arange(block * 100, block * 100 + 100) + 1, 1, block)
+        assert len(index) <= 1000
+        assert index.evictions > 0
+        # The most recent block survives, the first does not
+        uids, _ = index.lookup(ids(10_001, 101))
+        assert uids.tolist() == [1, -1]
+
+    def test_an_oversized_claim_evicts_everything_else(self):
+        index = SeenTweetIndex(max_ids=10, initial_capacity=16)
+        index.claim(np.arange(1, 6, dtype=np.uint64), 1, block=1)
+        new, _, _ = index.claim(np.arange(100, 120, dtype=np.uint64), 2, block=2)
+        assert new.all()
+        assert len(index) == 20
+        uids, _ = index.lookup(ids(1, 100))
+        assert uids.tolist() == [-1, 2]
+
+        # And the next claim makes room again
+        index.claim(ids(500), 3, block=3)
+        assert len(index) <= 10
+
+    def test_evicts_half_of_a_single_block(self):
+        index = SeenTweetIndex(max_ids=3, initial_capacity=16)
+        index.claim(ids(1, 2, 3), 1, block=1)
+        index.claim(ids(4), 1, block=1)
+        assert len(index) == 2
+        assert index.evictions == 2
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+import torch
+
+from masa.sim.__main__ import main
+from masa.sim.simulator import FakeSubtensor, Simulator, convergence
+from masa.sim.traces import load_volumes, replay, synthetic_volumes
+from masa.validator.checkpoint import Checkpointer
+from masa.validator.state_store import SQLiteStateStore
+from masa.validator.weights_history import WeightsHistory
+
+VOLUMES = [
+    {"tempo": 10, "miners": {"0": 10, "1": 20, "2": 40}},
+    {"tempo": 11, "miners": {"0": 10, "1": 20, "2": 40, "3": 0}},
+]
+
+
+def state(volumes: list) -> dict:
+    return {
+        "step": 1,
+        "scores": torch.zeros(4),
+        "hotkeys": ["hotkey"] * 4,
+        "volumes": volumes,
+        "tweets_by_uid": {},
+    }
+
+
+def with_int_uids(volumes: list) -> list:
+    return [
+        {"tempo": v["tempo"], "miners": {int(k): x for k, x in v["miners"].items()}}
+        for v in volumes
+    ]
+
+
+class TestSimulator:
+    def test_runs_the_production_moving_average(self):
+        simulator = Simulator(4, alpha=0.5)
+        trace = list(replay(with_int_uids(VOLUMES), epochs=2))
+        results = asyncio.run(simulator.run(trace))
+
+        assert [result["tempo"] for result in results] == [10, 11]
+        assert results[0]["change"] is None
+        # The second tempo's window sums both tempos, so the ranking is unchanged
+        volumes = np.array([20.0, 40.0, 80.0, 0.0])
+        rewards = simulator.scorer.volume_rewards(volumes)
+        first = 0.5 * simulator.scorer.volume_rewards(volumes[:3] / 2)
+        expected = np.append(first, 0) * 0.5 + 0.5 * rewards
+        assert simulator.validator.scores.numpy() == pytest.approx(expected, abs=1e-6)
+
+        weights = results[-1]["weights"]
+        assert weights.sum() == pytest.approx(1.0)
+        assert np.argsort(weights).tolist() == [3, 0, 1, 2]
+
+    def test_respects_the_weight_limit(self):
+        simulator = Simulator(
+            64, subtensor=FakeSubtensor(min_allowed_weights=8, max_weight_limit=0.05)
+        )
+        results = asyncio.run(simulator.run(synthetic_volumes(64, 3)))
+        # convert_weights_and_uids_for_emit rounds to u16
+        assert results[-1]["weights"].max() <= 0.05 + 1e-4
+
+    def test_starts_from_given_scores(self):
+        scores = torch.full((4,), 0.5)
+        simulator = Simulator(4, scores=scores)
+        assert torch.equal(simulator.validator.scores, scores)
+
+    def test_measures_convergence(self):
+        trace = list(synthetic_volumes(32, 200, seed=1))
+        slow = asyncio.run(Simulator(32, alpha=0.02).run(trace))
+        fast = asyncio.run(Simulator(32, alpha=0.5).run(trace))
+        slow_epoch, slow_jitter = convergence(slow, tolerance=0.05)
+        fast_epoch, fast_jitter = convergence(fast, tolerance=0.05)
+        assert slow_epoch is not None and fast_epoch is not None
+        assert slow_jitter < fast_jitter
+
+
+class TestTraces:
+    def test_replays_with_increasing_tempos(self):
+        trace = list(replay(with_int_uids(VOLUMES), epochs=5))
+        assert [volume["tempo"] for volume in trace] == [10, 11, 12, 13, 14]
+        assert trace[2]["miners"] == trace[0]["miners"]
+
+    def test_loads_recorded_volumes(self, tmp_path):
+        expected = with_int_uids(VOLUMES)
+
+        checkpointer = Checkpointer(str(tmp_path / "checkpoint"))
+        checkpointer.write(checkpointer.prepare(state(VOLUMES), force=True))
+        # A segment a save in progress has written, but not yet referenced
+        stray = tmp_path / "checkpoint" / "tweets" / "000000000100.bin"
+        stray.write_bytes(b"")
+        assert load_volumes(str(tmp_path / "checkpoint")) == expected
+        assert stray.exists()
+
+        torch.save(state(VOLUMES), tmp_path / "state.pt")
+        assert load_volumes(str(tmp_path / "state.pt")) == expected
+
+        store = SQLiteStateStore(str(tmp_path / "state.db"))
+        store.write(store.prepare(state(VOLUMES), force=True))
+        store.close()
+        modified = os.path.getmtime(tmp_path / "state.db")
+        assert load_volumes(str(tmp_path / "state.db")) == expected
+        assert os.path.getmtime(tmp_path / "state.db") == modified
+        # A wrong path is an error, not a new, empty database
+        with pytest.raises(sqlite3.OperationalError):
+            load_volumes(str(tmp_path / "missing.db"))
+        assert not (tmp_path / "missing.db").exists()
+
+        (tmp_path / "volumes.json").write_text(json.dumps(VOLUMES))
+        assert load_volumes(str(tmp_path / "volumes.json")) == expected
+
+
+class TestCommandLine:
+    def test_sweeps_parameters(self, tmp_path, capsys):
+        (tmp_path / "volumes.json").write_text(json.dumps(VOLUMES))
+        WeightsHistory(str(tmp_path / "weights_history")).append(
+            42, "hotkey", {0: 100.0, 1: 100.0}
+        )
+        output = str(tmp_path / "results.json")
+        main(
+            [
+                "--volumes",
+                str(tmp_path / "volumes.json"),
+                "--uids",
+                "0",
+                "--epochs",
+                "20",
+                "--alpha",
+                "0.1",
+                "0.5",
+                "--window",
+                "1",
+                "6",
+                "--weights-history",
+                str(tmp_path / "weights_history"),
+                "--json",
+                output,
+            ]
+        )
+        assert "20 epochs of 4 miners" in capsys.readouterr().out
+
+        with open(output) as f:
+            runs = json.load(f)
+        assert [(run["alpha"], run["window"]) for run in runs] == [
+            (0.1, 1),
+            (0.1, 6),
+            (0.5, 1),
+            (0.5, 6),
+        ]
+        for run in runs:
+            assert len(run["epochs"]) == 20
+            assert sum(run["weights"]) == pytest.approx(1.0)
+            assert run["distance"] is not None
@@ -0,0 +1,114 @@
+import os
+import sqlite3
+
+import pytest
+import torch
+
+from masa.validator.state_store import SQLiteStateStore
+from tests.test_checkpoint import make_state, new_history
+
+
+def count_rows(path: str, table: str) -> int:
+    with sqlite3.connect(path) as connection:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestSQLiteStateStore:
+    def test_restores_the_saved_state(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        state = make_state()
+        store = SQLiteStateStore(path)
+        assert not store.exists()
+        store.write(store.prepare(state, force=True))
+        store.close()
+
+        store = SQLiteStateStore(path)
+        assert store.exists()
+        restored = store.load(new_history)
+        assert restored["step"] == 1
+        assert torch.equal(restored["scores"], state["scores"])
+        assert restored["hotkeys"] == state["hotkeys"]
+        assert restored["volumes"] == state["volumes"]
+        for uid, history in restored["tweets_by_uid"].items():
+            assert [start for start, _ in history.segments] == [0, 100]
+            assert list(history) == list(state["tweets_by_uid"][uid])
+        assert store.prepare(restored, force=True) is None
+
+    def test_writes_only_changed_rows(self, tmp_path):
+        state = make_state()
+        store = SQLiteStateStore(str(tmp_path / "state.db"))
+        store.write(store.prepare(state, force=True))
+
+        state["scores"][1] = 0.5
+        state["volumes"][-1]["miners"]["2"] = 5
+        state["tweets_by_uid"][2].update([5000], 180)
+        plan = store.prepare(state, force=True)
+        assert plan["scores"][0] == [(1, 0.5)]
+        assert plan["volumes"][0] == [(0, 2, 5)]
+        assert [(uid, start) for uid, start, _ in plan["tweet_segments"][0]] == [
+            (2, 100)
+        ]
+        assert "hotkeys" not in plan and "step" not in plan
+
+    def test_removes_expired_rows(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        state = make_state()
+        store = SQLiteStateStore(path)
+        store.write(store.prepare(state, force=True))
+
+        for history in state["tweets_by_uid"].values():
+            history.expire(1150)
+        state["volumes"] = [{"tempo": 1, "miners": {"0": 3}}]
+        state["scores"] = state["scores"][:2]
+        store.write(store.prepare(state, force=True))
+        assert count_rows(path, "tweet_segments") == 3
+        assert count_rows(path, "volumes") == 1
+        assert count_rows(path, "scores") == 2
+
+    def test_rolls_back_a_failed_save(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        state = make_state()
+        store = SQLiteStateStore(path)
+        store.write(store.prepare(state, force=True))
+
+        state["step"] = 2
+        state["scores"][0] = 0.9
+        plan = store.prepare(state, force=True)
+        plan["volumes"] = ([(0, 0, object())], [], {})
+        with pytest.raises(sqlite3.Error):
+            store.write(plan)
+        assert store.load(new_history)["step"] == 1
+        # Nothing was recorded as saved, so the next save writes the changes again
+        assert "scores" in store.prepare(state, force=True)
+
+    def test_reads_are_cached_until_the_next_save(self, tmp_path):
+        state = make_state()
+        store = SQLiteStateStore(str(tmp_path / "state.db"), cache_entries=2)
+        store.write(store.prepare(state, force=True))
+
+        assert store.read_scores() == pytest.approx([0.1, 0.2, 0.3])
+        assert store.read_volumes() == [{"tempo": 0, "miners": {0: 10}}]
+        assert store.read_tweet_counts() == {0: 15, 1: 15, 2: 15}
+        assert store.read_tweet_ids(1)[:2] == ["1000", "1001"]
+        assert len(store._cache) == 2
+
+        state["scores"][0] = 0.7
+        store.write(store.prepare(state, force=True))
+        assert store.read_scores()[0] == pytest.approx(0.7)
+
+    def test_migrates_pickled_state(self, tmp_path):
+        state = make_state()
+        state_path = str(tmp_path / "state.pt")
+        torch.save(state, state_path)
+
+        store = SQLiteStateStore(str(tmp_path / "state.db"))
+        store.migrate(state_path, lambda history: history)
+        assert os.path.exists(state_path + ".migrated")
+        assert store.load(new_history)["hotkeys"] == state["hotkeys"]
+
+    @pytest.mark.asyncio
+    async def test_saves_in_a_worker_thread(self, tmp_path):
+        store = SQLiteStateStore(str(tmp_path / "state.db"), interval=0)
+        assert await store.save(make_state()) > 0
+        assert await store.save(make_state()) == 0
+        assert store.metrics()["saves"] == 1
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from masa.validator.batch_validation import validate_batch
+from masa.validator.keyword_matcher import KeywordMatcher
+from masa.validator.tweet_decoder import decode_recent_tweets, to_builtins
+
+msgspec = pytest.importorskip("msgspec")
+
+
+def tweet(i: int, **fields) -> dict:
+    return {
+        "Tweet": {
+            "ID": str(1_800_000_000_000_000_000 + i),
+            "Text": "bitcoin etf news",
+            "Name": "Bench",
+            "Username": "bench",
+            "Hashtags": ["btc"],
+            "Timestamp": 1_760_000_000 + i,
+            "HTML": "<p>bitcoin etf news</p>",
+            "Photos": ["https://pbs.twimg.com/media/1.jpg"],
+            "QuotedStatus": {"ID": "1", "Text": "quoted"},
+            **fields,
+        }
+    }
+
+
+def body(responses) -> bytes:
+    return json.dumps(
+        {"name": "RecentTweetsSynapse", "query": "btc", "response": responses}
+    ).encode()
+
+
+class TestDecodeRecentTweets:
+    def test_decodes_tweets_to_structs(self):
+        decoded = decode_recent_tweets(body([tweet(0), tweet(1)]))
+        assert decoded["name"] == "RecentTweetsSynapse"
+        responses = decoded["response"]
+        assert [type(response).__name__ for response in responses] == [
+            "TweetResponseStruct"
+        ] * 2
+        assert responses[0]["Tweet"]["ID"] == "1800000000000000000"
+        assert "Error" not in responses[0]
+        assert responses[0].get("Error", {}) == {}
+
+    def test_bulky_fields_decode_on_access(self):
+        response = decode_recent_tweets(body([tweet(0)]))["response"][0]
+        assert isinstance(response["Tweet"].QuotedStatus, msgspec.Raw)
+        assert response["Tweet"]["QuotedStatus"] == {"ID": "1", "Text": "quoted"}
+        assert dict(response["Tweet"])["Photos"] == [
+            "https://pbs.twimg.com/media/1.jpg"
+        ]
+
+    def test_falls_back_to_dicts_on_unexpected_shapes(self):
+        for responses in (
+            [tweet(0, Extra="kept")],
+            [tweet(0, ID=123)],
+            "not a list",
+        ):
+            decoded = decode_recent_tweets(body(responses))
+            assert decoded["response"] == responses
+
+    def test_round_trips_to_builtins_for_export(self):
+        original = tweet(0)
+        response = decode_recent_tweets(body([original]))["response"][0]
+        response["Tweet"]["TimeParsed"] = "2025-01-01 00:00:00.000000"
+        original["Tweet"]["TimeParsed"] = "2025-01-01 00:00:00.000000"
+        assert to_builtins(response) == original
+        assert to_builtins(original) is original
+
+    def test_validation_accepts_structs(self):
+        responses = decode_recent_tweets(body([tweet(0), tweet(1)]))["response"]
+        assert validate_batch(responses, 1_700_000_000).passed
+        assert KeywordMatcher('"bitcoin etf"').match_batch(responses).all()
@@ -0,0 +1,73 @@
+import pickle
+
+import numpy as np
+
+from masa.validator.tweet_ids import TweetIdSet, TweetIdHistory
+
+
+class TestTweetIdSet:
+    def test_membership_and_iteration_use_strings(self):
+        tweet_ids = TweetIdSet(["1850000000000000002", "1850000000000000001"])
+        assert "1850000000000000001" in tweet_ids
+        assert "1850000000000000003" not in tweet_ids
+        assert list(tweet_ids) == ["1850000000000000001", "1850000000000000002"]
+
+    def test_difference_matches_set_semantics(self):
+        rng = np.random.default_rng(0)
+        existing = [str(i) for i in rng.integers(10**18, 2 * 10**18, 1000)]
+        incoming = existing[:50] + [
+            str(i) for i in rng.integers(10**18, 2 * 10**18, 50)
+        ]
+        expected = set(incoming) - set(existing)
+        assert set(map(str, TweetIdSet(existing).difference(incoming))) == expected
+
+    def test_update_returns_only_new_ids(self):
+        tweet_ids = TweetIdSet(["5", "9"])
+        assert tweet_ids.update(["9", "12", "7"]).tolist() == [7, 12]
+        assert list(tweet_ids) == ["5", "7", "9", "12"]
+        assert len(tweet_ids.update(["5"])) == 0
+
+    def test_empty_set(self):
+        tweet_ids = TweetIdSet()
+        assert len(tweet_ids) == 0 and not tweet_ids
+        assert "1" not in tweet_ids
+        assert tweet_ids.update(["1"]).tolist() == [1]
+
+    def test_round_trips_through_pickle(self):
+        tweet_ids = TweetIdSet(["18446744073709551615", "1"])
+        restored = pickle.loads(pickle.dumps(tweet_ids, protocol=2))
+        assert list(restored) == ["1", "18446744073709551615"]
+
+
+class TestTweetIdHistory:
+    def test_dedups_across_segments(self):
+        history = TweetIdHistory(retention_blocks=1000, segment_blocks=100)
+        assert history.update(["1", "2"], block=10).tolist() == [1, 2]
+        assert history.update(["2", "3"], block=150).tolist() == [3]
+        assert history.update(["1", "3", "4"], block=250).tolist() == [4]
+        assert len(history.segments) == 3
+        assert sorted(history, key=int) == ["1", "2", "3", "4"]
+
+    def test_whole_segments_expire_after_retention(self):
+        history = TweetIdHistory(retention_blocks=200, segment_blocks=100)
+        history.update(["1"], block=10)
+        history.update(["2"], block=110)
+        history.update(["3"], block=310)
+        # The segment starting at block 0 ended 210 blocks ago
+        assert "1" not in history
+        assert "2" in history and "3" in history
+        # An expired ID counts as new again
+        assert history.update(["1"], block=320).tolist() == [1]
+
+    def test_recent_ids_survive_regardless_of_value(self):
+        history = TweetIdHistory(retention_blocks=100, segment_blocks=10)
+        history.update(["900"], block=0)
+        history.update(["5"], block=200)
+        assert list(history) == ["5"]
+
+    def test_round_trips_through_pickle(self):
+        history = TweetIdHistory(retention_blocks=100, segment_blocks=10)
+        history.update(["1", "2"], block=5)
+        restored = pickle.loads(pickle.dumps(history, protocol=2))
+        assert list(restored) == ["1", "2"]
+        assert restored.segments[0][0] == 0
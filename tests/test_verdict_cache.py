@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+
+from masa.validator.forwarder import Forwarder
+from masa.validator.rate_limiter import RateLimiter
+from masa.validator.verdict_cache import VerdictCache, ERROR
+from masa.validator.verification import (
+    VerificationService,
+    VerificationResult,
+    VALID,
+    NOT_FOUND,
+    TRANSIENT_ERROR,
+)
+
+TWEET = {
+    "ID": "1850000000000000000",
+    "Name": "Masa",
+    "Username": "getmasafi",
+    "Text": "hello #bittensor",
+    "Timestamp": 1729900800,
+    "Hashtags": ["bittensor"],
+}
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("masa.validator.verdict_cache.time", clock)
+    return clock
+
+
+def verifier(verdict: str = VALID, delay: float = 0):
+    calls = []
+
+    async def verify():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return verdict
+
+    return verify, calls
+
+
+class StubAdapter:
+    def __init__(self, outcomes: list):
+        self.outcomes = outcomes
+
+    def verify(self, tweet: dict) -> VerificationResult:
+        return VerificationResult(self.outcomes.pop(0), status_code=200)
+
+
+def make_forwarder(outcomes: list) -> Forwarder:
+    forwarder = object.__new__(Forwarder)
+    forwarder.rate_limiter = RateLimiter(rate=1000.0, burst=10)
+    adapter = StubAdapter(outcomes)
+    forwarder.verification_service = VerificationService(lambda: adapter)
+    return forwarder
+
+
+class TestVerdictCache:
+    @pytest.mark.asyncio
+    async def test_only_misses_call_the_verifier(self):
+        cache = VerdictCache()
+        verify, calls = verifier()
+        assert await cache.resolve(TWEET, verify) == VALID
+        assert await cache.resolve(TWEET, verify) == VALID
+        assert len(calls) == 1
+        assert cache.metrics() == {"size": 1, "hits": 1, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_altered_fields_do_not_reuse_a_verdict(self):
+        cache = VerdictCache()
+        verify, calls = verifier()
+        await cache.resolve(TWEET, verify)
+        await cache.resolve({**TWEET, "Text": "altered"}, verify)
+        assert len(calls) == 2
+
+    def test_verdicts_expire(self, clock):
+        cache = VerdictCache(ttl=60)
+        cache.put("key", VALID)
+        clock.now += 59
+        assert cache.get("key") == VALID
+        clock.now += 2
+        assert cache.get("key") is None
+        assert cache.metrics()["size"] == 0
+
+    def test_errors_are_only_cached_with_an_error_ttl(self, clock):
+        cache = VerdictCache()
+        cache.put("key", ERROR)
+        assert cache.get("key") is None
+
+        cache = VerdictCache(ttl=60, error_ttl=5)
+        cache.put("key", ERROR)
+        assert cache.get("key") == ERROR
+        clock.now += 6
+        assert cache.get("key") is None
+
+    def test_least_recently_used_is_evicted(self):
+        cache = VerdictCache(max_size=2)
+        cache.put("a", VALID)
+        cache.put("b", NOT_FOUND)
+        cache.get("a")
+        cache.put("c", VALID)
+        assert cache.get("b") is None
+        assert cache.get("a") == VALID
+        assert cache.get("c") == VALID
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_verification(self):
+        cache = VerdictCache()
+        verify, calls = verifier(NOT_FOUND, delay=0.05)
+        verdicts = await asyncio.gather(
+            *(cache.resolve(TWEET, verify) for _ in range(5))
+        )
+        assert verdicts == [NOT_FOUND] * 5
+        assert len(calls) == 1
+        assert cache.metrics()["hits"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_verification_is_not_cached(self):
+        cache = VerdictCache()
+
+        async def fail():
+            raise RuntimeError("upstream down")
+
+        with pytest.raises(RuntimeError):
+            await cache.resolve(TWEET, fail)
+        verify, calls = verifier()
+        assert await cache.resolve(TWEET, verify) == VALID
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_persists_unexpired_verdicts(self, tmp_path, clock):
+        path = str(tmp_path / "verdicts.json")
+        cache = VerdictCache(ttl=60, path=path)
+        cache.put("old", NOT_FOUND)
+        clock.now += 30
+        cache.put("new", VALID)
+        await cache.save()
+
+        clock.now += 40
+        loaded = VerdictCache(ttl=60, path=path)
+        assert loaded.get("old") is None
+        assert loaded.get("new") == VALID
+
+        # A corrupt file starts an empty cache instead of failing
+        (tmp_path / "verdicts.json").write_text("{")
+        assert VerdictCache(path=path).metrics()["size"] == 0
+
+
+class TestVerifyTweetExists:
+    @pytest.mark.asyncio
+    async def test_confirmed_tweet_is_valid(self):
+        forwarder = make_forwarder([VALID, VALID])
+        try:
+            assert await forwarder.verify_tweet_exists(TWEET) == VALID
+        finally:
+            forwarder.verification_service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_passing_on_errors_alone_is_not_a_confirmation(self):
+        forwarder = make_forwarder([TRANSIENT_ERROR, TRANSIENT_ERROR])
+        try:
+            assert await forwarder.verify_tweet_exists(TWEET) == ERROR
+        finally:
+            forwarder.verification_service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_missing_tweet_is_not_found(self):
+        forwarder = make_forwarder([NOT_FOUND, NOT_FOUND, TRANSIENT_ERROR])
+        try:
+            assert await forwarder.verify_tweet_exists(TWEET) == NOT_FOUND
+        finally:
+            forwarder.verification_service.shutdown()
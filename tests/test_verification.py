@@ -0,0 +1,244 @@
+import json
+from http import HTTPStatus
+import time
+import asyncio
+import threading
+from typing import Optional
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from masa.validator.verification import (
+    VerificationService,
+    TweetVerificationAdapter,
+    VALID,
+    NOT_FOUND,
+    TRANSIENT_ERROR,
+    MISMATCH,
+)
+
+TWEET = {
+    "ID": "1850000000000000000",
+    "Name": "Masa",
+    "Username": "getmasafi",
+    "Text": "hello  #bittensor",
+    "Timestamp": 1729900800,
+    "Hashtags": ["bittensor"],
+}
+
+
+FOUND = {"data": {"tweetResult": {"result": {"rest_id": TWEET["ID"]}}}}
+
+
+class FakeTransport(BaseAdapter):
+    """Answers each request with the canned (status, body) for its method."""
+
+    def __init__(self, replies: dict):
+        super().__init__()
+        self.replies = replies
+
+    def send(self, request, **kwargs):
+        reply = self.replies[request.method]
+        if isinstance(reply, Exception):
+            raise reply
+        status, body = reply
+        response = requests.Response()
+        response.status_code = status
+        response.reason = HTTPStatus(status).phrase
+        response._content = json.dumps(body).encode()
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+class HttpTweetValidator:
+    """
+    Mimics masa-ai's TweetValidator: fetches a guest token and the tweet through its
+    own session, swallows request errors and only returns a bool.
+    """
+
+    def __init__(
+        self,
+        lookup=(200, FOUND),
+        guest=(200, {"guest_token": "1"}),
+        matches: bool = True,
+        barrier: Optional[threading.Barrier] = None,
+    ):
+        self.session = requests.Session()
+        self.session.mount("https://", FakeTransport({"POST": guest, "GET": lookup}))
+        self.matches = matches
+        self.barrier = barrier
+        self.calls = []
+
+    def validate_tweet(self, **kwargs) -> bool:
+        self.calls.append(kwargs)
+        try:
+            self.session.post("https://api.x.com/1.1/guest/activate.json")
+            lookup = self.session.get("https://x.com/i/api/graphql/TweetResultByRestId")
+            if self.barrier is not None:
+                # Hold until every thread has its response, so their lookups overlap
+                self.barrier.wait(timeout=5)
+            lookup.raise_for_status()
+            data = lookup.json()
+        except requests.RequestException:
+            return False
+        result = data.get("data", {}).get("tweetResult", {}).get("result")
+        return bool(result) and self.matches
+
+
+class SlowTweetValidator:
+    """Mimics masa-ai's TweetValidator: blocking network I/O inside validate_tweet."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def validate_tweet(self, **kwargs) -> bool:
+        time.sleep(self.latency)
+        return True
+
+
+async def measure_max_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    max_lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - start - interval)
+    return max_lag
+
+
+class TestVerificationService:
+    @pytest.mark.asyncio
+    async def test_event_loop_keeps_ticking_during_verification(self):
+        service = VerificationService(lambda: SlowTweetValidator(0.3), max_workers=2)
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(measure_max_loop_lag(stop))
+
+        results = await asyncio.gather(
+            *(
+                service.run(lambda v: v.validate_tweet(tweet_id=str(i)))
+                for i in range(4)
+            )
+        )
+        stop.set()
+        max_lag = await ticker
+        service.shutdown()
+
+        assert results == [True] * 4
+        assert max_lag < 0.1, f"event loop stalled for {max_lag:.3f}s"
+
+    @pytest.mark.asyncio
+    async def test_call_times_out(self):
+        service = VerificationService(lambda: SlowTweetValidator(1.0), max_workers=1)
+        start = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            await service.run(lambda v: v.validate_tweet(), timeout=0.1)
+        assert time.perf_counter() - start < 0.5
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_each_worker_thread_gets_its_own_validator(self):
+        created = []
+
+        def factory():
+            validator = SlowTweetValidator(0.05)
+            created.append(validator)
+            return validator
+
+        service = VerificationService(factory, max_workers=2)
+        seen = await asyncio.gather(*(service.run(lambda v: id(v)) for _ in range(6)))
+        service.shutdown()
+
+        assert 1 <= len(created) <= 2
+        assert set(seen) == {id(v) for v in created}
+
+
+class TestTweetVerificationAdapter:
+    def test_confirmed_tweet_is_valid(self):
+        validator = HttpTweetValidator()
+        assert TweetVerificationAdapter(validator).verify(TWEET) == (VALID, None, "")
+        assert validator.calls == [
+            {
+                "tweet_id": TWEET["ID"],
+                "expected_name": "Masa",
+                "expected_username": "getmasafi",
+                "expected_text": "hello  #bittensor",
+                "expected_timestamp": 1729900800,
+                "expected_hashtags": ["bittensor"],
+            }
+        ]
+
+    def test_404_is_not_found(self):
+        adapter = TweetVerificationAdapter(HttpTweetValidator(lookup=(404, {})))
+        assert adapter.verify(TWEET) == (NOT_FOUND, 404, "404 Not Found")
+
+    def test_lookup_without_the_tweet_is_not_found(self):
+        adapter = TweetVerificationAdapter(
+            HttpTweetValidator(lookup=(200, {"data": {"tweetResult": {}}}))
+        )
+        assert adapter.verify(TWEET)[:2] == (NOT_FOUND, 200)
+
+    def test_other_http_errors_are_transient(self):
+        adapter = TweetVerificationAdapter(HttpTweetValidator(lookup=(429, {})))
+        assert adapter.verify(TWEET)[:2] == (TRANSIENT_ERROR, 429)
+        adapter = TweetVerificationAdapter(HttpTweetValidator(lookup=(503, {})))
+        assert adapter.verify(TWEET)[:2] == (TRANSIENT_ERROR, 503)
+
+    def test_failures_before_the_lookup_are_transient(self):
+        # A failed guest token is never mistaken for the tweet's status
+        adapter = TweetVerificationAdapter(
+            HttpTweetValidator(lookup=(200, FOUND), guest=(404, {}))
+        )
+        adapter.tweet_validator.session.adapters["https://"].replies[
+            "GET"
+        ] = requests.ConnectionError("reset")
+        assert adapter.verify(TWEET)[:2] == (TRANSIENT_ERROR, None)
+
+    def test_raised_request_errors_are_classified(self):
+        response = requests.Response()
+        response.status_code = 404
+
+        class RaisingTweetValidator(HttpTweetValidator):
+            def validate_tweet(self, **kwargs) -> bool:
+                raise requests.HTTPError("404 Client Error", response=response)
+
+        adapter = TweetVerificationAdapter(RaisingTweetValidator())
+        assert adapter.verify(TWEET) == (NOT_FOUND, 404, "404 Client Error")
+
+    def test_fetched_tweet_that_fails_is_a_mismatch(self):
+        adapter = TweetVerificationAdapter(HttpTweetValidator(matches=False))
+        assert adapter.verify(TWEET)[:2] == (MISMATCH, 200)
+
+    def test_each_call_only_sees_its_own_lookup(self):
+        adapter = TweetVerificationAdapter(HttpTweetValidator(lookup=(404, {})))
+        assert adapter.verify(TWEET).outcome == NOT_FOUND
+        transport = adapter.tweet_validator.session.adapters["https://"]
+        transport.replies["GET"] = requests.ConnectionError("reset")
+        assert adapter.verify(TWEET)[:2] == (TRANSIENT_ERROR, None)
+
+    def test_concurrent_calls_only_see_their_own_responses(self):
+        barrier = threading.Barrier(2)
+        adapters = [
+            TweetVerificationAdapter(
+                HttpTweetValidator(lookup=(404, {}), barrier=barrier)
+            ),
+            TweetVerificationAdapter(
+                HttpTweetValidator(matches=False, barrier=barrier)
+            ),
+        ]
+        results = [None, None]
+
+        def verify(i: int):
+            results[i] = adapters[i].verify(TWEET)
+
+        threads = [threading.Thread(target=verify, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results[0][:2] == (NOT_FOUND, 404)
+        assert results[1][:2] == (MISMATCH, 200)
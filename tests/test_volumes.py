@@ -0,0 +1,120 @@
+import json
+import types
+
+import numpy as np
+import pytest
+import torch
+
+from masa.validator.scorer import Scorer
+from masa.validator.volumes import VolumeWindow
+
+
+def add_to_list(volumes: list, uid: int, volume: int, tempo: int, window: int):
+    """The former Scorer.add_volume on a list of {"tempo", "miners"} dicts."""
+    if not volumes or volumes[-1]["tempo"] != tempo:
+        volumes.append({"tempo": tempo, "miners": {}})
+        volumes[:] = volumes[-window:]
+    volumes[-1]["miners"].setdefault(str(uid), 0)
+    volumes[-1]["miners"][str(uid)] += volume
+
+
+def random_volumes(seed: int, n: int = 500, uids: int = 40):
+    rng = np.random.default_rng(seed)
+    tempo = 0
+    for _ in range(n):
+        tempo += int(rng.random() < 0.1)
+        yield int(rng.integers(uids)), int(rng.integers(0, 50)), tempo
+
+
+class TestVolumeWindow:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_the_list_of_dicts(self, seed):
+        volumes, volume_window = [], VolumeWindow(6)
+        for uid, volume, tempo in random_volumes(seed):
+            add_to_list(volumes, uid, volume, tempo, 6)
+            volume_window.add(uid, volume, tempo)
+
+        assert volume_window.to_list() == [
+            {
+                "tempo": volume["tempo"],
+                "miners": dict(
+                    sorted(volume["miners"].items(), key=lambda m: int(m[0]))
+                ),
+            }
+            for volume in volumes
+        ]
+        totals = {}
+        for volume in volumes:
+            for uid, value in volume["miners"].items():
+                totals[int(uid)] = totals.get(int(uid), 0) + value
+        uids, sums = volume_window.window_totals()
+        assert dict(zip(uids.tolist(), sums.tolist())) == totals
+
+    def test_round_trips_the_list_form(self):
+        volume_window = VolumeWindow(3)
+        for uid, volume, tempo in random_volumes(0, n=100):
+            volume_window.add(uid, volume, tempo)
+        volumes = json.loads(json.dumps(volume_window.to_list()))
+        restored = VolumeWindow.from_list(volumes, 3)
+        assert restored.to_list() == volumes
+        assert np.array_equal(restored.totals[:40], volume_window.totals[:40])
+
+        # A shorter window keeps the latest tempos
+        assert VolumeWindow.from_list(volumes, 2).to_list() == volumes[-2:]
+
+    def test_keeps_empty_and_zero_volumes(self):
+        volume_window = VolumeWindow.from_list(
+            [{"tempo": 1, "miners": {}}, {"tempo": 2, "miners": {"3": 0}}], 6
+        )
+        assert len(volume_window) == 2
+        uids, totals = volume_window.window_totals()
+        assert uids.tolist() == [3] and totals.tolist() == [0.0]
+
+    def test_grows_with_new_uids(self):
+        volume_window = VolumeWindow(2, n_uids=4)
+        volume_window.add(1, 5, tempo=0)
+        volume_window.resize(10)
+        assert volume_window.n_uids == 10
+        volume_window.add(300, 2, tempo=0)
+        assert volume_window.n_uids >= 301
+        assert volume_window.window_totals()[0].tolist() == [1, 300]
+
+    def test_clears_a_replaced_uid(self):
+        volume_window = VolumeWindow(2)
+        volume_window.add(1, 5, tempo=0)
+        volume_window.add(1, 7, tempo=1)
+        volume_window.clear(1)
+        assert volume_window.to_list()[-1]["miners"] == {"1": 0.0}
+        assert volume_window.window_totals()[1].tolist() == [0.0]
+
+
+class TestScorerVolumes:
+    @pytest.mark.asyncio
+    async def test_scores_the_window_totals(self):
+        updates = []
+
+        async def update_scores(rewards, uids):
+            updates.append((rewards, uids))
+
+        validator = types.SimpleNamespace(
+            tempo=360,
+            volume_buffer=VolumeWindow(6),
+            scores=torch.zeros(4),
+            device="cpu",
+            update_scores=update_scores,
+        )
+        scorer = Scorer(validator)
+        for block, uid, volume in [(0, 0, 10), (10, 1, 30), (400, 0, 20), (400, 9, 5)]:
+            scorer.add_volume(uid, volume, block)
+
+        response = await scorer.score_miner_volumes(current_block=400)
+        content = json.loads(response.body)
+        assert [(entry["uid"], entry["volume"]) for entry in content] == [
+            (0, 30.0),
+            (1, 30.0),
+        ]
+        # Uid 9 is out of range but still counts toward the statistics
+        mean, std = np.mean([30, 30, 5]), np.std([30, 30, 5])
+        expected = scorer.kurtosis_based_score(30, mean, std)
+        assert updates[0][1] == [0, 1]
+        assert updates[0][0].tolist() == pytest.approx([expected, expected])
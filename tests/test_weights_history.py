@@ -0,0 +1,112 @@
+import datetime
+import json
+import os
+
+import numpy as np
+
+from masa.validator.weights_history import WeightsHistory
+
+DAY = 86400
+
+
+def timestamp(date: str) -> float:
+    return datetime.datetime.fromisoformat(date + "T12:00:00+00:00").timestamp()
+
+
+def segment_files(path) -> list:
+    return sorted(name for name in os.listdir(path) if name.endswith(".npz"))
+
+
+class TestWeightsHistory:
+    def test_latest_entry_per_netuid(self, tmp_path):
+        history = WeightsHistory(str(tmp_path))
+        assert history.latest(42) is None
+        history.append(42, "hotkey", {0: 1.0, 3: 2.0}, timestamp=100.0)
+        history.append(165, "hotkey", {1: 5.0}, timestamp=200.0)
+        history.append(42, "hotkey", {2: 7.0}, timestamp=300.0)
+
+        # A restart reads the index and a single segment
+        latest = WeightsHistory(str(tmp_path)).latest(42)
+        assert latest["timestamp"] == 300.0
+        # Rows are as wide as the widest entry of their segment
+        assert latest["weights"].tolist() == [0.0, 0.0, 7.0, 0.0]
+        assert latest["hotkey"] == "hotkey"
+
+    def test_appends_after_a_restart_on_the_same_day(self, tmp_path):
+        now = timestamp("2026-10-17")
+        WeightsHistory(str(tmp_path)).append(42, "a", {0: 1.0}, timestamp=now)
+        history = WeightsHistory(str(tmp_path))
+        history.append(42, "a", {0: 2.0, 1: 3.0}, timestamp=now + 60)
+
+        columns = history.query(42)
+        assert columns["timestamps"].tolist() == [now, now + 60]
+        assert columns["weights"].tolist() == [[1.0, 0.0], [2.0, 3.0]]
+        assert segment_files(tmp_path) == ["2026-10-17.npz"]
+
+    def test_compacts_past_months(self, tmp_path):
+        history = WeightsHistory(str(tmp_path))
+        history.extend(
+            [
+                (timestamp("2026-08-30"), 42, "a", {0: 1.0}),
+                (timestamp("2026-08-31"), 42, "a", {1: 2.0}),
+                (timestamp("2026-09-01"), 42, "a", {2: 3.0}),
+            ]
+        )
+        history.rotate(now=timestamp("2026-10-01"))
+        assert segment_files(tmp_path) == ["2026-08.npz", "2026-09.npz"]
+
+        history = WeightsHistory(str(tmp_path))
+        assert history.latest(42)["weights"].tolist() == [0.0, 0.0, 3.0]
+        assert history.query(42)["weights"].tolist() == [
+            [1.0, 0.0, 0.0],
+            [0.0, 2.0, 0.0],
+            [0.0, 0.0, 3.0],
+        ]
+
+    def test_drops_segments_past_retention(self, tmp_path):
+        history = WeightsHistory(str(tmp_path), retention_days=30)
+        history.extend(
+            [
+                (timestamp("2026-08-15"), 42, "a", {0: 1.0}),
+                (timestamp("2026-10-10"), 165, "a", {0: 2.0}),
+            ]
+        )
+        history.rotate(now=timestamp("2026-10-17"))
+        assert segment_files(tmp_path) == ["2026-10-10.npz"]
+        assert history.latest(42) is None
+        assert history.latest(165) is not None
+
+    def test_queries_a_time_range(self, tmp_path):
+        history = WeightsHistory(str(tmp_path))
+        start = timestamp("2026-10-01")
+        history.extend(
+            [(start + day * DAY, 42 + day % 2, "a", {0: day}) for day in range(10)]
+        )
+        columns = history.query(42, start=start + 2 * DAY, end="2026-10-07T00:00:00Z")
+        assert columns["weights"][:, 0].tolist() == [2.0, 4.0]
+        assert history.query(netuid=7)["weights"].shape == (0, 0)
+
+        frame = history.to_frame(43)
+        assert frame[0].tolist() == [1.0, 3.0, 5.0, 7.0, 9.0]
+        assert frame.index[0].day == 2
+
+    def test_imports_scores_log(self, tmp_path):
+        log_path = tmp_path / "scores.log"
+        lines = [
+            {
+                "timestamp": f"2026-09-0{day} 10:00:00.000000",
+                "netuid": 42,
+                "hotkey": "a",
+                "weights": [{"uid": 0, "weight": float(day)}],
+            }
+            for day in range(1, 4)
+        ]
+        log_path.write_text(
+            "\n".join(json.dumps(line) for line in lines) + "\nnot json\n"
+        )
+
+        history = WeightsHistory(str(tmp_path / "weights_history"))
+        assert history.import_log(str(log_path)) == 3
+        assert not log_path.exists()
+        assert history.latest(42)["weights"].tolist() == [3.0]
+        assert np.all(np.diff(history.query(42)["timestamps"]) > 0)